@@ -9,6 +9,8 @@ from app.models.base import Base
 from app.models.user import User
 from app.models.author import Author
 from app.models.book import Book
+from app.models.loan import Loan
+from app.models.job import Job
 from app.core.config import settings
 
 # this is the Alembic Config object
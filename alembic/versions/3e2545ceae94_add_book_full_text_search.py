@@ -0,0 +1,58 @@
+"""Add book full text search
+
+Revision ID: 3e2545ceae94
+Revises: d95226b6789c
+Create Date: 2026-10-17 10:04:52.118230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e2545ceae94'
+down_revision: Union[str, None] = 'd95226b6789c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Configuración en español que ignora tildes antes de aplicar el stemming
+    op.execute("CREATE TEXT SEARCH CONFIGURATION spanish_unaccent (COPY = spanish)")
+    op.execute(
+        "ALTER TEXT SEARCH CONFIGURATION spanish_unaccent "
+        "ALTER MAPPING FOR hword, hword_part, word WITH unaccent, spanish_stem"
+    )
+
+    # unaccent() no es IMMUTABLE, por lo que no puede usarse directamente en índices
+    op.execute(
+        "CREATE OR REPLACE FUNCTION immutable_unaccent(text) RETURNS text AS "
+        "$$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$ "
+        "LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT"
+    )
+
+    op.execute(
+        "ALTER TABLE books ADD COLUMN search_vector tsvector "
+        "GENERATED ALWAYS AS (to_tsvector('spanish_unaccent'::regconfig, coalesce(title, ''))) STORED"
+    )
+    op.create_index(
+        'ix_books_search_vector', 'books', ['search_vector'],
+        unique=False, postgresql_using='gin'
+    )
+    op.execute(
+        "CREATE INDEX ix_books_title_trgm ON books "
+        "USING gin (immutable_unaccent(lower(title)) gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_books_title_trgm', table_name='books')
+    op.drop_index('ix_books_search_vector', table_name='books')
+    op.drop_column('books', 'search_vector')
+    op.execute("DROP FUNCTION IF EXISTS immutable_unaccent(text)")
+    op.execute("DROP TEXT SEARCH CONFIGURATION IF EXISTS spanish_unaccent")
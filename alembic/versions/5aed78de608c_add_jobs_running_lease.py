@@ -0,0 +1,37 @@
+"""Add jobs running lease
+
+Revision ID: 5aed78de608c
+Revises: aae23d5c05d9
+Create Date: 2026-10-17 18:42:13.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5aed78de608c'
+down_revision: Union[str, None] = 'aae23d5c05d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Los trabajos en curso ("running") también se buscan por run_at, el
+    # vencimiento de su concesión, para retomarlos si su worker murió
+    op.create_index(
+        'ix_jobs_queued_run_at', 'jobs', ['run_at', 'id'], unique=False,
+        postgresql_where=sa.text("status IN ('pending', 'running')")
+    )
+    op.drop_index('ix_jobs_pending_run_at', table_name='jobs')
+
+
+def downgrade() -> None:
+    op.execute("UPDATE jobs SET status = 'pending' WHERE status = 'running'")
+    op.create_index(
+        'ix_jobs_pending_run_at', 'jobs', ['run_at', 'id'], unique=False,
+        postgresql_where=sa.text("status = 'pending'")
+    )
+    op.drop_index('ix_jobs_queued_run_at', table_name='jobs')
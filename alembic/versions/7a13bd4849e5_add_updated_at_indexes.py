@@ -0,0 +1,30 @@
+"""Add updated_at indexes
+
+Revision ID: 7a13bd4849e5
+Revises: 3e2545ceae94
+Create Date: 2026-10-17 10:05:14.227301
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a13bd4849e5'
+down_revision: Union[str, None] = '3e2545ceae94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_books_updated_at', 'books', ['updated_at'], unique=False)
+    op.create_index('ix_authors_updated_at', 'authors', ['updated_at'], unique=False)
+    op.create_index('ix_users_updated_at', 'users', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_updated_at', table_name='users')
+    op.drop_index('ix_authors_updated_at', table_name='authors')
+    op.drop_index('ix_books_updated_at', table_name='books')
@@ -0,0 +1,65 @@
+"""Add loans history
+
+Revision ID: 89c59bdac4cc
+Revises: ce6a28d236f0
+Create Date: 2026-10-17 15:02:37.440918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '89c59bdac4cc'
+down_revision: Union[str, None] = 'ce6a28d236f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Particiones mensuales creadas junto con la tabla; las siguientes las crea
+# la aplicación al iniciar y el worker de trabajos (app.services.loan_partitions)
+MONTHS_AHEAD = 3
+
+
+def upgrade() -> None:
+    # Solo inserción, particionada por mes: la clave primaria debe incluir occurred_at
+    op.create_table(
+        'loans',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('occurred_at', sa.DateTime(), nullable=False),
+        sa.Column('book_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('action', sa.String(length=10), nullable=False),
+        sa.PrimaryKeyConstraint('id', 'occurred_at'),
+        postgresql_partition_by='RANGE (occurred_at)'
+    )
+    op.create_index('ix_loans_user_id_occurred_at_id', 'loans', ['user_id', 'occurred_at', 'id'], unique=False)
+    op.create_index('ix_loans_book_id_occurred_at_id', 'loans', ['book_id', 'occurred_at', 'id'], unique=False)
+    op.create_index('ix_loans_occurred_at_brin', 'loans', ['occurred_at'], unique=False, postgresql_using='brin')
+
+    # Los límites de cada mes se calculan en el servidor
+    op.execute(f"""
+        DO $$
+        DECLARE month date;
+        BEGIN
+            FOR month IN
+                SELECT generate_series(
+                    date_trunc('month', current_date),
+                    date_trunc('month', current_date) + interval '{MONTHS_AHEAD} months',
+                    interval '1 month'
+                )::date
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF loans FOR VALUES FROM (%L) TO (%L)',
+                    'loans_' || to_char(month, 'YYYY_MM'), month, (month + interval '1 month')::date
+                );
+            END LOOP;
+        END $$
+    """)
+    # Filas sin partición mensual (si la aplicación no llegó a crearla)
+    op.execute("CREATE TABLE loans_default PARTITION OF loans DEFAULT")
+
+
+def downgrade() -> None:
+    op.drop_table('loans')
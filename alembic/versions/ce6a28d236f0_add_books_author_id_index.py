@@ -0,0 +1,26 @@
+"""Add books author_id index
+
+Revision ID: ce6a28d236f0
+Revises: 7a13bd4849e5
+Create Date: 2026-10-17 14:21:48.613529
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ce6a28d236f0'
+down_revision: Union[str, None] = '7a13bd4849e5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_books_author_id_borrowed_by_id', 'books', ['author_id', 'borrowed_by_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_books_author_id_borrowed_by_id', table_name='books')
@@ -0,0 +1,32 @@
+"""Add keyset pagination indexes
+
+Revision ID: d95226b6789c
+Revises: d7097c2e6ac0
+Create Date: 2026-10-17 09:12:31.482910
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd95226b6789c'
+down_revision: Union[str, None] = 'd7097c2e6ac0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_books_title_id', 'books', ['title', 'id'], unique=False)
+    op.create_index('ix_books_created_at_id', 'books', ['created_at', 'id'], unique=False)
+    op.create_index('ix_authors_created_at_id', 'authors', ['created_at', 'id'], unique=False)
+    op.create_index('ix_users_created_at_id', 'users', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_created_at_id', table_name='users')
+    op.drop_index('ix_authors_created_at_id', table_name='authors')
+    op.drop_index('ix_books_created_at_id', table_name='books')
+    op.drop_index('ix_books_title_id', table_name='books')
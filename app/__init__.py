@@ -1,6 +1,10 @@
 """
 Biblioteca Digital API
 """
-from app.core.config import settings
 
-__version__ = settings.VERSION
\ No newline at end of file
+def __getattr__(name: str):
+    # La versión sale de la configuración, que se lee al primer uso
+    if name == "__version__":
+        from app.core.config import settings
+        return settings.VERSION
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
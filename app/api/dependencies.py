@@ -1,17 +1,52 @@
-from typing import Generator
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
+from functools import lru_cache
+from typing import Any, AsyncGenerator, Generator
+from fastapi import Request
 from app.core.config import settings
+from app.core.database import LAZY_ATTRIBUTES, database
+from app.core.db_routing import ReplicaRouter
 
-engine = create_engine(settings.DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def __getattr__(name: str) -> Any:
+    """Motores y sesiones (`engine`, `SessionLocal`, ...), creados al primer uso por `database`"""
+    if name in LAZY_ATTRIBUTES:
+        return getattr(database, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+@lru_cache()
+def get_replica_router() -> ReplicaRouter:
+    """Enrutador de lecturas del proceso, creado al primer uso con la configuración vigente"""
+    return ReplicaRouter(stickiness=settings.DB_REPLICA_STICKINESS)
 
 def get_db() -> Generator:
     """
     Dependencia para obtener una sesión de base de datos.
     """
     try:
-        db = SessionLocal()
+        db = database.SessionLocal()
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db() -> AsyncGenerator:
+    """
+    Dependencia para obtener una sesión asíncrona de base de datos.
+    """
+    async with database.AsyncSessionLocal() as db:
+        yield db
+
+def get_read_db(request: Request) -> Generator:
+    """
+    Dependencia para obtener una sesión de solo lectura: una réplica si hay
+    configuradas, o el primario si el usuario escribió recientemente.
+    """
+    db = get_replica_router().session_for(request, database.SessionLocal, database.replica_sessions)
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_read_db(request: Request) -> AsyncGenerator:
+    """
+    Dependencia para obtener una sesión asíncrona de solo lectura.
+    """
+    async with get_replica_router().session_for(request, database.AsyncSessionLocal, database.async_replica_sessions) as db:
+        yield db
@@ -0,0 +1,155 @@
+"""
+Parámetros y respuestas comunes de los endpoints de lectura. Los endpoints
+síncronos y asíncronos solo difieren en cómo consultan la base de datos; la
+interpretación de los parámetros y la construcción de la respuesta son las
+mismas y se resuelven aquí.
+"""
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Type
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from app.api.routing import sparse_list
+from app.core import conditional
+from app.core.entity_cache import CachedEntity
+from app.core.serialization import Projection
+from app.crud.listing import InvalidIdsError, ListPage, parse_ids
+from app.crud.pagination import InvalidCursorError
+from app.schemas.fieldsets import FieldSet, InvalidFieldsError
+from app.utils import export
+
+# Errores de los parámetros de un listado, que se responden con 400
+LIST_ERRORS = (InvalidCursorError, InvalidIdsError, InvalidFieldsError)
+
+@contextmanager
+def bad_request(*errors: Type[Exception]) -> Iterator[None]:
+    """Convierte los errores indicados (por defecto `LIST_ERRORS`) en un 400"""
+    handled = errors or LIST_ERRORS
+    try:
+        yield
+    except handled as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def page_arguments(
+    crud: Any,
+    *,
+    skip: int,
+    limit: int,
+    cursor: Optional[str],
+    order_by: str,
+    envelope: bool,
+    count: str,
+    ids: Optional[str],
+    fields: Optional[str],
+    include: Optional[str]
+) -> Dict[str, Any]:
+    """Argumentos de `get_page` a partir de los parámetros de un listado"""
+    with bad_request():
+        return {
+            "skip": skip,
+            "limit": limit,
+            "cursor": cursor,
+            "order_by": order_by,
+            "ids": parse_ids(ids) if ids is not None else None,
+            "count": count if envelope else None,
+            "fieldset": crud.parse_fieldset(fields, include),
+        }
+
+def set_page_headers(response: Optional[Response], page: ListPage) -> None:
+    """Cabeceras de paginación: cursor siguiente, total estimado e IDs inexistentes"""
+    if response is None:
+        return
+    if page.next:
+        response.headers["X-Next-Cursor"] = page.next
+    if page.estimated:
+        response.headers["X-Total-Estimated"] = "true"
+    if page.missing:
+        response.headers["X-Missing-Ids"] = ",".join(map(str, page.missing))
+
+def list_response(
+    crud: Any,
+    page: ListPage,
+    *,
+    fieldset: Optional[FieldSet],
+    envelope: bool,
+    response: Optional[Response],
+    model: Optional[Type[BaseModel]] = None
+) -> Any:
+    """
+    Respuesta de un listado: la lista o `{items, total, next}` con `envelope`.
+    Con `fieldset` (o `model`) se serializa con ese esquema en lugar del de la ruta.
+    """
+    set_page_headers(response, page)
+    if model is None and fieldset is not None:
+        model = crud.fieldset_model(fieldset)
+    if model is not None:
+        return sparse_list(model, page, envelope=envelope)
+    if envelope:
+        return {"items": page.items, "total": page.total, "next": page.next}
+    return page.items
+
+def list_not_modified(request: Optional[Request], response: Optional[Response], version: Any) -> Optional[Response]:
+    """304 si el listado no cambió desde la versión que tiene el cliente"""
+    if request is None:
+        return None
+    return conditional.check(request, response, version, str(request.query_params))
+
+def detail_fieldset(crud: Any, fields: Optional[str], include: Optional[str]) -> Optional[FieldSet]:
+    """`fields` e `include` de un endpoint de detalle"""
+    with bad_request(InvalidFieldsError):
+        return crud.parse_fieldset(fields, include)
+
+def sparse_detail(
+    crud: Any,
+    obj: Any,
+    fieldset: FieldSet,
+    *,
+    not_found: str,
+    request: Optional[Request] = None,
+    response: Optional[Response] = None
+) -> Any:
+    """Respuesta parcial de un registro, con validadores HTTP si hay `request`"""
+    if obj is None:
+        raise HTTPException(status_code=404, detail=not_found)
+    if request is not None:
+        not_modified = conditional.check(request, response, crud.fieldset_version(obj, fieldset), fieldset)
+        if not_modified:
+            return not_modified
+    return Projection(crud.fieldset_model(fieldset), obj)
+
+def cached_detail(
+    cached: Optional[CachedEntity],
+    *,
+    not_found: str,
+    request: Optional[Request] = None,
+    response: Optional[Response] = None
+) -> Any:
+    """Respuesta de un registro leído de la caché de entidades"""
+    if cached is None:
+        raise HTTPException(status_code=404, detail=not_found)
+    if request is not None:
+        not_modified = conditional.check(request, response, cached.version)
+        if not_modified:
+            return not_modified
+    return cached.value
+
+def cursor_page(response: Optional[Response], items: List[Any], next_cursor: Optional[str]) -> List[Any]:
+    """Registros de una página por cursor, con el siguiente en `X-Next-Cursor`"""
+    if response is not None and next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
+
+def check_export_format(format: str) -> None:
+    if format not in export.EXPORT_MEDIA_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Formato no soportado: {format}. Opciones: {', '.join(export.EXPORT_MEDIA_TYPES)}"
+        )
+
+def export_response(body: Any, format: str, name: str) -> StreamingResponse:
+    """Exportación en fragmentos, como archivo adjunto `<name>.<format>`"""
+    return StreamingResponse(
+        body,
+        media_type=export.EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{format}"'}
+    )
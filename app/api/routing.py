@@ -0,0 +1,70 @@
+import asyncio
+import copy
+import functools
+from typing import Any, Callable, Dict, List, Type
+from fastapi import Response
+from pydantic import BaseModel
+from fastapi.routing import APIRoute, get_request_handler
+from app.core import request_metrics, serialization
+from app.core.serialization import Projection
+from app.crud.listing import ListPage
+from app.schemas.page import Page
+
+class SerializedRoute(APIRoute):
+    """
+    Ruta que construye la respuesta una sola vez a partir de lo que retorna el
+    endpoint (filas ORM o esquemas): valida contra `response_model` con un
+    `TypeAdapter` cacheado y serializa con orjson, sin la segunda validación
+    ni el `jsonable_encoder` que FastAPI aplica por defecto.
+
+    Los endpoints siguen retornando objetos, de modo que pueden llamarse
+    directamente; las respuestas que ya son `Response` (304, streaming) se
+    entregan tal cual, y las `Projection` se validan contra su propio esquema.
+    """
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        kwargs.setdefault("response_class", serialization.ORJSONResponse)
+        super().__init__(path, endpoint, **kwargs)
+
+    def build_response(self, content: Any, values: Dict[str, Any]) -> Response:
+        if isinstance(content, Response):
+            return content
+        with request_metrics.serializing():
+            if isinstance(content, Projection):
+                content = serialization.to_python(content.type, content.value)
+            elif self.response_model is not None:
+                content = serialization.to_python(self.response_model, content)
+            response = serialization.ORJSONResponse(content, status_code=self.status_code or 200)
+        # Cabeceras y código fijados por el endpoint en su parámetro `Response`
+        for value in values.values():
+            if isinstance(value, Response):
+                if value.status_code:
+                    response.status_code = value.status_code
+                response.headers.raw.extend(value.headers.raw)
+        return response
+
+    def get_route_handler(self) -> Callable:
+        dependant = copy.copy(self.dependant)
+        endpoint = dependant.call
+        if asyncio.iscoroutinefunction(endpoint):
+            @functools.wraps(endpoint)
+            async def call(**values: Any) -> Response:
+                return self.build_response(await endpoint(**values), values)
+        else:
+            @functools.wraps(endpoint)
+            def call(**values: Any) -> Response:
+                return self.build_response(endpoint(**values), values)
+        dependant.call = call
+        return get_request_handler(
+            dependant=dependant,
+            body_field=self.body_field,
+            status_code=self.status_code,
+            response_class=self.response_class,
+            response_field=None,
+            dependency_overrides_provider=self.dependency_overrides_provider,
+        )
+
+def sparse_list(model: Type[BaseModel], page: ListPage, *, envelope: bool = False) -> Projection:
+    """Listado serializado con `model` en lugar del esquema de la ruta (p. ej. `fields`/`include`)"""
+    if envelope:
+        return Projection(Page[model], {"items": page.items, "total": page.total, "next": page.next})
+    return Projection(List[model], page.items)
@@ -0,0 +1,32 @@
+from typing import Any
+from fastapi import APIRouter, Depends, Response
+from app.api.routing import SerializedRoute
+from app.core.security import get_current_admin
+from app.core.slow_queries import slow_query_log
+
+router = APIRouter(route_class=SerializedRoute)
+
+@router.get("/slow-queries", summary="Consultas lentas recientes")
+def get_slow_queries(
+    current_user: dict = Depends(get_current_admin)
+) -> Any:
+    """
+    Lista las últimas consultas que superaron SLOW_QUERY_MS, de la más reciente
+    a la más antigua, con su SQL, parámetros, ruta que las lanzó y plan de
+    ejecución (`plan` es null si se omitió por el límite de planes por minuto).
+
+    Requiere que el usuario figure en ADMIN_USER_IDS.
+    """
+    return {
+        "threshold_ms": round(slow_query_log.threshold * 1000, 3),
+        "total": slow_query_log.total,
+        "queries": slow_query_log.entries()
+    }
+
+@router.delete("/slow-queries", status_code=204, summary="Vaciar el registro de consultas lentas")
+def clear_slow_queries(
+    current_user: dict = Depends(get_current_admin)
+) -> Response:
+    """Vacía el registro de consultas lentas de este worker."""
+    slow_query_log.clear()
+    return Response(status_code=204)
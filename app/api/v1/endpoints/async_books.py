@@ -0,0 +1,220 @@
+from typing import Any, List, Literal, Optional, Union
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Response, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.dependencies import get_async_db, get_async_read_db
+from app.api.responses import (
+    bad_request, cached_detail, check_export_format, cursor_page, detail_fieldset, export_response,
+    list_not_modified, list_response, page_arguments, sparse_detail
+)
+from app.api.routing import SerializedRoute
+from app.core.security import get_current_user, get_current_admin
+from app.crud.author import async_author as author_crud
+from app.crud.book import async_book as book
+from app.crud.pagination import InvalidCursorError
+from app.utils import export
+from app.schemas.book import Book
+from app.schemas.page import Page
+from app.crud.loan import async_loan as loan_crud
+from app.schemas.loan import Loan
+
+# Versiones asíncronas de los endpoints de lectura y préstamo de libros.
+# Se usan en lugar de las síncronas cuando DB_ASYNC está habilitado.
+router = APIRouter(route_class=SerializedRoute)
+
+@router.get("/", response_model=Union[List[Book], Page[Book]], summary="Listar libros")
+async def read_books(
+    db: AsyncSession = Depends(get_async_read_db),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    order_by: str = "id",
+    envelope: bool = False,
+    count: Literal["auto", "exact", "estimated"] = "auto",
+    ids: Optional[str] = None,
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    response: Response = None,
+    request: Request = None
+) -> Any:
+    """
+    Recupera una lista de libros.
+
+    - **skip**: Número de registros a saltar
+    - **limit**: Número máximo de registros a retornar
+    - **cursor**: Cursor de la página siguiente, tomado de la cabecera `X-Next-Cursor`
+    - **order_by**: Orden de la paginación por cursor (`id`, `title` o `created_at`)
+    - **envelope**: Retorna `{items, total, next}` en lugar de la lista
+    - **count**: Cálculo de `total`: `exact`, `estimated` (estadísticas de PostgreSQL)
+      o `auto` (estimado solo en tablas grandes)
+    - **ids**: IDs separados por comas; retorna esos registros en el orden pedido
+      e informa los inexistentes en la cabecera `X-Missing-Ids`
+    - **fields**: Columnas a retornar, separadas por comas (`id` siempre se incluye)
+    - **include**: Relaciones a incluir, separadas por comas; con `fields` o `include`
+      se omiten las relaciones no pedidas y solo se leen las columnas necesarias
+    """
+    if request is not None:
+        not_modified = list_not_modified(request, response, await book.get_list_version(db))
+        if not_modified:
+            return not_modified
+    arguments = page_arguments(
+        book, skip=skip, limit=limit, cursor=cursor, order_by=order_by,
+        envelope=envelope, count=count, ids=ids, fields=fields, include=include
+    )
+    with bad_request():
+        page = await book.get_page(db, **arguments)
+    return list_response(
+        book, page, fieldset=arguments["fieldset"], envelope=envelope, response=response
+    )
+
+@router.get("/export", response_class=StreamingResponse, summary="Exportar libros")
+async def export_books(
+    db: AsyncSession = Depends(get_async_read_db),
+    format: str = "ndjson"
+) -> StreamingResponse:
+    """
+    Exporta todos los libros en NDJSON o CSV.
+
+    La respuesta se envía por fragmentos a medida que se leen las filas, sin
+    cargar el catálogo completo en memoria.
+
+    - **format**: `ndjson` (por defecto) o `csv`
+    """
+    check_export_format(format)
+    rows = book.stream_rows(db)
+    return export_response(export.aiter_export(rows, book.export_columns, format), format, "books")
+
+@router.get("/{book_id}", response_model=Book, summary="Obtener libro")
+async def read_book(
+    *,
+    db: AsyncSession = Depends(get_async_read_db),
+    book_id: int,
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    response: Response = None,
+    request: Request = None
+) -> Any:
+    """
+    Obtiene un libro específico por su ID.
+
+    - **book_id**: ID del libro a recuperar
+    - **fields** / **include**: Columnas y relaciones a retornar, como en el listado
+    """
+    fieldset = detail_fieldset(book, fields, include)
+    if fieldset is not None:
+        return sparse_detail(
+            book, await book.get(db, id=book_id, fieldset=fieldset), fieldset,
+            not_found="Libro no encontrado", request=request, response=response
+        )
+    return cached_detail(
+        await book.get_cached(db, id=book_id), not_found="Libro no encontrado", request=request, response=response
+    )
+
+@router.get("/search/", response_model=List[Book], summary="Buscar libros")
+async def search_books(
+    *,
+    db: AsyncSession = Depends(get_async_read_db),
+    title: Optional[str] = None,
+    author_id: Optional[int] = None,
+    publication_year: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 100
+) -> Any:
+    """
+    Busca libros por título, autor o año de publicación.
+    Los resultados de la búsqueda por título se ordenan por relevancia.
+    """
+    if author_id is not None:
+        db_author = await author_crud.get_cached(db, id=author_id)
+        if not db_author:
+            raise HTTPException(
+                status_code=404,
+                detail=f"El autor con ID {author_id} no existe"
+            )
+    return await book.search_books(
+        db,
+        title=title,
+        author_id=author_id,
+        publication_year=publication_year,
+        skip=skip,
+        limit=limit
+    )
+
+@router.post("/{book_id}/borrow", response_model=Book, summary="Prestar libro")
+async def borrow_book(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    book_id: int,
+    current_user: dict = Depends(get_current_user)
+) -> Any:
+    """
+    Registra el préstamo de un libro a un usuario.
+    """
+    try:
+        borrowed_book = await book.borrow_book(db, book_id=book_id, user_id=current_user["user_id"])
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=404, detail="Usuario no encontrado")
+    if borrowed_book:
+        return borrowed_book
+
+    db_book = await book.get(db, id=book_id)
+    if not db_book:
+        raise HTTPException(status_code=404, detail="Libro no encontrado")
+    raise HTTPException(
+        status_code=400,
+        detail=f"El libro ya está prestado al usuario con ID {db_book.borrowed_by_id}"
+    )
+
+@router.post("/{book_id}/return", response_model=Book, summary="Devolver libro")
+async def return_book(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    book_id: int,
+    current_user: dict = Depends(get_current_user)
+) -> Any:
+    """
+    Registra la devolución de un libro.
+
+    - **book_id**: ID del libro a devolver
+    """
+    returned_book = await book.return_book(db, book_id=book_id, user_id=current_user["user_id"])
+    if returned_book:
+        return returned_book
+
+    db_book = await book.get(db, id=book_id)
+    if not db_book:
+        raise HTTPException(status_code=404, detail="Libro no encontrado")
+    if not db_book.borrowed_by_id:
+        raise HTTPException(status_code=400, detail="El libro no está prestado")
+    raise HTTPException(status_code=403, detail="No puedes devolver un libro que no te prestaron")
+
+@router.get("/{book_id}/loans", response_model=List[Loan], summary="Historial de préstamos del libro")
+async def read_book_loans(
+    *,
+    db: AsyncSession = Depends(get_async_read_db),
+    book_id: int,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    response: Response = None,
+    current_user: dict = Depends(get_current_admin)
+) -> Any:
+    """
+    Historial de préstamos y devoluciones del libro, del más reciente al más
+    antiguo, paginado por cursor.
+
+    Requiere que el usuario figure en ADMIN_USER_IDS.
+
+    - **cursor**: Cursor de la página siguiente, tomado de la cabecera `X-Next-Cursor`
+    - **since** / **until**: Limita el historial a `[since, until)`; en PostgreSQL
+      solo se recorren las particiones mensuales de ese rango
+    """
+    with bad_request(InvalidCursorError):
+        loans, next_cursor = await loan_crud.get_history(
+            db, book_id=book_id, cursor=cursor, limit=limit, since=since, until=until
+        )
+    return cursor_page(response, loans, next_cursor)
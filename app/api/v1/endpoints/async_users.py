@@ -0,0 +1,116 @@
+from typing import Any, List, Literal, Optional, Union
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.dependencies import get_async_db, get_async_read_db
+from app.api.responses import (
+    bad_request, cursor_page, detail_fieldset, list_response, page_arguments, sparse_detail
+)
+from app.api.routing import SerializedRoute
+from app.core.security import get_current_user, ensure_self_or_admin
+from app.crud.pagination import InvalidCursorError
+from app.crud.user import async_user as user_crud
+from app.schemas.user import User
+from app.schemas.page import Page
+from app.crud.loan import async_loan as loan_crud
+from app.schemas.loan import Loan
+
+# Versiones asíncronas de los endpoints de lectura de usuarios.
+# Se usan en lugar de las síncronas cuando DB_ASYNC está habilitado.
+router = APIRouter(route_class=SerializedRoute)
+
+@router.get("/", response_model=Union[List[User], Page[User]], summary="Listar usuarios")
+async def read_users(
+    db: AsyncSession = Depends(get_async_db),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    order_by: str = "id",
+    envelope: bool = False,
+    count: Literal["auto", "exact", "estimated"] = "auto",
+    ids: Optional[str] = None,
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    current_user: dict = Depends(get_current_user),
+    response: Response = None
+) -> Any:
+    """
+    Recupera una lista de usuarios.
+
+    - **skip**: Número de registros a saltar
+    - **limit**: Número máximo de registros a retornar
+    - **cursor**: Cursor de la página siguiente, tomado de la cabecera `X-Next-Cursor`
+    - **order_by**: Orden de la paginación por cursor (`id` o `created_at`)
+    - **envelope**: Retorna `{items, total, next}` en lugar de la lista
+    - **count**: Cálculo de `total`: `exact`, `estimated` (estadísticas de PostgreSQL)
+      o `auto` (estimado solo en tablas grandes)
+    - **ids**: IDs separados por comas; retorna esos registros en el orden pedido
+      e informa los inexistentes en la cabecera `X-Missing-Ids`
+    - **fields**: Columnas a retornar, separadas por comas (`id` siempre se incluye)
+    - **include**: Relaciones a incluir, separadas por comas; con `fields` o `include`
+      se omiten las relaciones no pedidas y solo se leen las columnas necesarias
+    """
+    arguments = page_arguments(
+        user_crud, skip=skip, limit=limit, cursor=cursor, order_by=order_by,
+        envelope=envelope, count=count, ids=ids, fields=fields, include=include
+    )
+    with bad_request():
+        page = await user_crud.get_page(db, **arguments)
+    return list_response(
+        user_crud, page, fieldset=arguments["fieldset"], envelope=envelope, response=response
+    )
+
+@router.get("/{user_id}", response_model=User, summary="Obtener usuario")
+async def read_user(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    user_id: int,
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+) -> Any:
+    """
+    Obtiene un usuario específico por su ID.
+
+    - **user_id**: ID del usuario a recuperar
+    - **fields** / **include**: Columnas y relaciones a retornar, como en el listado
+    """
+    fieldset = detail_fieldset(user_crud, fields, include)
+    if fieldset is not None:
+        return sparse_detail(
+            user_crud, await user_crud.get(db, id=user_id, fieldset=fieldset), fieldset,
+            not_found="Usuario no encontrado"
+        )
+    db_user = await user_crud.get(db, id=user_id)
+    if not db_user:
+        raise HTTPException(status_code=404, detail="Usuario no encontrado")
+    return db_user
+
+@router.get("/{user_id}/loans", response_model=List[Loan], summary="Historial de préstamos del usuario")
+async def read_user_loans(
+    *,
+    db: AsyncSession = Depends(get_async_read_db),
+    user_id: int,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    response: Response = None,
+    current_user: dict = Depends(get_current_user)
+) -> Any:
+    """
+    Historial de préstamos y devoluciones del usuario, del más reciente al
+    más antiguo, paginado por cursor.
+
+    Solo puede consultarlo el propio usuario o un administrador (ADMIN_USER_IDS).
+
+    - **cursor**: Cursor de la página siguiente, tomado de la cabecera `X-Next-Cursor`
+    - **since** / **until**: Limita el historial a `[since, until)`; en PostgreSQL
+      solo se recorren las particiones mensuales de ese rango
+    """
+    ensure_self_or_admin(current_user, user_id)
+    with bad_request(InvalidCursorError):
+        loans, next_cursor = await loan_crud.get_history(
+            db, user_id=user_id, cursor=cursor, limit=limit, since=since, until=until
+        )
+    return cursor_page(response, loans, next_cursor)
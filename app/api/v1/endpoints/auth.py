@@ -1,13 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app.api.dependencies import get_db
+from app.api.routing import SerializedRoute
 from app.crud.user import user as user_crud
-from app.core.security import verify_password, create_access_token
+from app.core.security import create_access_token
+from app.services.hashing_service import hashing
 from datetime import timedelta
 from app.core.config import settings
 from pydantic import BaseModel
 
-router = APIRouter()
+router = APIRouter(route_class=SerializedRoute)
 
 class LoginData(BaseModel):
     email: str
@@ -19,7 +21,7 @@ def login(
     db: Session = Depends(get_db)
 ):
     user = user_crud.get_by_email(db, email=login_data.email)    
-    if not user or not verify_password(login_data.password, user.hashed_password):
+    if not user or not hashing.verify_password(login_data.password, user.hashed_password):
         raise HTTPException(
             status_code=401,
             detail="Credenciales incorrectas"
@@ -1,13 +1,24 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, List, Literal, Optional, Union
+import io
+from fastapi import APIRouter, Depends, File, HTTPException, Response, UploadFile, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from datetime import datetime
-from app.api.dependencies import get_db
+from app.api.dependencies import get_db, get_read_db
+from app.api.responses import (
+    bad_request, cached_detail, check_export_format, detail_fieldset, export_response,
+    list_not_modified, list_response, page_arguments, sparse_detail
+)
+from app.api.routing import SerializedRoute
 from app.core.security import get_current_user
 from app.crud.author import author
-from app.schemas.author import Author, AuthorCreate, AuthorUpdate
+from app.utils import export
+from app.schemas.bulk import BulkImportResult
+from app.services import bulk_import
+from app.schemas.author import Author, AuthorWithCounts, AuthorCreate, AuthorUpdate
+from app.schemas.page import Page
 
-router = APIRouter()
+router = APIRouter(route_class=SerializedRoute)
 
 @router.post("/", response_model=Author, summary="Crear autor")
 def create_author(
@@ -27,31 +38,132 @@ def create_author(
         )
     return author.create(db, obj_in=author_in)
 
-@router.get("/", response_model=List[Author], summary="Listar autores")
-def read_authors(
+@router.post("/bulk", response_model=BulkImportResult, summary="Importar autores")
+def import_authors(
+    *,
     db: Session = Depends(get_db),
+    file: UploadFile = File(...),
+    format: Optional[str] = None,
+    batch_size: int = 1000,
+    current_user: dict = Depends(get_current_user)
+) -> Any:
+    """
+    Importa autores de forma masiva desde un archivo NDJSON o CSV.
+
+    Las filas inválidas se reportan con su número de línea sin detener la
+    importación.
+
+    - **format**: `ndjson` o `csv`; por defecto se deduce de la extensión del archivo
+    - **batch_size**: Filas por lote insertado y confirmado
+    """
+    try:
+        fmt = bulk_import.detect_format(file.filename, format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        return bulk_import.import_authors(db, stream, fmt, batch_size=batch_size)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="El archivo debe estar codificado en UTF-8")
+    finally:
+        stream.detach()
+
+@router.get("/", response_model=Union[List[Author], Page[Author]], summary="Listar autores")
+def read_authors(
+    db: Session = Depends(get_read_db),
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    order_by: str = "id",
+    envelope: bool = False,
+    count: Literal["auto", "exact", "estimated"] = "auto",
+    ids: Optional[str] = None,
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    with_counts: bool = False,
+    response: Response = None,
+    request: Request = None
 ) -> Any:
     """
     Recupera todos los autores.
+
+    - **cursor**: Cursor de la página siguiente, tomado de la cabecera `X-Next-Cursor`
+    - **order_by**: Orden de la paginación por cursor (`id` o `created_at`)
+    - **envelope**: Retorna `{items, total, next}` en lugar de la lista
+    - **count**: Cálculo de `total`: `exact`, `estimated` (estadísticas de PostgreSQL)
+      o `auto` (estimado solo en tablas grandes)
+    - **ids**: IDs separados por comas; retorna esos registros en el orden pedido
+      e informa los inexistentes en la cabecera `X-Missing-Ids`
+    - **fields**: Columnas a retornar, separadas por comas (`id` siempre se incluye)
+    - **include**: Relaciones a incluir, separadas por comas; con `fields` o `include`
+      se omiten las relaciones no pedidas y solo se leen las columnas necesarias
+    - **with_counts**: Agrega `book_count` y `available_count` a cada autor, sin sus
+      libros; admite además `order_by` por conteo (`book_count`, `available_count`,
+      con el prefijo `-` para orden descendente)
     """
-    authors = author.get_multi(db, skip=skip, limit=limit)
-    return authors
+    if with_counts and (ids is not None or fields is not None or include is not None):
+        raise HTTPException(status_code=400, detail="with_counts no admite ids, fields ni include")
+    if request is not None:
+        not_modified = list_not_modified(request, response, author.get_list_version(db))
+        if not_modified:
+            return not_modified
+    arguments = page_arguments(
+        author, skip=skip, limit=limit, cursor=cursor, order_by=order_by,
+        envelope=envelope, count=count, ids=ids, fields=fields, include=include
+    )
+    with bad_request():
+        if with_counts:
+            page = author.get_multi_with_counts(
+                db, skip=skip, limit=limit, cursor=cursor, order_by=order_by, count=arguments["count"]
+            )
+        else:
+            page = author.get_page(db, **arguments)
+    return list_response(
+        author, page, fieldset=arguments["fieldset"], envelope=envelope, response=response,
+        model=AuthorWithCounts if with_counts else None
+    )
+
+@router.get("/export", response_class=StreamingResponse, summary="Exportar autores")
+def export_authors(
+    db: Session = Depends(get_read_db),
+    format: str = "ndjson"
+) -> StreamingResponse:
+    """
+    Exporta todos los autores en NDJSON o CSV.
+
+    La respuesta se envía por fragmentos a medida que se leen las filas, sin
+    cargar el catálogo completo en memoria.
+
+    - **format**: `ndjson` (por defecto) o `csv`
+    """
+    check_export_format(format)
+    rows = author.stream_rows(db)
+    return export_response(export.iter_export(rows, author.export_columns, format), format, "authors")
 
 @router.get("/{author_id}", response_model=Author, summary="Obtener autor")
 def read_author(
     *,
-    db: Session = Depends(get_db),
-    author_id: int
+    db: Session = Depends(get_read_db),
+    author_id: int,
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    response: Response = None,
+    request: Request = None
 ) -> Any:
     """
     Obtiene un autor específico por su ID.
+
+    - **fields** / **include**: Columnas y relaciones a retornar, como en el listado
     """
-    db_author = author.get(db, id=author_id)
-    if not db_author:
-        raise HTTPException(status_code=404, detail="Autor no encontrado")
-    return db_author
+    fieldset = detail_fieldset(author, fields, include)
+    if fieldset is not None:
+        return sparse_detail(
+            author, author.get(db, id=author_id, fieldset=fieldset), fieldset,
+            not_found="Autor no encontrado", request=request, response=response
+        )
+    return cached_detail(
+        author.get_cached(db, id=author_id), not_found="Autor no encontrado", request=request, response=response
+    )
 
 @router.put("/{author_id}", response_model=Author, summary="Actualizar autor")
 def update_author(
@@ -1,16 +1,29 @@
-from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, List, Literal, Optional, Union
+from datetime import datetime
+import io
+from fastapi import APIRouter, Depends, File, HTTPException, Response, UploadFile, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from app.api.dependencies import get_db
-from app.core.security import get_current_user
+from app.api.dependencies import get_db, get_read_db
+from app.api.responses import (
+    bad_request, cached_detail, check_export_format, cursor_page, detail_fieldset, export_response,
+    list_not_modified, list_response, page_arguments, sparse_detail
+)
+from app.api.routing import SerializedRoute
+from app.core.security import get_current_user, get_current_admin
 from app.crud.book import book
+from app.crud.pagination import InvalidCursorError
+from app.utils import export
+from app.schemas.bulk import BulkImportResult
+from app.services import bulk_import
 from app.schemas.book import Book, BookCreate, BookUpdate
+from app.schemas.page import Page
 from app.crud.author import author as author_crud
-from app.crud.user import user as user_crud
-from fastapi.encoders import jsonable_encoder
-import json
+from app.crud.loan import loan as loan_crud
+from app.schemas.loan import Loan
 
-router = APIRouter()
+router = APIRouter(route_class=SerializedRoute)
 
 @router.post("/", response_model=Book, summary="Crear libro")
 def create_book(
@@ -27,52 +40,131 @@ def create_book(
     - **publication_year**: Año de publicación (opcional)
     """
     # Validar que el autor existe
-    db_author = author_crud.get(db, id=book_in.author_id)
+    db_author = author_crud.get_cached(db, id=book_in.author_id)
     if not db_author:
         raise HTTPException(
             status_code=404,
             detail=f"El autor con ID {book_in.author_id} no existe"
         )
-    print('Entro al create')
-    
-    created_book = book.create(db, obj_in=book_in)
-    
-    # Convertir el objeto SQLAlchemy a un diccionario
-    book_dict = jsonable_encoder(created_book)
-    
-    # Convertir el diccionario a un objeto Pydantic (Book)
-    return Book.model_validate(book_dict)
+    return book.create(db, obj_in=book_in)
 
-@router.get("/", response_model=List[Book], summary="Listar libros")
-def read_books(
+@router.post("/bulk", response_model=BulkImportResult, summary="Importar libros")
+def import_books(
+    *,
     db: Session = Depends(get_db),
+    file: UploadFile = File(...),
+    format: Optional[str] = None,
+    batch_size: int = 1000,
+    current_user: dict = Depends(get_current_user)
+) -> Any:
+    """
+    Importa libros de forma masiva desde un archivo NDJSON o CSV.
+
+    Cada fila debe incluir `title` y `author_id` o `author_name`. Las filas
+    inválidas se reportan con su número de línea sin detener la importación.
+
+    - **format**: `ndjson` o `csv`; por defecto se deduce de la extensión del archivo
+    - **batch_size**: Filas por lote insertado y confirmado
+    """
+    try:
+        fmt = bulk_import.detect_format(file.filename, format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        return bulk_import.import_books(db, stream, fmt, batch_size=batch_size)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="El archivo debe estar codificado en UTF-8")
+    finally:
+        stream.detach()
+
+@router.get("/", response_model=Union[List[Book], Page[Book]], summary="Listar libros")
+def read_books(
+    db: Session = Depends(get_read_db),
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    order_by: str = "id",
+    envelope: bool = False,
+    count: Literal["auto", "exact", "estimated"] = "auto",
+    ids: Optional[str] = None,
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    response: Response = None,
+    request: Request = None
 ) -> Any:
     """
     Recupera una lista de libros.
 
     - **skip**: Número de registros a saltar
     - **limit**: Número máximo de registros a retornar
+    - **cursor**: Cursor de la página siguiente, tomado de la cabecera `X-Next-Cursor`
+    - **order_by**: Orden de la paginación por cursor (`id`, `title` o `created_at`)
+    - **envelope**: Retorna `{items, total, next}` en lugar de la lista
+    - **count**: Cálculo de `total`: `exact`, `estimated` (estadísticas de PostgreSQL)
+      o `auto` (estimado solo en tablas grandes)
+    - **ids**: IDs separados por comas; retorna esos registros en el orden pedido
+      e informa los inexistentes en la cabecera `X-Missing-Ids`
+    - **fields**: Columnas a retornar, separadas por comas (`id` siempre se incluye)
+    - **include**: Relaciones a incluir, separadas por comas; con `fields` o `include`
+      se omiten las relaciones no pedidas y solo se leen las columnas necesarias
     """
-    books = book.get_multi(db, skip=skip, limit=limit)
-    return books
+    if request is not None:
+        not_modified = list_not_modified(request, response, book.get_list_version(db))
+        if not_modified:
+            return not_modified
+    arguments = page_arguments(
+        book, skip=skip, limit=limit, cursor=cursor, order_by=order_by,
+        envelope=envelope, count=count, ids=ids, fields=fields, include=include
+    )
+    with bad_request():
+        page = book.get_page(db, **arguments)
+    return list_response(
+        book, page, fieldset=arguments["fieldset"], envelope=envelope, response=response
+    )
+
+@router.get("/export", response_class=StreamingResponse, summary="Exportar libros")
+def export_books(
+    db: Session = Depends(get_read_db),
+    format: str = "ndjson"
+) -> StreamingResponse:
+    """
+    Exporta todos los libros en NDJSON o CSV.
+
+    La respuesta se envía por fragmentos a medida que se leen las filas, sin
+    cargar el catálogo completo en memoria.
+
+    - **format**: `ndjson` (por defecto) o `csv`
+    """
+    check_export_format(format)
+    rows = book.stream_rows(db)
+    return export_response(export.iter_export(rows, book.export_columns, format), format, "books")
 
 @router.get("/{book_id}", response_model=Book, summary="Obtener libro")
 def read_book(
     *,
-    db: Session = Depends(get_db),
-    book_id: int
+    db: Session = Depends(get_read_db),
+    book_id: int,
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    response: Response = None,
+    request: Request = None
 ) -> Any:
     """
     Obtiene un libro específico por su ID.
 
     - **book_id**: ID del libro a recuperar
+    - **fields** / **include**: Columnas y relaciones a retornar, como en el listado
     """
-    db_book = book.get(db, id=book_id)
-    if not db_book:
-        raise HTTPException(status_code=404, detail="Libro no encontrado")
-    return db_book
+    fieldset = detail_fieldset(book, fields, include)
+    if fieldset is not None:
+        return sparse_detail(
+            book, book.get(db, id=book_id, fieldset=fieldset), fieldset,
+            not_found="Libro no encontrado", request=request, response=response
+        )
+    return cached_detail(
+        book.get_cached(db, id=book_id), not_found="Libro no encontrado", request=request, response=response
+    )
 
 @router.put("/{book_id}", response_model=Book, summary="Actualizar libro")
 def update_book(
@@ -91,7 +183,7 @@ def update_book(
     
     # Si se está actualizando el autor, validar que existe
     if book_in.author_id is not None:
-        db_author = author_crud.get(db, id=book_in.author_id)
+        db_author = author_crud.get_cached(db, id=book_in.author_id)
         if not db_author:
             raise HTTPException(
                 status_code=404,
@@ -120,17 +212,23 @@ def delete_book(
 @router.get("/search/", response_model=List[Book], summary="Buscar libros")
 def search_books(
     *,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     title: Optional[str] = None,
     author_id: Optional[int] = None,
     publication_year: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 100
 ) -> Any:
     """
     Busca libros por título, autor o año de publicación.
+    Los resultados de la búsqueda por título se ordenan por relevancia.
+
+    - **skip**: Número de resultados a saltar
+    - **limit**: Número máximo de resultados a retornar
     """
     # Validar que el autor existe si se proporciona
     if author_id is not None:
-        db_author = author_crud.get(db, id=author_id)
+        db_author = author_crud.get_cached(db, id=author_id)
         if not db_author:
             raise HTTPException(
                 status_code=404,
@@ -141,7 +239,9 @@ def search_books(
         db, 
         title=title, 
         author_id=author_id, 
-        publication_year=publication_year
+        publication_year=publication_year,
+        skip=skip,
+        limit=limit
     )
     return books
 
@@ -155,25 +255,23 @@ def borrow_book(
     """
     Registra el préstamo de un libro a un usuario.
     """
-    # Validar que el libro existe
+    try:
+        borrowed_book = book.borrow_book(db, book_id=book_id, user_id=current_user["user_id"])
+    except IntegrityError:
+        # La clave foránea garantiza que el usuario del token todavía existe
+        db.rollback()
+        raise HTTPException(status_code=404, detail="Usuario no encontrado")
+    if borrowed_book:
+        return borrowed_book
+    
+    # El UPDATE no modificó ninguna fila: averiguar el motivo
     db_book = book.get(db, id=book_id)
     if not db_book:
         raise HTTPException(status_code=404, detail="Libro no encontrado")
-    if db_book.borrowed_by_id:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"El libro ya está prestado al usuario con ID {db_book.borrowed_by_id}"
-        )
-    
-    # Validar que el usuario existe (opcional, ya que current_user ya lo garantiza)
-    user = user_crud.get(db, id=current_user["user_id"])
-    if not user:
-        raise HTTPException(
-            status_code=404,
-            detail="Usuario no encontrado"
-        )
-    
-    return book.borrow_book(db, book_id=book_id, user_id=current_user["user_id"])
+    raise HTTPException(
+        status_code=400, 
+        detail=f"El libro ya está prestado al usuario con ID {db_book.borrowed_by_id}"
+    )
 
 @router.post("/{book_id}/return", response_model=Book, summary="Devolver libro")
 def return_book(
@@ -187,11 +285,42 @@ def return_book(
 
     - **book_id**: ID del libro a devolver
     """
+    returned_book = book.return_book(db, book_id=book_id, user_id=current_user["user_id"])
+    if returned_book:
+        return returned_book
+    
+    # El UPDATE no modificó ninguna fila: averiguar el motivo
     db_book = book.get(db, id=book_id)
     if not db_book:
         raise HTTPException(status_code=404, detail="Libro no encontrado")
     if not db_book.borrowed_by_id:
         raise HTTPException(status_code=400, detail="El libro no está prestado")
-    if db_book.borrowed_by_id != current_user["user_id"]:
-        raise HTTPException(status_code=403, detail="No puedes devolver un libro que no te prestaron")
-    return book.return_book(db, book_id=book_id)
\ No newline at end of file
+    raise HTTPException(status_code=403, detail="No puedes devolver un libro que no te prestaron")
+
+@router.get("/{book_id}/loans", response_model=List[Loan], summary="Historial de préstamos del libro")
+def read_book_loans(
+    *,
+    db: Session = Depends(get_read_db),
+    book_id: int,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    response: Response = None,
+    current_user: dict = Depends(get_current_admin)
+) -> Any:
+    """
+    Historial de préstamos y devoluciones del libro, del más reciente al más
+    antiguo, paginado por cursor.
+
+    Requiere que el usuario figure en ADMIN_USER_IDS.
+
+    - **cursor**: Cursor de la página siguiente, tomado de la cabecera `X-Next-Cursor`
+    - **since** / **until**: Limita el historial a `[since, until)`; en PostgreSQL
+      solo se recorren las particiones mensuales de ese rango
+    """
+    with bad_request(InvalidCursorError):
+        loans, next_cursor = loan_crud.get_history(
+            db, book_id=book_id, cursor=cursor, limit=limit, since=since, until=until
+        )
+    return cursor_page(response, loans, next_cursor)
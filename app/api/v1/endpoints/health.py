@@ -0,0 +1,36 @@
+from typing import Any
+from fastapi import APIRouter
+from app.api.dependencies import get_replica_router
+from app.api.routing import SerializedRoute
+from app.core import pool_metrics
+from app.core.entity_cache import entity_cache
+from app.core.security import token_cache
+
+router = APIRouter(route_class=SerializedRoute)
+
+@router.get("/db", summary="Estado del pool de conexiones")
+def db_health() -> Any:
+    """
+    Reporta el uso de cada pool de conexiones: conexiones en uso, overflow,
+    saturación, tiempos de espera por una conexión y timeouts.
+
+    El estado es `saturated` cuando algún pool tiene todas sus conexiones en uso.
+    `reads` cuenta las sesiones de lectura servidas por el primario y por las réplicas.
+    """
+    pools = [pool_metrics.pool_status(name) for name in pool_metrics.registry]
+    saturated = any(pool.get("saturation", 0) >= 1 for pool in pools)
+    return {
+        "status": "saturated" if saturated else "ok",
+        "pools": pools,
+        "reads": get_replica_router().stats()
+    }
+
+@router.get("/cache", summary="Estado de las cachés")
+def cache_health() -> Any:
+    """
+    Reporta tamaño, aciertos, fallos y tasa de aciertos de las cachés en memoria.
+    """
+    return {
+        "token_cache": token_cache.stats(),
+        "entity_cache": entity_cache.stats()
+    }
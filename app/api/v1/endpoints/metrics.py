@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Response
+from app.api.routing import SerializedRoute
+from app.core import metrics
+
+router = APIRouter(route_class=SerializedRoute)
+
+@router.get("/metrics", summary="Métricas en formato Prometheus", include_in_schema=False)
+def prometheus_metrics() -> Response:
+    """
+    Expone las métricas de la API, del pool de conexiones, de bcrypt, de las
+    cachés y de los préstamos; con PROMETHEUS_MULTIPROC_DIR, las de todos los workers.
+    """
+    return Response(metrics.exposition(), media_type=metrics.CONTENT_TYPE_LATEST)
@@ -1,9 +1,41 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import auth, users, books, authors
+from app.core.config import settings
 
-api_router = APIRouter()
+def merge_routers(primary: APIRouter, fallback: APIRouter) -> APIRouter:
+    """
+    Combina dos routers. Las rutas de `primary` reemplazan a las de `fallback`
+    que tengan el mismo path y método.
+    """
+    merged = APIRouter()
+    overridden = {
+        (route.path, method)
+        for route in primary.routes
+        for method in route.methods
+    }
+    merged.routes.extend(primary.routes)
+    merged.routes.extend(
+        route for route in fallback.routes
+        if not any((route.path, method) in overridden for method in route.methods)
+    )
+    return merged
 
-api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
-api_router.include_router(users.router, prefix="/users", tags=["users"])
-api_router.include_router(books.router, prefix="/books", tags=["books"])
-api_router.include_router(authors.router, prefix="/authors", tags=["authors"])
\ No newline at end of file
+def create_api_router() -> APIRouter:
+    """
+    Router de la API v1. Los módulos de endpoints se importan aquí, al crear
+    la aplicación, y no al importar este módulo.
+    """
+    from app.api.v1.endpoints import admin, auth, users, books, authors
+    users_router, books_router, authors_router = users.router, books.router, authors.router
+    if settings.DB_ASYNC:
+        from app.api.v1.endpoints import async_authors, async_books, async_users
+        users_router = merge_routers(async_users.router, users.router)
+        books_router = merge_routers(async_books.router, books.router)
+        authors_router = merge_routers(async_authors.router, authors.router)
+
+    api_router = APIRouter()
+    api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
+    api_router.include_router(users_router, prefix="/users", tags=["users"])
+    api_router.include_router(books_router, prefix="/books", tags=["books"])
+    api_router.include_router(authors_router, prefix="/authors", tags=["authors"])
+    api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
+    return api_router
@@ -0,0 +1,79 @@
+"""
+Comandos de administración de la biblioteca.
+
+Uso:
+    python -m app.cli import-authors autores.csv
+    python -m app.cli import-books libros.ndjson --batch-size 5000
+    python -m app.cli worker
+"""
+import argparse
+import json
+import logging
+import signal
+import sys
+import threading
+from typing import List, Optional
+from app.core.config import settings
+from app.core.database import database
+from app.services import bulk_import
+from app.services.jobs import JobWorker
+from app.services.loan_partitions import ensure_partitions
+
+IMPORTERS = {
+    "import-authors": bulk_import.import_authors,
+    "import-books": bulk_import.import_books,
+}
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Herramientas de la biblioteca digital")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for command in IMPORTERS:
+        sub = subparsers.add_parser(command, help=f"Importación masiva ({command.split('-')[1]})")
+        sub.add_argument("path", help="Archivo NDJSON o CSV")
+        sub.add_argument("--format", choices=bulk_import.FORMATS, help="Formato del archivo (por defecto según la extensión)")
+        sub.add_argument("--batch-size", type=int, default=1000, help="Filas por lote")
+    worker = subparsers.add_parser("worker", help="Procesa la cola de trabajos (emails y notificaciones)")
+    worker.add_argument("--batch-size", type=int, help="Trabajos por lote (por defecto JOB_BATCH_SIZE)")
+    worker.add_argument("--once", action="store_true", help="Procesa un solo lote y termina")
+    return parser
+
+def create_partitions() -> None:
+    """Particiones del historial de préstamos de los próximos meses"""
+    ensure_partitions(database.engine)
+
+def run_worker(args: argparse.Namespace) -> int:
+    """
+    Procesa la cola hasta recibir SIGINT o SIGTERM; el lote en curso se
+    termina. Entre lotes crea las particiones de préstamos que falten.
+    """
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    worker = JobWorker(
+        database.SessionLocal,
+        batch_size=args.batch_size,
+        periodic=[(settings.LOAN_PARTITIONS_INTERVAL, create_partitions)],
+    )
+    if args.once:
+        print(json.dumps({"processed": worker.run_once()}))
+        return 0
+    stop = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop.set())
+    worker.run(stop)
+    return 0
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command == "worker":
+        return run_worker(args)
+    fmt = bulk_import.detect_format(args.path, args.format)
+    db = database.SessionLocal()
+    try:
+        with open(args.path, encoding="utf-8-sig", newline="") as stream:
+            result = IMPORTERS[args.command](db, stream, fmt, batch_size=args.batch_size)
+    finally:
+        db.close()
+    print(json.dumps(result.model_dump(), ensure_ascii=False, indent=2))
+    return 1 if result.failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
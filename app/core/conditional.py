@@ -0,0 +1,74 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Iterator, Mapping, Optional, Sequence, Tuple
+from fastapi import Request, Response
+
+def _timestamps(values: Sequence[Any]) -> Iterator[datetime]:
+    for value in values:
+        if isinstance(value, datetime):
+            yield value
+        elif isinstance(value, tuple):
+            yield from _timestamps(value)
+
+def validators(version: Sequence[Any], *extra: Any) -> Tuple[str, Optional[datetime]]:
+    """
+    Calcula el ETag fuerte y la fecha de última modificación a partir de la
+    versión de un recurso (los `updated_at` de sus filas o, en los listados,
+    sus máximos y conteos). `extra` distingue representaciones distintas de
+    los mismos datos, como cada página de un listado.
+    """
+    digest = hashlib.sha256(repr((tuple(version), extra)).encode()).hexdigest()
+    timestamps = list(_timestamps(version))
+    last_modified = max(timestamps) if timestamps else None
+    if last_modified is not None and last_modified.tzinfo is None:
+        # updated_at se guarda en UTC sin zona horaria
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    return f'"{digest[:32]}"', last_modified
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in header.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+def is_not_modified(headers: Mapping[str, str], etag: str, last_modified: Optional[datetime]) -> bool:
+    """
+    Evalúa las precondiciones `If-None-Match` e `If-Modified-Since`. Como
+    indica el RFC 9110, `If-Modified-Since` se ignora si hay `If-None-Match`.
+    """
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) <= since
+
+def check(
+    request: Request,
+    response: Optional[Response],
+    version: Optional[Sequence[Any]],
+    *extra: Any
+) -> Optional[Response]:
+    """
+    Agrega `ETag` y `Last-Modified` a la respuesta. Si el cliente ya tiene la
+    versión actual retorna la respuesta 304 que debe enviarse en su lugar.
+    """
+    if version is None:
+        return None
+    etag, last_modified = validators(version, *extra)
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+    if request.method in ("GET", "HEAD") and is_not_modified(request.headers, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    if response is not None:
+        response.headers.update(headers)
+    return None
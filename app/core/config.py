@@ -1,6 +1,16 @@
+from functools import lru_cache
 from pydantic_settings import BaseSettings
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional, cast
+
+def async_url(url: str) -> str:
+    """Convierte una URL de base de datos a su driver asíncrono"""
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    return url
 
 class Settings(BaseSettings):
     """Configuración de la aplicación"""
@@ -14,10 +24,79 @@ class Settings(BaseSettings):
     POSTGRES_SERVER: str
     POSTGRES_DB: str
     POSTGRES_URL: str
+    # Usa el motor asíncrono (asyncpg) en los endpoints de lectura y préstamo
+    DB_ASYNC: bool = False
+
+    # Pool de conexiones
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Réplicas de solo lectura (URLs separadas por comas) para los GET de
+    # libros y autores, y segundos que un usuario lee del primario tras escribir
+    DB_REPLICA_URLS: str = ""
+    DB_REPLICA_STICKINESS: int = 5
+
+    # Caché de entidades serializadas (0 la desactiva), vida de cada entrada y
+    # canal de LISTEN/NOTIFY con el que se invalida en todos los workers
+    ENTITY_CACHE_SIZE: int = 10000
+    ENTITY_CACHE_TTL: int = 60
+    ENTITY_CACHE_CHANNEL: str = "entity_cache"
+    # Filas a partir de las cuales el total de los listados (`count=auto`) se
+    # toma de la estimación de PostgreSQL en lugar de contarlas
+    COUNT_ESTIMATE_THRESHOLD: int = 100000
+    # IDs que admite un listado por `ids=1,2,3`
+    MULTI_GET_MAX_IDS: int = 100
+    # Particiones mensuales del historial de préstamos que se crean por
+    # adelantado (además de la del mes en curso), al iniciar y cada
+    # LOAN_PARTITIONS_INTERVAL segundos desde el worker de trabajos
+    LOAN_PARTITIONS_AHEAD: int = 3
+    LOAN_PARTITIONS_INTERVAL: int = 3600
+
+    # Métricas por petición (cabecera Server-Timing y log) y presupuesto de
+    # consultas SQL por petición, general y por ruta ("GET /api/v1/users/": 2)
+    REQUEST_METRICS: bool = True
+    QUERY_BUDGET: int = 20
+    QUERY_BUDGETS: Dict[str, int] = {}
+    # Endpoint /metrics en formato Prometheus
+    PROMETHEUS_METRICS: bool = True
+    # Registro de consultas lentas (milisegundos, 0 lo desactiva), consultas
+    # que conserva y planes de ejecución que puede obtener por minuto
+    SLOW_QUERY_MS: int = 200
+    SLOW_QUERY_LOG_SIZE: int = 100
+    SLOW_QUERY_EXPLAINS_PER_MINUTE: int = 6
     
     # Seguridad
     JWT_SECRET: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+    # Procesos dedicados a bcrypt (0 = en el mismo hilo) y hashes en cola permitidos
+    HASH_WORKERS: int = 2
+    HASH_QUEUE_SIZE: int = 32
+    HASH_TIMEOUT: int = 10
+    # Caché de tokens verificados (0 la desactiva) y vida máxima de cada entrada
+    TOKEN_CACHE_SIZE: int = 10000
+    TOKEN_CACHE_TTL: int = 300
+    # Usuarios con acceso a los endpoints de administración
+    ADMIN_USER_IDS: List[int] = []
+
+    # Servidor SMTP (sin SMTP_HOST los emails solo se registran en el log)
+    SMTP_HOST: Optional[str] = None
+    SMTP_PORT: int = 25
+    SMTP_USER: Optional[str] = None
+    SMTP_PASSWORD: Optional[str] = None
+    SMTP_STARTTLS: bool = False
+    SMTP_TIMEOUT: int = 10
+    EMAIL_FROM: str = "biblioteca@example.com"
+    # Cola de trabajos: trabajos por lote, segundos entre consultas sin
+    # trabajos, intentos, espera entre reintentos (exponencial, con tope) y
+    # segundos tras los que un trabajo tomado por un worker caído se retoma
+    JOB_BATCH_SIZE: int = 50
+    JOB_POLL_INTERVAL: float = 1.0
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_BASE_SECONDS: int = 30
+    JOB_RETRY_MAX_SECONDS: int = 3600
+    JOB_LEASE_SECONDS: int = 300
 
     class Config:
         case_sensitive = True
@@ -34,4 +113,51 @@ class Settings(BaseSettings):
             
         return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}/{self.POSTGRES_DB}"
 
-settings = Settings()
\ No newline at end of file
+    @property
+    def DB_POOL_OPTIONS(self) -> dict:
+        """
+        Parámetros del pool de conexiones para `create_engine`.
+        """
+        return {
+            "pool_size": self.DB_POOL_SIZE,
+            "max_overflow": self.DB_MAX_OVERFLOW,
+            "pool_timeout": self.DB_POOL_TIMEOUT,
+            "pool_recycle": self.DB_POOL_RECYCLE,
+            "pool_pre_ping": self.DB_POOL_PRE_PING,
+        }
+
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        """
+        Obtiene la URL de la base de datos con el driver asíncrono asyncpg.
+        """
+        return async_url(self.DATABASE_URL)
+
+    @property
+    def REPLICA_URLS(self) -> List[str]:
+        """
+        Obtiene las URLs de las réplicas de lectura configuradas.
+        """
+        return [url.strip() for url in self.DB_REPLICA_URLS.split(",") if url.strip()]
+
+@lru_cache()
+def get_settings() -> Settings:
+    """Configuración leída del entorno (y de `.env`) una sola vez"""
+    return Settings()
+
+class LazySettings:
+    """
+    Acceso a `get_settings()` que lee el entorno en el primer uso y no al
+    importar el módulo. Las asignaciones (p. ej. `monkeypatch.setattr` en los
+    tests) se aplican a la configuración real.
+    """
+    def __getattr__(self, name: str) -> Any:
+        return getattr(get_settings(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(get_settings(), name, value)
+
+    def __delattr__(self, name: str) -> None:
+        delattr(get_settings(), name)
+
+settings = cast(Settings, LazySettings())
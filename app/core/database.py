@@ -0,0 +1,92 @@
+import threading
+from typing import Any, List
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from .config import async_url, settings
+from .pool_metrics import InstrumentedAsyncQueuePool, InstrumentedQueuePool, instrument_engine
+
+# Atributos que se crean con `Database.start`
+LAZY_ATTRIBUTES = (
+    "engine", "SessionLocal", "replica_engines", "replica_sessions",
+    "async_engine", "AsyncSessionLocal", "async_replica_sessions",
+)
+
+class Database:
+    """
+    Motores y fábricas de sesiones de la aplicación: el primario, las réplicas
+    de lectura y, con DB_ASYNC, sus versiones asíncronas.
+
+    No se crean al importar el módulo sino en el lifespan de la aplicación
+    (`start`) o al primer uso de cualquiera de sus atributos, de modo que
+    importar la aplicación, la CLI o los tests no requiere la configuración
+    de la base de datos ni carga sus drivers.
+    """
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.started = False
+
+    def __getattr__(self, name: str) -> Any:
+        # Solo se llama si el atributo aún no existe
+        if name in LAZY_ATTRIBUTES and not self.started:
+            self.start()
+            return getattr(self, name)
+        raise AttributeError(name)
+
+    def start(self) -> None:
+        with self._lock:
+            if self.started:
+                return
+            engine = create_engine(settings.DATABASE_URL, poolclass=InstrumentedQueuePool, **settings.DB_POOL_OPTIONS)
+            instrument_engine(engine, "primary")
+            replica_engines: List[Any] = []
+            for index, url in enumerate(settings.REPLICA_URLS):
+                replica_engines.append(create_engine(url, poolclass=InstrumentedQueuePool, **settings.DB_POOL_OPTIONS))
+                instrument_engine(replica_engines[-1], f"replica-{index}")
+            # El motor asíncrono solo se crea si está habilitado, ya que requiere asyncpg
+            async_engine = None
+            async_replica_sessions: List[Any] = []
+            if settings.DB_ASYNC:
+                async_engine = create_async_engine(
+                    settings.ASYNC_DATABASE_URL,
+                    poolclass=InstrumentedAsyncQueuePool,
+                    **settings.DB_POOL_OPTIONS
+                )
+                instrument_engine(async_engine.sync_engine, "async")
+                for index, url in enumerate(settings.REPLICA_URLS):
+                    replica = create_async_engine(async_url(url), poolclass=InstrumentedAsyncQueuePool, **settings.DB_POOL_OPTIONS)
+                    instrument_engine(replica.sync_engine, f"async-replica-{index}")
+                    async_replica_sessions.append(
+                        async_sessionmaker(bind=replica, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+                    )
+            self.engine = engine
+            self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+            self.replica_engines = replica_engines
+            self.replica_sessions = [sessionmaker(autocommit=False, autoflush=False, bind=e) for e in replica_engines]
+            self.async_engine = async_engine
+            self.AsyncSessionLocal = async_sessionmaker(
+                bind=async_engine,
+                class_=AsyncSession,
+                autoflush=False,
+                expire_on_commit=False
+            )
+            self.async_replica_sessions = async_replica_sessions
+            self.started = True
+
+    async def dispose(self) -> None:
+        """Cierra las conexiones de todos los pools; un uso posterior los vuelve a crear"""
+        with self._lock:
+            if not self.started:
+                return
+            engines = [self.engine, *self.replica_engines]
+            async_engines = [self.async_engine] if self.async_engine is not None else []
+            async_engines.extend(factory.kw["bind"] for factory in self.async_replica_sessions)
+            for name in LAZY_ATTRIBUTES:
+                self.__dict__.pop(name, None)
+            self.started = False
+        for engine in engines:
+            engine.dispose()
+        for engine in async_engines:
+            await engine.dispose()
+
+database = Database()
@@ -0,0 +1,108 @@
+import heapq
+import itertools
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from starlette.requests import Request
+from starlette.responses import Response
+from .entity_cache import CACHE_REFRESH_KEY, CACHE_TTL_KEY
+from .security import decode_token
+
+# Métodos que no modifican datos y pueden leerse de una réplica
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+# Cookie con el instante hasta el que el cliente debe leer del primario
+STICKY_COOKIE = "db_primary_until"
+
+def request_user_id(request: Request) -> Optional[Any]:
+    """Obtiene el usuario del token Bearer de la petición, si lo hay"""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    claims = decode_token(token)
+    return claims.get("user_id") if claims else None
+
+class ReplicaRouter:
+    """
+    Elige la sesión de cada petición de lectura: una réplica en turno
+    rotativo o el primario si el usuario escribió hace menos de `stickiness`
+    segundos, para que lea sus propias escrituras aunque la réplica tenga
+    retraso.
+
+    La ventana se guarda por usuario en el proceso y, para que valga en
+    cualquier worker, también en una cookie del cliente. Las ventanas vencidas
+    se descartan en cada escritura, en orden de vencimiento, para que los
+    usuarios que no vuelven a leer no se acumulen.
+    """
+    def __init__(self, stickiness: float = 5):
+        self.stickiness = stickiness
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._sticky_users: Dict[Any, float] = {}
+        # (vencimiento, usuario) de cada escritura, ordenado por vencimiento
+        self._deadlines: List[Tuple[float, Any]] = []
+        self.primary_reads = 0
+        self.replica_reads = 0
+
+    def is_sticky(self, request: Request) -> bool:
+        """Indica si la petición debe leer del primario"""
+        now = time.time()
+        try:
+            if float(request.cookies.get(STICKY_COOKIE, 0)) > now:
+                return True
+        except ValueError:
+            pass
+        user_id = request_user_id(request)
+        if user_id is None:
+            return False
+        with self._lock:
+            until = self._sticky_users.get(user_id)
+            if until is not None and until <= now:
+                del self._sticky_users[user_id]
+                until = None
+        return until is not None
+
+    def _prune(self, now: float) -> None:
+        """Descarta las ventanas vencidas; se llama con `_lock` tomado"""
+        while self._deadlines and self._deadlines[0][0] <= now:
+            until, user_id = heapq.heappop(self._deadlines)
+            # Si el usuario volvió a escribir, su ventana vigente es otra
+            if self._sticky_users.get(user_id) == until:
+                del self._sticky_users[user_id]
+
+    def mark_write(self, request: Request, response: Response) -> None:
+        """Abre la ventana de lectura desde el primario tras una escritura"""
+        now = time.time()
+        until = now + self.stickiness
+        user_id = request_user_id(request)
+        with self._lock:
+            self._prune(now)
+            if user_id is not None:
+                self._sticky_users[user_id] = until
+                heapq.heappush(self._deadlines, (until, user_id))
+        response.set_cookie(STICKY_COOKIE, f"{until:.3f}", max_age=int(self.stickiness) + 1, httponly=True)
+
+    def session_for(self, request: Request, primary: Callable[[], Any], replicas: List[Callable[[], Any]]) -> Any:
+        """Crea la sesión de lectura para la petición (síncrona o asíncrona)"""
+        if not replicas or request.method not in SAFE_METHODS or self.is_sticky(request):
+            self.primary_reads += 1
+            db = primary()
+            if replicas:
+                # La caché puede tener lo que otro usuario leyó de una réplica
+                # atrasada: se lee del primario y se reemplaza la entrada
+                db.info[CACHE_REFRESH_KEY] = True
+            return db
+        with self._lock:
+            index = next(self._counter) % len(replicas)
+        self.replica_reads += 1
+        db = replicas[index]()
+        # Lo leído de una réplica se guarda en caché solo durante la ventana
+        db.info[CACHE_TTL_KEY] = self.stickiness
+        return db
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "primary_reads": self.primary_reads,
+                "replica_reads": self.replica_reads,
+                "sticky_users": len(self._sticky_users),
+            }
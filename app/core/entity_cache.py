@@ -0,0 +1,173 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, NamedTuple, Optional, Set, Tuple
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+from . import metrics
+from .config import settings
+
+# Etiqueta de invalidación: (tabla, id)
+Tag = Tuple[str, Any]
+
+# Clave de `Session.info` con las invalidaciones pendientes de confirmar
+PENDING_KEY = "entity_cache_tags"
+# Clave de `Session.info` con una vida menor para las entradas leídas con la sesión
+CACHE_TTL_KEY = "entity_cache_ttl"
+# Clave de `Session.info` que indica leer de la base de datos aunque haya entrada en caché
+CACHE_REFRESH_KEY = "entity_cache_refresh"
+# Límite del payload de NOTIFY en PostgreSQL
+MAX_PAYLOAD = 7900
+
+def format_tags(tags: Iterable[Tag]) -> str:
+    """Serializa etiquetas para el payload de NOTIFY ("*" vacía toda la caché)"""
+    payload = ",".join(sorted(f"{table}:{id}" for table, id in tags))
+    return payload if len(payload) <= MAX_PAYLOAD else "*"
+
+def parse_tags(payload: str) -> Optional[Set[Tag]]:
+    """Interpreta un payload de NOTIFY. Retorna None si debe vaciarse la caché"""
+    if payload.strip() == "*":
+        return None
+    tags = set()
+    for item in filter(None, payload.split(",")):
+        table, _, id = item.partition(":")
+        tags.add((table, int(id) if id.isdigit() else id))
+    return tags
+
+class CachedEntity(NamedTuple):
+    """Entidad serializada junto con su versión (para los validadores HTTP)"""
+    value: Any
+    version: Any
+
+class EntityCache:
+    """
+    Caché LRU con expiración de entidades ya serializadas.
+
+    Cada entrada se asocia a etiquetas `(tabla, id)` de las filas de las que
+    depende su representación; invalidar una etiqueta elimina todas las
+    entradas que la contienen.
+    """
+    def __init__(self, maxsize: int = 10000, ttl: float = 60, name: str = "entity"):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._hit_counter = metrics.CACHE_LOOKUPS.labels(name, "hit")
+        self._miss_counter = metrics.CACHE_LOOKUPS.labels(name, "miss")
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any, Set[Tag]]]" = OrderedDict()
+        self._by_tag: Dict[Tag, Set[Hashable]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+
+    def _discard(self, key: Hashable) -> None:
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_tag[tag]
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Retorna el valor guardado para `key`, o None si no está o expiró"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    self._discard(key)
+                self.misses += 1
+                self._miss_counter.inc()
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self._hit_counter.inc()
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, tags: Iterable[Tag], ttl: Optional[float] = None) -> None:
+        """Guarda un valor asociado a las etiquetas de las que depende"""
+        if not self.enabled:
+            return
+        tags = set(tags)
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        with self._lock:
+            if key in self._entries:
+                self._discard(key)
+            self._entries[key] = (time.monotonic() + ttl, value, tags)
+            for tag in tags:
+                self._by_tag.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._discard(next(iter(self._entries)))
+
+    def invalidate(self, tags: Optional[Iterable[Tag]]) -> None:
+        """Elimina las entradas que dependen de alguna etiqueta (None vacía la caché)"""
+        if tags is None:
+            self.clear()
+            return
+        with self._lock:
+            for tag in tags:
+                for key in list(self._by_tag.get(tag, ())):
+                    self._discard(key)
+                    self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._by_tag.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+entity_cache = EntityCache(maxsize=settings.ENTITY_CACHE_SIZE, ttl=settings.ENTITY_CACHE_TTL)
+
+def session_ttl(db: Any) -> Optional[float]:
+    """Vida de las entradas cargadas con una sesión, si es menor que la de la caché"""
+    info = getattr(db, "info", None)
+    return info.get(CACHE_TTL_KEY) if isinstance(info, dict) else None
+
+def session_refresh(db: Any) -> bool:
+    """Indica si las lecturas con la sesión deben ignorar la caché y reemplazar sus entradas"""
+    info = getattr(db, "info", None)
+    return bool(info.get(CACHE_REFRESH_KEY)) if isinstance(info, dict) else False
+
+def schedule_invalidation(db: Any, tags: Iterable[Tag]) -> None:
+    """
+    Programa la invalidación de etiquetas para cuando se confirme la
+    transacción de la sesión (síncrona o asíncrona). En PostgreSQL se
+    notifica además a los demás workers mediante NOTIFY.
+    """
+    session = getattr(db, "sync_session", db)
+    if isinstance(session, Session):
+        session.info.setdefault(PENDING_KEY, set()).update(tags)
+
+@event.listens_for(Session, "before_commit")
+def _notify_invalidations(session: Session) -> None:
+    tags = session.info.get(PENDING_KEY)
+    if tags and session.get_bind().dialect.name == "postgresql":
+        # La notificación se entrega solo si la transacción se confirma
+        session.execute(select(func.pg_notify(settings.ENTITY_CACHE_CHANNEL, format_tags(tags))))
+
+@event.listens_for(Session, "after_commit")
+def _apply_invalidations(session: Session) -> None:
+    tags = session.info.pop(PENDING_KEY, None)
+    if tags:
+        entity_cache.invalidate(tags)
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_invalidations(session: Session, previous_transaction: Any) -> None:
+    session.info.pop(PENDING_KEY, None)
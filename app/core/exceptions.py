@@ -19,4 +19,13 @@ class AuthenticationError(HTTPException):
 class AuthorizationError(HTTPException):
     """Error para problemas de autorización"""
     def __init__(self, detail: Any = None):
-        super().__init__(status_code=403, detail=detail or "No autorizado")
\ No newline at end of file
+        super().__init__(status_code=403, detail=detail or "No autorizado")
+
+class ServiceUnavailableError(HTTPException):
+    """Error para servicios saturados o no disponibles temporalmente"""
+    def __init__(self, detail: Any = None, retry_after: int = 1):
+        super().__init__(
+            status_code=503,
+            detail=detail or "Servicio no disponible",
+            headers={"Retry-After": str(retry_after)}
+        )
@@ -0,0 +1,119 @@
+import os
+import time
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest,
+)
+from prometheus_client import multiprocess
+
+# Con varios workers de uvicorn cada proceso escribe sus métricas en archivos
+# de PROMETHEUS_MULTIPROC_DIR (que debe existir, vacío, antes de arrancar) y
+# /metrics agrega las de todos. Sin esa variable se usa el registro del proceso.
+
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Duración de las peticiones HTTP por plantilla de ruta",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Peticiones HTTP en curso",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKOUTS = Counter(
+    "db_pool_checkouts_total",
+    "Conexiones obtenidas del pool",
+    ["pool"],
+)
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts_total",
+    "Esperas por una conexión del pool que agotaron el timeout",
+    ["pool"],
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_wait_seconds",
+    "Espera por una conexión libre del pool",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+DB_POOL_IN_USE = Gauge(
+    "db_pool_connections_in_use",
+    "Conexiones del pool en uso",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+HASHING_QUEUE = Gauge(
+    "hashing_queue_depth",
+    "Hashes de bcrypt pendientes (en ejecución o en cola)",
+    multiprocess_mode="livesum",
+)
+HASHING_REJECTED = Counter(
+    "hashing_rejected_total",
+    "Hashes de bcrypt rechazados por tener la cola llena",
+)
+SLOW_QUERIES = Counter(
+    "db_slow_queries_total",
+    "Consultas que superaron el umbral de consultas lentas",
+)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total",
+    "Consultas a las cachés en memoria",
+    ["cache", "result"],
+)
+LOANS = Counter(
+    "library_loans_total",
+    "Préstamos y devoluciones de libros",
+    ["operation", "result"],
+)
+
+class PrometheusMiddleware:
+    """
+    Middleware ASGI que mide la duración de cada petición HTTP por método,
+    plantilla de ruta ("/api/v1/books/{book_id}", no la URL concreta, para
+    acotar la cardinalidad) y código de estado, y las peticiones en curso.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"]
+        in_flight = REQUESTS_IN_FLIGHT.labels(method)
+        in_flight.inc()
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_flight.dec()
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            REQUEST_LATENCY.labels(method, route, str(status)).observe(time.perf_counter() - start)
+
+def registry() -> CollectorRegistry:
+    """Registro a exponer: el agregado de todos los procesos o el del proceso"""
+    if not MULTIPROCESS:
+        return REGISTRY
+    aggregated = CollectorRegistry()
+    multiprocess.MultiProcessCollector(aggregated)
+    return aggregated
+
+def exposition() -> bytes:
+    """Métricas en el formato de texto de Prometheus"""
+    return generate_latest(registry())
+
+def mark_process_dead(pid: int) -> None:
+    """Descarta los gauges del proceso al terminar, en modo multiproceso"""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,135 @@
+import threading
+import time
+from typing import Any, Dict, Optional
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from app.core import metrics as prometheus
+
+class PoolMetrics:
+    """Métricas de uso de un pool de conexiones"""
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.in_use = 0
+        self.max_in_use = 0
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        # Series de Prometheus del pool, resueltas una sola vez
+        self._checkouts = prometheus.DB_POOL_CHECKOUTS.labels(name)
+        self._timeouts = prometheus.DB_POOL_TIMEOUTS.labels(name)
+        self._wait = prometheus.DB_POOL_WAIT.labels(name)
+        self._in_use = prometheus.DB_POOL_IN_USE.labels(name)
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.wait_count += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+        self._wait.observe(seconds)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+        self._timeouts.inc()
+
+    def record_checkout(self) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.max_in_use = max(self.max_in_use, self.in_use)
+        self._checkouts.inc()
+        self._in_use.inc()
+
+    def record_checkin(self) -> None:
+        with self._lock:
+            self.checkins += 1
+            self.in_use = max(self.in_use - 1, 0)
+        self._in_use.dec()
+
+    def record_connect(self) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def record_invalidation(self) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "in_use": self.in_use,
+                "max_in_use": self.max_in_use,
+                "wait_avg_ms": round(self.wait_total / self.wait_count * 1000, 3) if self.wait_count else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+            }
+
+class TimedCheckoutMixin:
+    """Mide cuánto espera cada checkout por una conexión libre del pool"""
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            if self.metrics:
+                self.metrics.record_timeout()
+            raise
+        finally:
+            if self.metrics:
+                self.metrics.record_wait(time.perf_counter() - start)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+class InstrumentedQueuePool(TimedCheckoutMixin, QueuePool):
+    pass
+
+class InstrumentedAsyncQueuePool(TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+# Métricas registradas por nombre de pool
+registry: Dict[str, PoolMetrics] = {}
+_engines: Dict[str, Engine] = {}
+
+def instrument_engine(engine: Engine, name: str) -> PoolMetrics:
+    """Registra los eventos del pool del motor y retorna sus métricas"""
+    metrics = PoolMetrics(name)
+    if isinstance(engine.pool, TimedCheckoutMixin):
+        engine.pool.metrics = metrics
+    event.listen(engine, "checkout", lambda *args: metrics.record_checkout())
+    event.listen(engine, "checkin", lambda *args: metrics.record_checkin())
+    event.listen(engine, "connect", lambda *args: metrics.record_connect())
+    event.listen(engine, "invalidate", lambda *args: metrics.record_invalidation())
+    registry[name] = metrics
+    _engines[name] = engine
+    return metrics
+
+def pool_status(name: str) -> Dict[str, Any]:
+    """Estado actual de un pool registrado, incluida su saturación"""
+    pool = _engines[name].pool
+    status: Dict[str, Any] = {"pool": name, **registry[name].snapshot()}
+    if isinstance(pool, QueuePool):
+        capacity = pool.size() + max(pool._max_overflow, 0)
+        status.update({
+            "size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "saturation": round(pool.checkedout() / capacity, 3) if capacity else 0.0,
+        })
+    return status
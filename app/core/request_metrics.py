@@ -0,0 +1,139 @@
+import json
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+
+logger = logging.getLogger(__name__)
+
+class RequestMetrics:
+    """Consultas SQL, tiempo en la base de datos y tiempo de serialización de una petición"""
+    __slots__ = ("scope", "start", "queries", "db_time", "serialize_time", "lazy_queries", "serializing")
+
+    def __init__(self, scope: Optional[Dict[str, Any]] = None):
+        self.scope = scope
+        self.start = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        # Consultas lanzadas mientras se serializaba: cargas perezosas
+        self.lazy_queries = 0
+        self.serializing = False
+
+    def record_query(self, seconds: float) -> None:
+        self.queries += 1
+        self.db_time += seconds
+        if self.serializing:
+            self.lazy_queries += 1
+
+    def route(self) -> Optional[str]:
+        """Método y plantilla de la ruta ("GET /api/v1/books/{book_id}"), una vez resuelta"""
+        if self.scope is None:
+            return None
+        route = getattr(self.scope.get("route"), "path", None)
+        return f"{self.scope['method']} {route or self.scope['path']}"
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+    def server_timing(self) -> str:
+        """Valor de la cabecera `Server-Timing`"""
+        return ", ".join((
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.queries} queries"',
+            f'serialize;dur={self.serialize_time * 1000:.2f}',
+            f'total;dur={self.elapsed() * 1000:.2f}',
+        ))
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "queries": self.queries,
+            "lazy_queries": self.lazy_queries,
+            "db_ms": round(self.db_time * 1000, 3),
+            "serialize_ms": round(self.serialize_time * 1000, 3),
+            "total_ms": round(self.elapsed() * 1000, 3),
+        }
+
+# Métricas de la petición en curso; los endpoints síncronos heredan el
+# contexto en el threadpool y las sesiones asíncronas en su greenlet
+current: ContextVar[Optional[RequestMetrics]] = ContextVar("request_metrics", default=None)
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and current.get() is not None:
+        context._request_metrics_start = time.perf_counter()
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    metrics = current.get()
+    start = getattr(context, "_request_metrics_start", None)
+    if metrics is not None and start is not None:
+        metrics.record_query(time.perf_counter() - start)
+
+@contextmanager
+def serializing() -> Iterator[None]:
+    """Mide un tramo de serialización de la respuesta de la petición en curso"""
+    metrics = current.get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    metrics.serializing = True
+    try:
+        yield
+    finally:
+        metrics.serializing = False
+        metrics.serialize_time += time.perf_counter() - start
+
+class RequestMetricsMiddleware:
+    """
+    Middleware ASGI que mide cada petición HTTP: agrega la cabecera
+    `Server-Timing`, registra una línea de log en JSON y avisa cuando la ruta
+    supera su presupuesto de consultas (`budgets` por "MÉTODO /ruta", o
+    `default_budget`; 0 lo desactiva).
+    """
+    def __init__(self, app, *, default_budget: int = 0, budgets: Optional[Dict[str, int]] = None):
+        self.app = app
+        self.default_budget = default_budget
+        self.budgets = budgets or {}
+
+    def budget_for(self, method: str, route: Optional[str]) -> int:
+        return self.budgets.get(f"{method} {route}", self.default_budget)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        metrics = RequestMetrics(scope)
+        token = current.set(metrics)
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message).append("Server-Timing", metrics.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current.reset(token)
+            self.report(scope, status, metrics)
+
+    def report(self, scope, status: int, metrics: RequestMetrics) -> None:
+        route = getattr(scope.get("route"), "path", None)
+        record = {
+            "method": scope["method"],
+            "path": scope["path"],
+            "route": route,
+            "status": status,
+            **metrics.summary(),
+        }
+        logger.info(json.dumps(record))
+        budget = self.budget_for(scope["method"], route)
+        if budget and metrics.queries > budget:
+            logger.warning(json.dumps({"event": "query_budget_exceeded", "budget": budget, **record}))
@@ -5,6 +5,7 @@ from passlib.context import CryptContext
 from fastapi import HTTPException, Security
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from .config import settings
+from .token_cache import TokenCache
 
 pwd_context = CryptContext(
     schemes=["bcrypt"],
@@ -12,6 +13,8 @@ pwd_context = CryptContext(
     bcrypt__rounds=12
 )
 security = HTTPBearer()
+token_cache = TokenCache(maxsize=settings.TOKEN_CACHE_SIZE, ttl=settings.TOKEN_CACHE_TTL)
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifica si la contraseña coincide con el hash"""
     return pwd_context.verify(plain_password, hashed_password)
@@ -32,12 +35,18 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 def decode_token(token: str) -> dict:
-    """Decodifica un token JWT"""
+    """Decodifica un token JWT, reutilizando la verificación si está en caché"""
+    cached = token_cache.get(token, settings.JWT_SECRET)
+    if cached is not None:
+        return cached
     try:
         decoded_token = jwt.decode(token, settings.JWT_SECRET, algorithms=["HS256"])
-        return decoded_token if decoded_token["exp"] >= datetime.utcnow().timestamp() else None
     except JWTError:
         return None
+    if decoded_token["exp"] < datetime.utcnow().timestamp():
+        return None
+    token_cache.set(token, settings.JWT_SECRET, decoded_token)
+    return decoded_token
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Security(security)) -> dict:
     token = credentials.credentials
@@ -47,4 +56,15 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Security(
     user_id = decoded_token.get("user_id")
     if user_id is None:
         raise HTTPException(status_code=401, detail="Token no contiene el user_id")
-    return {"user_id": user_id}
\ No newline at end of file
+    return {"user_id": user_id}
+
+async def get_current_admin(current_user: dict = Security(get_current_user)) -> dict:
+    """Exige que el usuario autenticado figure en ADMIN_USER_IDS"""
+    if current_user["user_id"] not in settings.ADMIN_USER_IDS:
+        raise HTTPException(status_code=403, detail="Se requieren permisos de administrador")
+    return current_user
+
+def ensure_self_or_admin(current_user: dict, user_id: int) -> None:
+    """Exige que el usuario autenticado sea `user_id` o figure en ADMIN_USER_IDS"""
+    if current_user["user_id"] != user_id and current_user["user_id"] not in settings.ADMIN_USER_IDS:
+        raise HTTPException(status_code=403, detail="No tiene permiso para consultar este usuario")
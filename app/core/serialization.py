@@ -0,0 +1,33 @@
+from functools import lru_cache
+from typing import Any, NamedTuple
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+@lru_cache(maxsize=None)
+def adapter(type_: Any) -> TypeAdapter:
+    """`TypeAdapter` de un esquema (o `List[...]`), construido una sola vez por tipo"""
+    return TypeAdapter(type_)
+
+def to_python(type_: Any, value: Any) -> Any:
+    """
+    Convierte filas ORM (o esquemas ya construidos) a tipos nativos de Python
+    con una única validación contra `type_`. Fechas y horas se dejan como
+    objetos; las serializa orjson.
+    """
+    type_adapter = adapter(type_)
+    return type_adapter.dump_python(type_adapter.validate_python(value, from_attributes=True))
+
+class Projection(NamedTuple):
+    """Contenido que se serializa con `type` en lugar del `response_model` de la ruta"""
+    type: Any
+    value: Any
+
+def dumps(content: Any) -> bytes:
+    """Serializa a JSON con orjson, con los datetime UTC terminados en `Z` como pydantic"""
+    return orjson.dumps(content, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+
+class ORJSONResponse(JSONResponse):
+    """Respuesta JSON serializada con orjson"""
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
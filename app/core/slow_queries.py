@@ -0,0 +1,150 @@
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from . import metrics, request_metrics
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# Prefijo del plan por dialecto: solo planifica, nunca ejecuta la sentencia
+EXPLAIN_PREFIX = {
+    "postgresql": "EXPLAIN (ANALYZE off) ",
+    "sqlite": "EXPLAIN QUERY PLAN ",
+}
+EXPLAINABLE = ("select", "with", "insert", "update", "delete")
+# Longitud máxima con la que se guarda cada parámetro
+MAX_PARAMETER_LENGTH = 200
+
+def format_parameters(parameters: Any) -> Any:
+    """Parámetros de la sentencia recortados, para guardarlos en el registro"""
+    def short(value: Any) -> Any:
+        if isinstance(value, (int, float, bool)) or value is None:
+            return value
+        text = str(value)
+        return text if len(text) <= MAX_PARAMETER_LENGTH else text[:MAX_PARAMETER_LENGTH] + "…"
+    if isinstance(parameters, dict):
+        return {key: short(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [short(value) for value in parameters]
+    return short(parameters)
+
+class SlowQueryLog:
+    """
+    Registro circular de las consultas que superan `threshold` segundos, con
+    su SQL, parámetros, ruta que las lanzó y plan de ejecución.
+
+    Obtener el plan cuesta una consulta más, por lo que se limita a
+    `explains_per_minute` planes por minuto y a uno por sentencia y minuto.
+    """
+    def __init__(self, threshold: float, size: int = 100, explains_per_minute: int = 6):
+        self.threshold = threshold
+        self.explains_per_minute = explains_per_minute
+        self._entries: Deque[Dict[str, Any]] = deque(maxlen=size)
+        self._explained: Dict[str, float] = {}
+        self._explain_times: Deque[float] = deque()
+        self._lock = threading.Lock()
+        self.total = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold > 0 and self._entries.maxlen > 0
+
+    def allow_explain(self, statement: str) -> bool:
+        """Consume un plan del límite por minuto si la sentencia no tiene uno reciente"""
+        now = time.monotonic()
+        with self._lock:
+            while self._explain_times and self._explain_times[0] <= now - 60:
+                self._explain_times.popleft()
+            if len(self._explain_times) >= self.explains_per_minute:
+                return False
+            if self._explained.get(statement, float("-inf")) > now - 60:
+                return False
+            if len(self._explained) >= 1000:
+                self._explained = {s: t for s, t in self._explained.items() if t > now - 60}
+            self._explained[statement] = now
+            self._explain_times.append(now)
+            return True
+
+    def record(self, conn, statement: str, parameters: Any, duration: float, executemany: bool = False) -> Dict[str, Any]:
+        current = request_metrics.current.get()
+        entry = {
+            "timestamp": datetime.utcnow().isoformat(timespec="milliseconds"),
+            "duration_ms": round(duration * 1000, 3),
+            "statement": statement,
+            "parameters": None if executemany else format_parameters(parameters),
+            "route": current.route() if current is not None else None,
+            "plan": None,
+        }
+        if not executemany and statement.lstrip().split(None, 1)[0].lower() in EXPLAINABLE \
+                and conn.dialect.name in EXPLAIN_PREFIX and self.allow_explain(statement):
+            try:
+                entry["plan"] = explain(conn, statement, parameters)
+            except Exception as exc:
+                entry["plan"] = f"Error al obtener el plan: {exc}"
+        with self._lock:
+            self._entries.append(entry)
+            self.total += 1
+        metrics.SLOW_QUERIES.inc()
+        logger.warning("Consulta lenta (%.1f ms) en %s: %s", entry["duration_ms"], entry["route"], statement)
+        return entry
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Consultas registradas, de la más reciente a la más antigua"""
+        with self._lock:
+            return list(reversed(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._explained.clear()
+
+def explain(conn, statement: str, parameters: Any) -> str:
+    """
+    Plan de la sentencia, obtenido con un cursor propio sobre la misma conexión
+    (sin pasar por los eventos del engine). En PostgreSQL se aísla en un
+    SAVEPOINT para que un error no aborte la transacción en curso.
+    """
+    dbapi_connection = conn.connection.dbapi_connection
+    savepoint = conn.dialect.name == "postgresql" and not getattr(dbapi_connection, "autocommit", False)
+    cursor = conn.connection.cursor()
+    try:
+        if savepoint:
+            cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            cursor.execute(EXPLAIN_PREFIX[conn.dialect.name] + statement, parameters)
+            rows = cursor.fetchall()
+        except Exception:
+            if savepoint:
+                cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            raise
+        if savepoint:
+            cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+    finally:
+        cursor.close()
+    # PostgreSQL retorna una línea por fila; SQLite, el detalle en la última columna
+    return "\n".join(str(row[-1]) for row in rows)
+
+slow_query_log = SlowQueryLog(
+    threshold=settings.SLOW_QUERY_MS / 1000,
+    size=settings.SLOW_QUERY_LOG_SIZE,
+    explains_per_minute=settings.SLOW_QUERY_EXPLAINS_PER_MINUTE,
+)
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and slow_query_log.enabled:
+        context._slow_query_start = time.perf_counter()
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_slow_query_start", None)
+    if start is None:
+        return
+    duration = time.perf_counter() - start
+    if duration >= slow_query_log.threshold:
+        slow_query_log.record(conn, statement, parameters, duration, executemany)
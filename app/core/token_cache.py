@@ -0,0 +1,81 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from . import metrics
+
+def _digest(value: str) -> str:
+    return hashlib.sha256(value.encode()).hexdigest()
+
+class TokenCache:
+    """
+    Caché LRU de los claims de tokens JWT ya verificados.
+
+    Las entradas se indexan por el hash del token (nunca el token en claro) y
+    expiran con el `exp` del token o al cumplirse `ttl`, lo que ocurra antes.
+    Si cambia el secreto con el que se firman los tokens la caché se vacía.
+    """
+    def __init__(self, maxsize: int = 10000, ttl: float = 300, name: str = "token"):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._hit_counter = metrics.CACHE_LOOKUPS.labels(name, "hit")
+        self._miss_counter = metrics.CACHE_LOOKUPS.labels(name, "miss")
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._secret_digest: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+
+    def _check_secret(self, secret: str) -> None:
+        digest = _digest(secret)
+        if digest != self._secret_digest:
+            self._entries.clear()
+            self._secret_digest = digest
+
+    def get(self, token: str, secret: str) -> Optional[Dict[str, Any]]:
+        """Retorna los claims de un token verificado previamente con `secret`"""
+        if self.maxsize <= 0:
+            return None
+        key = _digest(token)
+        with self._lock:
+            self._check_secret(secret)
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.time():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                self._miss_counter.inc()
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self._hit_counter.inc()
+            return dict(entry[1])
+
+    def set(self, token: str, secret: str, claims: Dict[str, Any]) -> None:
+        """Guarda los claims de un token recién verificado"""
+        if self.maxsize <= 0:
+            return
+        expires_at = min(float(claims["exp"]), time.time() + self.ttl)
+        key = _digest(token)
+        with self._lock:
+            self._check_secret(secret)
+            self._entries[key] = (expires_at, dict(claims))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
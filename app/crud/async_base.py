@@ -0,0 +1,175 @@
+from typing import Any, AsyncIterator, Dict, Generic, List, Optional, Sequence, Set, Tuple, Type, Union
+from pydantic import BaseModel
+from sqlalchemy import Row, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
+from sqlalchemy.sql import Select
+from app.core.entity_cache import CachedEntity, Tag, entity_cache, schedule_invalidation, session_refresh, session_ttl
+from app.schemas.fieldsets import FieldSet
+from .base import CreateSchemaType, ModelType, UpdateSchemaType, column_updates, list_version_statement, row_versions
+from .fieldsets import crud_fieldset, crud_fieldset_model, fieldset_rows, load_options
+from .listing import ListPage, async_fetch_by_ids, async_list_page
+from .pagination import cursor_for, keyset_filter, ordering_columns, split_page
+
+class AsyncCRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    """
+    Clase base para operaciones CRUD sobre una sesión asíncrona.
+
+    Con AsyncSession no hay cargas perezosas: todas las relaciones que
+    serializa la respuesta deben declararse en `response_options`.
+    """
+    cursor_orderings: Dict[str, Tuple[str, ...]] = {
+        "id": ("id",),
+        "created_at": ("created_at", "id"),
+    }
+    response_options: Tuple[Any, ...] = ()
+    export_columns: Tuple[str, ...] = ("id", "created_at", "updated_at")
+    list_version_models: Tuple[Any, ...] = ()
+    cache_schema: Optional[Type[BaseModel]] = None
+    fieldset_schema: Optional[Type[BaseModel]] = None
+    fieldset_relationships: Dict[str, Type[BaseModel]] = {}
+
+    def __init__(self, model: Type[ModelType]):
+        self.model = model
+
+    def cache_tags(self, obj: ModelType) -> Set[Tag]:
+        """Etiquetas de invalidación de un registro en la caché de entidades"""
+        return {(self.model.__tablename__, obj.id)}
+
+    async def get_cached(self, db: AsyncSession, id: Any) -> Optional[CachedEntity]:
+        """Obtiene un registro ya serializado, consultando la base de datos solo si no está en caché"""
+        key = (self.model.__tablename__, id)
+        cached = None if session_refresh(db) else entity_cache.get(key)
+        if cached is not None:
+            return cached
+        obj = await self.get(db, id=id)
+        if obj is None:
+            return None
+        cached = CachedEntity(self.cache_schema.model_validate(obj), self.version(obj))
+        entity_cache.set(key, cached, self.cache_tags(obj), ttl=session_ttl(db))
+        return cached
+
+    def version(self, obj: ModelType) -> Tuple[Any, ...]:
+        """Versión de la representación de un registro, para los validadores HTTP"""
+        return row_versions(obj)
+
+    async def get_list_version(self, db: AsyncSession) -> Row:
+        """Obtiene la versión de los listados del modelo"""
+        stmt = list_version_statement((self.model, *self.list_version_models))
+        return (await db.execute(stmt)).one()
+
+    def parse_fieldset(self, fields: Optional[str], include: Optional[str]) -> Optional[FieldSet]:
+        """Columnas y relaciones pedidas con `fields` e `include` (None: la representación completa)"""
+        return crud_fieldset(self, fields, include)
+
+    def fieldset_model(self, fieldset: FieldSet) -> Type[BaseModel]:
+        """Esquema de respuesta con solo las columnas y relaciones de `fieldset`"""
+        return crud_fieldset_model(self, fieldset)
+
+    def fieldset_version(self, obj: ModelType, fieldset: FieldSet) -> Tuple[Any, ...]:
+        """Versión de la representación parcial de un registro"""
+        return row_versions(*fieldset_rows(obj, fieldset))
+
+    def _response_select(self, *, strict: bool = False, fieldset: Optional[FieldSet] = None) -> Select:
+        """Consulta con las relaciones de la respuesta (o solo las de `fieldset`) cargadas de antemano"""
+        if fieldset is not None:
+            return select(self.model).options(*load_options(self, fieldset))
+        stmt = select(self.model).options(*self.response_options)
+        if strict:
+            stmt = stmt.options(raiseload("*"))
+        return stmt
+
+    async def get(self, db: AsyncSession, id: Any, *, fieldset: Optional[FieldSet] = None) -> Optional[ModelType]:
+        """Obtiene un registro por ID"""
+        stmt = self._response_select(fieldset=fieldset).where(self.model.id == id)
+        return (await db.execute(stmt)).scalars().first()
+
+    async def get_multi(
+        self, db: AsyncSession, *, skip: int = 0, limit: int = 100, fieldset: Optional[FieldSet] = None
+    ) -> List[ModelType]:
+        """Obtiene múltiples registros"""
+        stmt = self._response_select(strict=True, fieldset=fieldset).order_by(self.model.id).offset(skip).limit(limit)
+        return list((await db.execute(stmt)).scalars().all())
+
+    async def get_many(
+        self, db: AsyncSession, *, ids: Sequence[int], fieldset: Optional[FieldSet] = None
+    ) -> Tuple[List[ModelType], Tuple[int, ...]]:
+        """Obtiene varios registros por ID, en el orden pedido, y los IDs que no existen"""
+        return await async_fetch_by_ids(self, db, ids, fieldset=fieldset)
+
+    async def get_multi_by_cursor(
+        self,
+        db: AsyncSession,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        order_by: str = "id",
+        fieldset: Optional[FieldSet] = None
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """Obtiene múltiples registros paginando por cursor (keyset)"""
+        columns = ordering_columns(self.model, self.cursor_orderings, order_by)
+        stmt = keyset_filter(self._response_select(strict=True, fieldset=fieldset), columns, cursor, limit)
+        items = list((await db.execute(stmt)).scalars().all())
+        return split_page(items, columns, limit)
+
+    def next_cursor(self, obj: ModelType, *, order_by: str = "id") -> str:
+        """Genera el cursor de la página siguiente a partir del último registro"""
+        return cursor_for(obj, ordering_columns(self.model, self.cursor_orderings, order_by))
+
+    async def get_page(self, db: AsyncSession, *, count: Optional[str] = None, **params: Any) -> ListPage:
+        """Obtiene una página del listado y, con `count`, el total de registros"""
+        return await async_list_page(self, db, count=count, **params)
+
+    async def stream_rows(self, db: AsyncSession, *, batch_size: int = 1000) -> AsyncIterator[Row]:
+        """Recorre todos los registros con un cursor del lado del servidor"""
+        stmt = (
+            select(*(getattr(self.model, name) for name in self.export_columns))
+            .order_by(self.model.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await db.stream(stmt)
+        try:
+            async for row in result:
+                yield row
+        finally:
+            await result.close()
+
+    async def _reload(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
+        """Vuelve a leer un registro con sus relaciones tras confirmar cambios"""
+        stmt = self._response_select().where(self.model.id == id)
+        await db.execute(stmt.execution_options(populate_existing=True))
+        # Las relaciones cíclicas (libro -> autor -> libros) vuelven a poblar el
+        # registro sin sus relaciones; la segunda lectura solo carga las que faltan
+        return (await db.execute(stmt)).scalars().first()
+
+    async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
+        """Crea un nuevo registro"""
+        db_obj = self.model(**obj_in.model_dump())
+        db.add(db_obj)
+        schedule_invalidation(db, self.cache_tags(db_obj))
+        await db.commit()
+        return await self._reload(db, db_obj.id)
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> ModelType:
+        """Actualiza un registro"""
+        tags = self.cache_tags(db_obj)
+        for field, value in column_updates(self.model, obj_in).items():
+            setattr(db_obj, field, value)
+        db.add(db_obj)
+        schedule_invalidation(db, tags | self.cache_tags(db_obj))
+        await db.commit()
+        return await self._reload(db, db_obj.id)
+
+    async def remove(self, db: AsyncSession, *, id: int) -> Optional[ModelType]:
+        """Elimina un registro"""
+        obj = await self.get(db, id=id)
+        await db.delete(obj)
+        schedule_invalidation(db, self.cache_tags(obj))
+        await db.commit()
+        return obj
@@ -1,9 +1,111 @@
+from typing import Any, List, Optional, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, load_only, raiseload, selectinload
 from app.models.author import Author
-from app.schemas.author import AuthorCreate, AuthorUpdate
-from .base import CRUDBase
+from app.models.book import Book
+from app.schemas.author import Author as AuthorSchema, AuthorCreate, AuthorInDBBase, AuthorUpdate
+from app.schemas.book import BookInDBBase
+from .async_base import AsyncCRUDBase
+from .base import CRUDBase, row_versions
+from .fieldsets import schema_columns
+from .listing import ListPage, async_count_total, count_total
+from .pagination import keyset_filter, ordering_columns, split_page
+
+# Autores con el número de sus libros, en total y disponibles (sin prestatario).
+# Una sola consulta agregada, resuelta con el índice (author_id, borrowed_by_id)
+author_counts = (
+    select(
+        Author.id,
+        Author.name,
+        Author.birth_date,
+        func.count(Book.id).label("book_count"),
+        func.count(Book.id).filter(Book.borrowed_by_id.is_(None)).label("available_count"),
+    )
+    .outerjoin(Book, Book.author_id == Author.id)
+    .group_by(Author.id)
+    .subquery("author_counts")
+)
+
+# Ordenamientos del listado con conteos; con el prefijo "-" son descendentes
+count_orderings = {
+    "id": ("id",),
+    "book_count": ("book_count", "id"),
+    "available_count": ("available_count", "id"),
+}
+
+def counts_select(*, skip: int, limit: int, cursor: Optional[str], order_by: str) -> Tuple[Any, List[Any], bool]:
+    """Consulta de una página de autores con conteos, sus columnas de ordenamiento y si es descendente"""
+    descending = order_by.startswith("-")
+    columns = ordering_columns(author_counts.c, count_orderings, order_by[1:] if descending else order_by)
+    stmt = keyset_filter(select(author_counts), columns, cursor, limit, descending=descending)
+    if not cursor and skip:
+        stmt = stmt.offset(skip)
+    return stmt, columns, descending
 
 class CRUDAuthor(CRUDBase[Author, AuthorCreate, AuthorUpdate]):
     """Operaciones CRUD específicas para autores"""
-    pass
+    response_options = (
+        selectinload(Author.books).options(load_only(*schema_columns(Book, BookInDBBase)), raiseload("*")),
+    )
+    export_columns = ("id", "name", "birth_date", "created_at", "updated_at")
+    list_version_models = (Book,)
+    cache_schema = AuthorSchema
+    fieldset_schema = AuthorInDBBase
+    fieldset_relationships = {"books": BookInDBBase}
+
+    def version(self, obj: Author) -> Tuple[Any, ...]:
+        """Versión de un autor y de sus libros"""
+        return row_versions(obj, *obj.books)
+
+    def get_multi_with_counts(
+        self,
+        db: Session,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        order_by: str = "id",
+        count: Optional[str] = None
+    ) -> ListPage:
+        """
+        Obtiene una página de autores con `book_count` y `available_count`,
+        calculados con una consulta agregada en lugar de cargar sus libros.
+        Admite paginar por cursor también al ordenar por conteo
+        (`book_count`, `-book_count`, `available_count`, `-available_count`).
+        Con `count` calcula además el total de autores, como `get_page`.
+        """
+        stmt, columns, descending = counts_select(skip=skip, limit=limit, cursor=cursor, order_by=order_by)
+        items, next_cursor = split_page(list(db.execute(stmt).all()), columns, limit, descending=descending)
+        total, estimated = count_total(db, Author, count) if count is not None else (None, False)
+        return ListPage(items, next_cursor, total, estimated)
+
+author = CRUDAuthor(Author)
+
+class AsyncCRUDAuthor(AsyncCRUDBase[Author, AuthorCreate, AuthorUpdate]):
+    """Operaciones CRUD asíncronas específicas para autores"""
+    response_options = CRUDAuthor.response_options
+    export_columns = CRUDAuthor.export_columns
+    list_version_models = CRUDAuthor.list_version_models
+    version = CRUDAuthor.version
+    cache_schema = CRUDAuthor.cache_schema
+    fieldset_schema = CRUDAuthor.fieldset_schema
+    fieldset_relationships = CRUDAuthor.fieldset_relationships
+
+    async def get_multi_with_counts(
+        self,
+        db: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        order_by: str = "id",
+        count: Optional[str] = None
+    ) -> ListPage:
+        """Versión asíncrona de `CRUDAuthor.get_multi_with_counts`"""
+        stmt, columns, descending = counts_select(skip=skip, limit=limit, cursor=cursor, order_by=order_by)
+        items, next_cursor = split_page(list((await db.execute(stmt)).all()), columns, limit, descending=descending)
+        total, estimated = await async_count_total(db, Author, count) if count is not None else (None, False)
+        return ListPage(items, next_cursor, total, estimated)
 
-author = CRUDAuthor(Author)
\ No newline at end of file
+async_author = AsyncCRUDAuthor(Author)
\ No newline at end of file
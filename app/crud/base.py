@@ -1,46 +1,204 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
-from fastapi.encoders import jsonable_encoder
+from typing import Any, Dict, Generic, Iterator, List, Optional, Sequence, Set, Tuple, Type, TypeVar, Union
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, func, select
+from sqlalchemy.sql import Select
+from sqlalchemy.orm import Query, Session, raiseload
+from app.core.entity_cache import CachedEntity, Tag, entity_cache, schedule_invalidation, session_refresh, session_ttl
 from app.models.base import Base
+from app.schemas.fieldsets import FieldSet
+from .fieldsets import crud_fieldset, crud_fieldset_model, fieldset_rows, load_options
+from .listing import ListPage, fetch_by_ids, list_page
+from .pagination import cursor_for, keyset_paginate, ordering_columns
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+def list_version_statement(models: Sequence[Any]) -> Select:
+    """
+    Consulta de la versión de un listado: `max(updated_at)` y `count(*)` de
+    cada tabla cuyas filas aparecen en él. Cualquier alta, baja o
+    modificación cambia el resultado.
+    """
+    columns = []
+    for model in models:
+        columns.append(select(func.max(model.updated_at)).scalar_subquery())
+        columns.append(select(func.count()).select_from(model).scalar_subquery())
+    return select(*columns)
+
+def row_versions(*objs: Any) -> Tuple[Any, ...]:
+    """
+    Versión de una representación: tabla, id y `updated_at` de cada fila que
+    incluye. Cambia si alguna fila se modifica, se agrega o se quita.
+    """
+    rows = {(obj.__tablename__, obj.id, obj.updated_at) for obj in objs if obj is not None}
+    return tuple(sorted(rows, key=repr))
+
+def column_updates(model: Any, obj_in: Union[BaseModel, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Valores de una actualización que corresponden a columnas de la tabla. Se
+    ignoran relaciones y propiedades: el registro puede traerlas ya cargadas.
+    """
+    update_data = obj_in if isinstance(obj_in, dict) else obj_in.model_dump(exclude_unset=True)
+    columns = model.__table__.columns.keys()
+    return {field: value for field, value in update_data.items() if field in columns}
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """Clase base para operaciones CRUD"""
+    # Ordenamientos permitidos para la paginación por cursor (columna única al final)
+    cursor_orderings: Dict[str, Tuple[str, ...]] = {
+        "id": ("id",),
+        "created_at": ("created_at", "id"),
+    }
+    # Estrategias de carga de las relaciones que serializa el esquema de respuesta
+    response_options: Tuple[Any, ...] = ()
+    # Columnas incluidas en las exportaciones completas del catálogo
+    export_columns: Tuple[str, ...] = ("id", "created_at", "updated_at")
+    # Modelos cuyas filas aparecen anidadas en los listados
+    list_version_models: Tuple[Any, ...] = ()
+    # Esquema con el que se guardan los registros en la caché de entidades
+    cache_schema: Optional[Type[BaseModel]] = None
+    # Esquema por columnas y esquemas de las relaciones que admiten `fields` e `include`
+    fieldset_schema: Optional[Type[BaseModel]] = None
+    fieldset_relationships: Dict[str, Type[BaseModel]] = {}
+
     def __init__(self, model: Type[ModelType]):
         self.model = model
 
-    def get(self, db: Session, id: Any) -> Optional[ModelType]:
+    def cache_tags(self, obj: ModelType) -> Set[Tag]:
+        """
+        Etiquetas de invalidación de un registro. Se usan tanto para asociar
+        su entrada en caché como para invalidar al modificarlo, por lo que deben
+        incluir las filas cuyas representaciones lo anidan.
+        """
+        return {(self.model.__tablename__, obj.id)}
+
+    def get_cached(self, db: Session, id: Any) -> Optional[CachedEntity]:
+        """
+        Obtiene un registro ya serializado, leyendo de la caché de entidades y
+        consultando la base de datos solo si no está en ella.
+        """
+        key = (self.model.__tablename__, id)
+        cached = None if session_refresh(db) else entity_cache.get(key)
+        if cached is not None:
+            return cached
+        obj = self.get(db, id=id)
+        if obj is None:
+            return None
+        cached = CachedEntity(self.cache_schema.model_validate(obj), self.version(obj))
+        entity_cache.set(key, cached, self.cache_tags(obj), ttl=session_ttl(db))
+        return cached
+
+    def version(self, obj: ModelType) -> Tuple[Any, ...]:
+        """Versión de la representación de un registro, para los validadores HTTP"""
+        return row_versions(obj)
+
+    def get_list_version(self, db: Session) -> Row:
+        """Obtiene la versión de los listados del modelo"""
+        return db.execute(list_version_statement((self.model, *self.list_version_models))).one()
+
+    def parse_fieldset(self, fields: Optional[str], include: Optional[str]) -> Optional[FieldSet]:
+        """Columnas y relaciones pedidas con `fields` e `include` (None: la representación completa)"""
+        return crud_fieldset(self, fields, include)
+
+    def fieldset_model(self, fieldset: FieldSet) -> Type[BaseModel]:
+        """Esquema de respuesta con solo las columnas y relaciones de `fieldset`"""
+        return crud_fieldset_model(self, fieldset)
+
+    def fieldset_version(self, obj: ModelType, fieldset: FieldSet) -> Tuple[Any, ...]:
+        """Versión de la representación parcial de un registro"""
+        return row_versions(*fieldset_rows(obj, fieldset))
+
+    def _response_query(self, db: Session, *, strict: bool = False, fieldset: Optional[FieldSet] = None) -> Query:
+        """
+        Consulta con las relaciones que necesita el esquema de respuesta cargadas
+        en un número fijo de consultas. Con `strict`, cualquier otra relación
+        lanza un error en lugar de cargarse de forma perezosa (N+1). Con
+        `fieldset`, solo se leen las columnas y relaciones pedidas.
+        """
+        if fieldset is not None:
+            return db.query(self.model).options(*load_options(self, fieldset))
+        query = db.query(self.model).options(*self.response_options)
+        if strict:
+            query = query.options(raiseload("*"))
+        return query
+
+    def get(self, db: Session, id: Any, *, fieldset: Optional[FieldSet] = None) -> Optional[ModelType]:
         """Obtiene un registro por ID"""
-        return db.query(self.model).filter(self.model.id == id).first()
+        return self._response_query(db, fieldset=fieldset).filter(self.model.id == id).first()
 
-    def get_multi(self, db: Session, *, skip: int = 0, limit: int = 100) -> List[ModelType]:
+    def get_multi(
+        self, db: Session, *, skip: int = 0, limit: int = 100, fieldset: Optional[FieldSet] = None
+    ) -> List[ModelType]:
         """Obtiene múltiples registros"""
-        return db.query(self.model).offset(skip).limit(limit).all()
+        query = self._response_query(db, strict=True, fieldset=fieldset)
+        return query.order_by(self.model.id).offset(skip).limit(limit).all()
+
+    def get_many(
+        self, db: Session, *, ids: Sequence[int], fieldset: Optional[FieldSet] = None
+    ) -> Tuple[List[ModelType], Tuple[int, ...]]:
+        """Obtiene varios registros por ID, en el orden pedido, y los IDs que no existen"""
+        return fetch_by_ids(self, db, ids, fieldset=fieldset)
+
+    def get_multi_by_cursor(
+        self,
+        db: Session,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        order_by: str = "id",
+        fieldset: Optional[FieldSet] = None
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """Obtiene múltiples registros paginando por cursor (keyset)"""
+        columns = ordering_columns(self.model, self.cursor_orderings, order_by)
+        query = self._response_query(db, strict=True, fieldset=fieldset)
+        return keyset_paginate(query, columns, cursor=cursor, limit=limit)
+
+    def next_cursor(self, obj: ModelType, *, order_by: str = "id") -> str:
+        """Genera el cursor de la página siguiente a partir del último registro"""
+        return cursor_for(obj, ordering_columns(self.model, self.cursor_orderings, order_by))
+
+    def get_page(self, db: Session, *, count: Optional[str] = None, **params: Any) -> ListPage:
+        """
+        Obtiene una página del listado (por cursor o por OFFSET, según
+        `params`) y, con `count`, el total de registros
+        """
+        return list_page(self, db, count=count, **params)
+
+    def stream_rows(self, db: Session, *, batch_size: int = 1000) -> Iterator[Row]:
+        """
+        Recorre todos los registros con un cursor del lado del servidor.
+        Se leen columnas en lugar de entidades, de modo que las filas no pasan
+        por el mapa de identidad y la memoria usada no depende del tamaño de
+        la tabla.
+        """
+        stmt = (
+            select(*(getattr(self.model, name) for name in self.export_columns))
+            .order_by(self.model.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = db.execute(stmt)
+        try:
+            yield from result
+        finally:
+            result.close()
 
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
         """Crea un nuevo registro"""
-        obj_in_data = jsonable_encoder(obj_in)
-        db_obj = self.model(**obj_in_data)
+        db_obj = self.model(**obj_in.model_dump())
         db.add(db_obj)
+        schedule_invalidation(db, self.cache_tags(db_obj))
         db.commit()
         db.refresh(db_obj)
         return db_obj
 
     def update(self, db: Session, *, db_obj: ModelType, obj_in: Union[UpdateSchemaType, Dict[str, Any]]) -> ModelType:
         """Actualiza un registro"""
-        obj_data = jsonable_encoder(db_obj)
-        if isinstance(obj_in, dict):
-            update_data = obj_in
-        else:
-            update_data = obj_in.dict(exclude_unset=True)
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
+        tags = self.cache_tags(db_obj)
+        for field, value in column_updates(self.model, obj_in).items():
+            setattr(db_obj, field, value)
         db.add(db_obj)
+        schedule_invalidation(db, tags | self.cache_tags(db_obj))
         db.commit()
         db.refresh(db_obj)
         return db_obj
@@ -49,5 +207,6 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """Elimina un registro"""
         obj = db.query(self.model).get(id)
         db.delete(obj)
+        schedule_invalidation(db, self.cache_tags(obj))
         db.commit()
         return obj
\ No newline at end of file
@@ -1,47 +1,251 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from typing import Any, List, Optional, Set, Tuple
+from sqlalchemy import cast, desc, func, literal_column, or_, update
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, load_only, raiseload, selectinload
+from app.models.author import Author
 from app.models.book import Book
-from app.schemas.book import BookCreate, BookUpdate
-from .base import CRUDBase
+from app.models.user import User
+from app.core import metrics
+from app.core.entity_cache import Tag, schedule_invalidation
+from app.schemas.author import AuthorInDBBase
+from app.schemas.book import Book as BookSchema, BookCreate, BookInDBBase, BookUpdate
+from app.schemas.user import UserInDBBase
+from app.utils import search
+from .async_base import AsyncCRUDBase
+from .base import CRUDBase, row_versions
+from .fieldsets import schema_columns
+from .loan import loan_insert
+
+# Configuración de búsqueda de texto (español + unaccent), creada por la migración
+SEARCH_CONFIG = "spanish_unaccent"
+
+# Contadores de préstamos y devoluciones por resultado
+LOAN_COUNTERS = {
+    (operation, result): metrics.LOANS.labels(operation, result)
+    for operation in ("borrow", "return") for result in ("ok", "rejected")
+}
+
+def rank_by_relevance(query, title: str):
+    """
+    Filtra y ordena una consulta (`Query` o `select`) de libros por rango de
+    texto completo y por similitud de trigramas (solo PostgreSQL).
+    """
+    search_vector = literal_column("books.search_vector")
+    ts_query = func.websearch_to_tsquery(cast(SEARCH_CONFIG, REGCONFIG), title)
+    normalized_title = func.immutable_unaccent(func.lower(Book.title))
+    normalized_query = func.immutable_unaccent(func.lower(title))
+    return query.filter(
+        or_(
+            search_vector.op("@@")(ts_query),
+            normalized_title.op("%")(normalized_query)
+        )
+    ).order_by(
+        desc(func.ts_rank_cd(search_vector, ts_query)),
+        desc(func.similarity(normalized_title, normalized_query)),
+        Book.id
+    )
 
 class CRUDBook(CRUDBase[Book, BookCreate, BookUpdate]):
     """Operaciones CRUD específicas para libros"""
+    cursor_orderings = {
+        **CRUDBase.cursor_orderings,
+        "title": ("title", "id"),
+    }
+    # El autor y el prestatario anidan sus libros: de cada nivel se leen solo
+    # las columnas que serializa el esquema y nada más allá de esos libros
+    response_options = (
+        selectinload(Book.author).options(
+            load_only(*schema_columns(Author, AuthorInDBBase)),
+            selectinload(Author.books).options(load_only(*schema_columns(Book, BookInDBBase)), raiseload("*")),
+        ),
+        selectinload(Book.borrowed_by).options(
+            load_only(*schema_columns(User, UserInDBBase)),
+            selectinload(User.borrowed_books).options(load_only(*schema_columns(Book, BookInDBBase)), raiseload("*")),
+        ),
+    )
+    export_columns = (
+        "id", "title", "publication_year", "author_id", "borrowed_by_id",
+        "created_at", "updated_at",
+    )
+    list_version_models = (Author, User)
+    cache_schema = BookSchema
+    fieldset_schema = BookInDBBase
+    fieldset_relationships = {"author": AuthorInDBBase, "borrowed_by": UserInDBBase}
+
+    def cache_tags(self, obj: Book) -> Set[Tag]:
+        """
+        Un libro se anida en su autor y en su prestatario, y con ellos en los
+        demás libros de ambos.
+        """
+        tags = {("books", obj.id), ("authors", obj.author_id)}
+        if obj.borrowed_by_id is not None:
+            tags.add(("users", obj.borrowed_by_id))
+        return tags
+
+    def version(self, obj: Book) -> Tuple[Any, ...]:
+        """Versión de un libro, su autor, su prestatario y los libros anidados en ambos"""
+        rows = [obj, obj.author, *obj.author.books]
+        if obj.borrowed_by is not None:
+            rows += [obj.borrowed_by, *obj.borrowed_by.borrowed_books]
+        return row_versions(*rows)
+
     def search_books(
         self, 
         db: Session, 
         *, 
         title: Optional[str] = None,
         author_id: Optional[int] = None,
-        publication_year: Optional[int] = None
+        publication_year: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 100
     ) -> List[Book]:
-        """Busca libros por título, autor o año de publicación"""
-        query = db.query(self.model)
-        if title:
-            query = query.filter(Book.title.ilike(f"%{title}%"))
+        """
+        Busca libros por título, autor o año de publicación.
+
+        La búsqueda por título se ordena por relevancia. En PostgreSQL usa la
+        columna `search_vector` (índice GIN) y trigramas para tolerar errores
+        tipográficos; en otros motores se resuelve en memoria.
+        """
+        query = self._response_query(db, strict=True)
         if author_id:
             query = query.filter(Book.author_id == author_id)
         if publication_year:
             query = query.filter(Book.publication_year == publication_year)
-        return query.all()
-
-    def borrow_book(self, db: Session, *, book_id: int, user_id: int) -> Book:
-        """Registra el préstamo de un libro"""
-        book = self.get(db, id=book_id)
-        if book and not book.borrowed_by_id:
-            book.borrowed_by_id = user_id
-            db.add(book)
-            db.commit()
-            db.refresh(book)
-        return book
-
-    def return_book(self, db: Session, *, book_id: int) -> Book:
-        """Registra la devolución de un libro"""
-        book = self.get(db, id=book_id)
-        if book and book.borrowed_by_id:
-            book.borrowed_by_id = None
-            db.add(book)
-            db.commit()
-            db.refresh(book)
-        return book
+        if not title:
+            return query.order_by(Book.id).offset(skip).limit(limit).all()
+        if db.get_bind().dialect.name == "postgresql":
+            return rank_by_relevance(query, title).offset(skip).limit(limit).all()
+        ranked = search.rank(query.order_by(Book.id).all(), title, key=lambda b: b.title)
+        return ranked[skip:skip + limit]
+
+    def borrow_book(self, db: Session, *, book_id: int, user_id: int) -> Optional[Book]:
+        """
+        Registra el préstamo de un libro con un único UPDATE condicional, de modo
+        que dos préstamos simultáneos no puedan tener éxito a la vez, y lo anota
+        en el historial (`loans`) en la misma transacción.
+        Retorna None si el libro no existe o ya está prestado.
+        """
+        stmt = (
+            update(Book)
+            .where(Book.id == book_id, Book.borrowed_by_id.is_(None))
+            .values(borrowed_by_id=user_id)
+            .returning(Book.author_id)
+            .execution_options(synchronize_session=False)
+        )
+        author_id = db.execute(stmt).scalar_one_or_none()
+        if author_id is None:
+            db.rollback()
+            LOAN_COUNTERS["borrow", "rejected"].inc()
+            return None
+        schedule_invalidation(db, {("books", book_id), ("authors", author_id), ("users", user_id)})
+        db.execute(loan_insert(book_id=book_id, user_id=user_id, action="borrow"))
+        db.commit()
+        LOAN_COUNTERS["borrow", "ok"].inc()
+        return self.get(db, id=book_id)
+
+    def return_book(self, db: Session, *, book_id: int, user_id: int) -> Optional[Book]:
+        """
+        Registra la devolución de un libro prestado al usuario con un único
+        UPDATE condicional, anotada en el historial en la misma transacción.
+        Retorna None si el libro no existe, no está prestado o está prestado a
+        otro usuario.
+        """
+        stmt = (
+            update(Book)
+            .where(Book.id == book_id, Book.borrowed_by_id == user_id)
+            .values(borrowed_by_id=None)
+            .returning(Book.author_id)
+            .execution_options(synchronize_session=False)
+        )
+        author_id = db.execute(stmt).scalar_one_or_none()
+        if author_id is None:
+            db.rollback()
+            LOAN_COUNTERS["return", "rejected"].inc()
+            return None
+        schedule_invalidation(db, {("books", book_id), ("authors", author_id), ("users", user_id)})
+        db.execute(loan_insert(book_id=book_id, user_id=user_id, action="return"))
+        db.commit()
+        LOAN_COUNTERS["return", "ok"].inc()
+        return self.get(db, id=book_id)
     
-book = CRUDBook(Book)
\ No newline at end of file
+book = CRUDBook(Book)
+
+class AsyncCRUDBook(AsyncCRUDBase[Book, BookCreate, BookUpdate]):
+    """Operaciones CRUD asíncronas específicas para libros"""
+    cursor_orderings = CRUDBook.cursor_orderings
+    response_options = CRUDBook.response_options
+    export_columns = CRUDBook.export_columns
+    list_version_models = CRUDBook.list_version_models
+    version = CRUDBook.version
+    cache_schema = CRUDBook.cache_schema
+    cache_tags = CRUDBook.cache_tags
+    fieldset_schema = CRUDBook.fieldset_schema
+    fieldset_relationships = CRUDBook.fieldset_relationships
+
+    async def search_books(
+        self,
+        db: AsyncSession,
+        *,
+        title: Optional[str] = None,
+        author_id: Optional[int] = None,
+        publication_year: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[Book]:
+        """Busca libros por título, autor o año de publicación"""
+        stmt = self._response_select(strict=True)
+        if author_id:
+            stmt = stmt.filter(Book.author_id == author_id)
+        if publication_year:
+            stmt = stmt.filter(Book.publication_year == publication_year)
+        if not title:
+            stmt = stmt.order_by(Book.id).offset(skip).limit(limit)
+        elif db.bind.dialect.name == "postgresql":
+            stmt = rank_by_relevance(stmt, title).offset(skip).limit(limit)
+        else:
+            candidates = (await db.execute(stmt.order_by(Book.id))).scalars().all()
+            return search.rank(candidates, title, key=lambda b: b.title)[skip:skip + limit]
+        return list((await db.execute(stmt)).scalars().all())
+
+    async def borrow_book(self, db: AsyncSession, *, book_id: int, user_id: int) -> Optional[Book]:
+        """Registra el préstamo de un libro con un único UPDATE condicional"""
+        stmt = (
+            update(Book)
+            .where(Book.id == book_id, Book.borrowed_by_id.is_(None))
+            .values(borrowed_by_id=user_id)
+            .returning(Book.author_id)
+            .execution_options(synchronize_session=False)
+        )
+        author_id = (await db.execute(stmt)).scalar_one_or_none()
+        if author_id is None:
+            await db.rollback()
+            LOAN_COUNTERS["borrow", "rejected"].inc()
+            return None
+        schedule_invalidation(db, {("books", book_id), ("authors", author_id), ("users", user_id)})
+        await db.execute(loan_insert(book_id=book_id, user_id=user_id, action="borrow"))
+        await db.commit()
+        LOAN_COUNTERS["borrow", "ok"].inc()
+        return await self._reload(db, book_id)
+
+    async def return_book(self, db: AsyncSession, *, book_id: int, user_id: int) -> Optional[Book]:
+        """Registra la devolución de un libro con un único UPDATE condicional"""
+        stmt = (
+            update(Book)
+            .where(Book.id == book_id, Book.borrowed_by_id == user_id)
+            .values(borrowed_by_id=None)
+            .returning(Book.author_id)
+            .execution_options(synchronize_session=False)
+        )
+        author_id = (await db.execute(stmt)).scalar_one_or_none()
+        if author_id is None:
+            await db.rollback()
+            LOAN_COUNTERS["return", "rejected"].inc()
+            return None
+        schedule_invalidation(db, {("books", book_id), ("authors", author_id), ("users", user_id)})
+        await db.execute(loan_insert(book_id=book_id, user_id=user_id, action="return"))
+        await db.commit()
+        LOAN_COUNTERS["return", "ok"].inc()
+        return await self._reload(db, book_id)
+
+async_book = AsyncCRUDBook(Book)
\ No newline at end of file
@@ -0,0 +1,57 @@
+from typing import Any, Optional, Tuple, Type
+from pydantic import BaseModel
+from sqlalchemy.orm import load_only, raiseload, selectinload
+from app.schemas.fieldsets import FieldSet, parse_fieldset, sparse_model
+
+# Columnas que se leen siempre: las usan los validadores HTTP (`updated_at`)
+ALWAYS_LOADED = ("id", "updated_at")
+
+def _columns(mapper: Any, names: Any) -> Tuple[Any, ...]:
+    return tuple(getattr(mapper.class_, name) for name in sorted(set(names)) if name in mapper.columns)
+
+def schema_columns(model: Any, schema: Type[BaseModel]) -> Tuple[Any, ...]:
+    """Columnas de `model` que serializa `schema`, más `ALWAYS_LOADED`"""
+    return _columns(model.__mapper__, (*schema.model_fields, *ALWAYS_LOADED))
+
+def load_options(crud: Any, fieldset: FieldSet) -> Tuple[Any, ...]:
+    """
+    Opciones de carga de un `fieldset`: solo las columnas pedidas (más las del
+    orden de paginación, las claves de las relaciones incluidas y `ALWAYS_LOADED`)
+    y solo las relaciones incluidas, también por columnas. Cualquier otra
+    relación lanza un error en lugar de cargarse.
+    """
+    mapper = crud.model.__mapper__
+    names = {*fieldset.fields, *ALWAYS_LOADED}
+    for ordering in crud.cursor_orderings.values():
+        names.update(ordering)
+    options = []
+    for name in fieldset.include:
+        relationship = mapper.relationships[name]
+        names.update(column.key for column in relationship.local_columns)
+        options.append(
+            selectinload(getattr(crud.model, name)).load_only(
+                *schema_columns(relationship.mapper.class_, crud.fieldset_relationships[name])
+            )
+        )
+    return (load_only(*_columns(mapper, names)), *options, raiseload("*"))
+
+def crud_fieldset(crud: Any, fields: Optional[str], include: Optional[str]) -> Optional[FieldSet]:
+    """`parse_fieldset` con las columnas y relaciones que admite el CRUD"""
+    return parse_fieldset(fields, include, crud.fieldset_schema, tuple(crud.fieldset_relationships))
+
+def crud_fieldset_model(crud: Any, fieldset: FieldSet) -> Type[BaseModel]:
+    """Esquema de respuesta de un `fieldset` del CRUD"""
+    relationships = crud.model.__mapper__.relationships
+    specs = tuple(
+        (name, schema, relationships[name].uselist)
+        for name, schema in crud.fieldset_relationships.items()
+    )
+    return sparse_model(crud.fieldset_schema, fieldset, specs)
+
+def fieldset_rows(obj: Any, fieldset: FieldSet) -> Tuple[Any, ...]:
+    """El registro y los de sus relaciones incluidas, para calcular su versión"""
+    rows = [obj]
+    for name in fieldset.include:
+        value = getattr(obj, name)
+        rows.extend(value if isinstance(value, list) else [value])
+    return tuple(rows)
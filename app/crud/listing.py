@@ -0,0 +1,211 @@
+from typing import Any, List, NamedTuple, Optional, Sequence, Tuple
+from sqlalchemy import Integer, any_, bindparam, func, select, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from app.core.config import settings
+from app.schemas.fieldsets import FieldSet
+
+# Modos de cálculo del total de un listado
+COUNT_MODES = ("auto", "exact", "estimated")
+
+# Filas estimadas por el planificador, actualizadas por VACUUM/ANALYZE. Es -1
+# si la tabla nunca se ha analizado.
+ESTIMATE_STATEMENT = text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)")
+
+# Mayor ID admitido: el de una columna INTEGER de PostgreSQL
+MAX_ID = 2 ** 31 - 1
+
+class InvalidIdsError(ValueError):
+    """Lista de IDs (`ids=1,2,3`) mal formada o demasiado larga"""
+
+class ListPage(NamedTuple):
+    """Página de un listado con el cursor de la siguiente y, si se pidió, el total"""
+    items: List[Any]
+    next: Optional[str] = None
+    total: Optional[int] = None
+    estimated: bool = False
+    # IDs pedidos con `ids` que no existen
+    missing: Tuple[int, ...] = ()
+
+def parse_ids(value: str) -> List[int]:
+    """
+    Interpreta una lista de IDs separados por comas, sin repetidos y en el
+    orden pedido, de a lo sumo MULTI_GET_MAX_IDS elementos
+    """
+    ids: List[int] = []
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        # isdigit() también acepta dígitos no ASCII: int() rechaza "²" y convierte "١"
+        if not (item.isascii() and item.isdigit()):
+            raise InvalidIdsError(f"ID inválido: {item!r}")
+        if int(item) > MAX_ID:
+            raise InvalidIdsError(f"ID fuera de rango: {item}")
+        ids.append(int(item))
+    ids = list(dict.fromkeys(ids))
+    if not ids:
+        raise InvalidIdsError("La lista de IDs está vacía")
+    if len(ids) > settings.MULTI_GET_MAX_IDS:
+        raise InvalidIdsError(f"Se permiten a lo sumo {settings.MULTI_GET_MAX_IDS} IDs por petición")
+    return ids
+
+def ids_filter(model: Any, ids: Sequence[int], dialect: str) -> Any:
+    """
+    Filtro por una lista de IDs. En PostgreSQL es `id = ANY(:ids)` con un único
+    parámetro de tipo array, de modo que la sentencia (y su plan preparado) es
+    la misma sea cual sea el número de IDs.
+    """
+    if dialect == "postgresql":
+        return model.id == any_(bindparam("ids", list(ids), type_=ARRAY(Integer)))
+    return model.id.in_(ids)
+
+def in_request_order(objs: Sequence[Any], ids: Sequence[int]) -> Tuple[List[Any], Tuple[int, ...]]:
+    """Ordena los registros según los IDs pedidos y retorna también los que faltan"""
+    by_id = {obj.id: obj for obj in objs}
+    return [by_id[id] for id in ids if id in by_id], tuple(id for id in ids if id not in by_id)
+
+def fetch_by_ids(crud: Any, db: Any, ids: Sequence[int], *, fieldset: Optional[FieldSet] = None) -> Tuple[List[Any], Tuple[int, ...]]:
+    """Obtiene varios registros por ID con una sola consulta"""
+    query = crud._response_query(db, strict=True, fieldset=fieldset)
+    objs = query.filter(ids_filter(crud.model, ids, db.get_bind().dialect.name)).all()
+    return in_request_order(objs, ids)
+
+async def async_fetch_by_ids(crud: Any, db: Any, ids: Sequence[int], *, fieldset: Optional[FieldSet] = None) -> Tuple[List[Any], Tuple[int, ...]]:
+    """Versión asíncrona de `fetch_by_ids`"""
+    stmt = crud._response_select(strict=True, fieldset=fieldset).where(ids_filter(crud.model, ids, db.bind.dialect.name))
+    objs = (await db.execute(stmt)).scalars().all()
+    return in_request_order(objs, ids)
+
+def use_estimate(count: str, estimate: Optional[int]) -> bool:
+    """
+    Decide si el total puede tomarse de la estimación de PostgreSQL: siempre
+    que se pide `estimated` y la haya, y en modo `auto` solo para tablas
+    grandes, donde contar todas las filas es caro.
+    """
+    if estimate is None or count == "exact":
+        return False
+    return count == "estimated" or estimate >= settings.COUNT_ESTIMATE_THRESHOLD
+
+def count_statement(model: Any):
+    return select(func.count()).select_from(model)
+
+def with_window_count(query: Any) -> Any:
+    """Agrega a la consulta el total de filas que cumplen el filtro, antes de OFFSET/LIMIT"""
+    return query.add_columns(func.count().over().label("total"))
+
+def split_counted(rows: List[Any]) -> Tuple[List[Any], Optional[int]]:
+    """Separa los registros del total de la función de ventana (None si no hay filas)"""
+    return [row[0] for row in rows], (rows[0][1] if rows else None)
+
+def estimated_count(db: Any, model: Any) -> Optional[int]:
+    """Total estimado de filas de la tabla, o None fuera de PostgreSQL o sin estadísticas"""
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+    estimate = db.execute(ESTIMATE_STATEMENT, {"table": model.__tablename__}).scalar()
+    return estimate if estimate is not None and estimate >= 0 else None
+
+def count_total(db: Any, model: Any, count: str) -> Tuple[int, bool]:
+    """Total de filas de la tabla según `count` y si es una estimación"""
+    estimate = estimated_count(db, model)
+    if use_estimate(count, estimate):
+        return estimate, True
+    return db.execute(count_statement(model)).scalar_one(), False
+
+def list_page(
+    crud: Any,
+    db: Any,
+    *,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    order_by: str = "id",
+    count: Optional[str] = None,
+    ids: Optional[Sequence[int]] = None,
+    fieldset: Optional[FieldSet] = None
+) -> ListPage:
+    """
+    Obtiene una página de un listado paginando por cursor o por OFFSET, o los
+    registros de `ids` en el orden pedido (el total es entonces los encontrados).
+    Con `fieldset` solo se leen las columnas y relaciones pedidas.
+
+    Con `count` se calcula también el total de registros: estimado o exacto
+    según `use_estimate`. El exacto se obtiene con una función de ventana en
+    la misma consulta de la página; con cursor (o si la página queda vacía)
+    se cuenta aparte, porque el filtro del cursor no forma parte del total.
+    """
+    if ids is not None:
+        items, missing = fetch_by_ids(crud, db, ids, fieldset=fieldset)
+        return ListPage(items, total=len(items) if count is not None else None, missing=missing)
+    # `fieldset` solo se pasa si se pidió una representación parcial
+    projection = {"fieldset": fieldset} if fieldset is not None else {}
+    total, estimated = None, False
+    if count is not None:
+        estimate = estimated_count(db, crud.model)
+        if use_estimate(count, estimate):
+            total, estimated = estimate, True
+    if cursor or order_by != "id":
+        items, next_cursor = crud.get_multi_by_cursor(
+            db, cursor=cursor, limit=limit, order_by=order_by, **projection
+        )
+    else:
+        if count is not None and total is None:
+            query = crud._response_query(db, strict=True, fieldset=fieldset).order_by(crud.model.id)
+            items, total = split_counted(with_window_count(query).offset(skip).limit(limit).all())
+        else:
+            items = crud.get_multi(db, skip=skip, limit=limit, **projection)
+        next_cursor = crud.next_cursor(items[-1]) if items and len(items) == limit else None
+    if count is not None and total is None:
+        total = db.execute(count_statement(crud.model)).scalar_one()
+    return ListPage(items, next_cursor, total, estimated)
+
+async def async_estimated_count(db: Any, model: Any) -> Optional[int]:
+    """Versión asíncrona de `estimated_count`"""
+    if db.bind.dialect.name != "postgresql":
+        return None
+    estimate = (await db.execute(ESTIMATE_STATEMENT, {"table": model.__tablename__})).scalar()
+    return estimate if estimate is not None and estimate >= 0 else None
+
+async def async_count_total(db: Any, model: Any, count: str) -> Tuple[int, bool]:
+    """Versión asíncrona de `count_total`"""
+    estimate = await async_estimated_count(db, model)
+    if use_estimate(count, estimate):
+        return estimate, True
+    return (await db.execute(count_statement(model))).scalar_one(), False
+
+async def async_list_page(
+    crud: Any,
+    db: Any,
+    *,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    order_by: str = "id",
+    count: Optional[str] = None,
+    ids: Optional[Sequence[int]] = None,
+    fieldset: Optional[FieldSet] = None
+) -> ListPage:
+    """Versión asíncrona de `list_page`"""
+    if ids is not None:
+        items, missing = await async_fetch_by_ids(crud, db, ids, fieldset=fieldset)
+        return ListPage(items, total=len(items) if count is not None else None, missing=missing)
+    projection = {"fieldset": fieldset} if fieldset is not None else {}
+    total, estimated = None, False
+    if count is not None:
+        estimate = await async_estimated_count(db, crud.model)
+        if use_estimate(count, estimate):
+            total, estimated = estimate, True
+    if cursor or order_by != "id":
+        items, next_cursor = await crud.get_multi_by_cursor(
+            db, cursor=cursor, limit=limit, order_by=order_by, **projection
+        )
+    else:
+        if count is not None and total is None:
+            stmt = crud._response_select(strict=True, fieldset=fieldset).order_by(crud.model.id)
+            rows = (await db.execute(with_window_count(stmt).offset(skip).limit(limit))).all()
+            items, total = split_counted(rows)
+        else:
+            items = await crud.get_multi(db, skip=skip, limit=limit, **projection)
+        next_cursor = crud.next_cursor(items[-1]) if items and len(items) == limit else None
+    if count is not None and total is None:
+        total = (await db.execute(count_statement(crud.model))).scalar_one()
+    return ListPage(items, next_cursor, total, estimated)
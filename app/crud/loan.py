@@ -0,0 +1,87 @@
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.models.loan import Loan
+from .pagination import keyset_filter, split_page
+
+def loan_insert(*, book_id: int, user_id: int, action: str) -> Any:
+    """INSERT de un préstamo o devolución, para ejecutarlo en la transacción que lo registra"""
+    return insert(Loan).values(book_id=book_id, user_id=user_id, action=action, occurred_at=datetime.utcnow())
+
+class CRUDLoan:
+    """
+    Consultas del historial de préstamos. La tabla es de solo inserción: los
+    registros se escriben junto con el préstamo o la devolución (`loan_insert`).
+    """
+    model = Loan
+    # Del más reciente al más antiguo; `id` desempata los del mismo instante
+    history_columns = (Loan.occurred_at, Loan.id)
+
+    def _history_select(
+        self,
+        *,
+        user_id: Optional[int],
+        book_id: Optional[int],
+        cursor: Optional[str],
+        limit: int,
+        since: Optional[datetime],
+        until: Optional[datetime]
+    ) -> Any:
+        """
+        Página del historial por cursor, descendente por (`occurred_at`, `id`).
+        `since` y `until` acotan `occurred_at` y, en PostgreSQL, las particiones
+        que se recorren.
+        """
+        stmt = select(Loan)
+        if user_id is not None:
+            stmt = stmt.where(Loan.user_id == user_id)
+        if book_id is not None:
+            stmt = stmt.where(Loan.book_id == book_id)
+        if since is not None:
+            stmt = stmt.where(Loan.occurred_at >= since)
+        if until is not None:
+            stmt = stmt.where(Loan.occurred_at < until)
+        return keyset_filter(stmt, self.history_columns, cursor, limit, descending=True)
+
+    def get_history(
+        self,
+        db: Session,
+        *,
+        user_id: Optional[int] = None,
+        book_id: Optional[int] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> Tuple[List[Loan], Optional[str]]:
+        """Historial de un usuario o de un libro y el cursor de la página siguiente"""
+        stmt = self._history_select(
+            user_id=user_id, book_id=book_id, cursor=cursor, limit=limit, since=since, until=until
+        )
+        return split_page(list(db.execute(stmt).scalars().all()), self.history_columns, limit, descending=True)
+
+loan = CRUDLoan()
+
+class AsyncCRUDLoan(CRUDLoan):
+    """Consultas asíncronas del historial de préstamos"""
+
+    async def get_history(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: Optional[int] = None,
+        book_id: Optional[int] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> Tuple[List[Loan], Optional[str]]:
+        """Versión asíncrona de `CRUDLoan.get_history`"""
+        stmt = self._history_select(
+            user_id=user_id, book_id=book_id, cursor=cursor, limit=limit, since=since, until=until
+        )
+        return split_page(list((await db.execute(stmt)).scalars().all()), self.history_columns, limit, descending=True)
+
+async_loan = AsyncCRUDLoan()
@@ -0,0 +1,117 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+class InvalidCursorError(ValueError):
+    """Error para cursores de paginación inválidos"""
+    pass
+
+def ordering_columns(model: Any, orderings: Dict[str, Tuple[str, ...]], order_by: str) -> List[Any]:
+    """Obtiene las columnas del modelo para un criterio de ordenamiento"""
+    if order_by not in orderings:
+        raise InvalidCursorError(
+            f"Ordenamiento no soportado: {order_by}. Opciones: {', '.join(orderings)}"
+        )
+    return [getattr(model, name) for name in orderings[order_by]]
+
+def ordering_key(columns: Sequence[Any], descending: bool = False) -> List[str]:
+    """Nombres de las columnas de ordenamiento, con "-" si el orden es descendente"""
+    prefix = "-" if descending else ""
+    return [prefix + column.key for column in columns]
+
+def encode_cursor(values: Sequence[Any], ordering: Sequence[str]) -> str:
+    """
+    Codifica los valores de la última fila en un cursor opaco, junto con el
+    ordenamiento para el que son válidos.
+    """
+    payload = {
+        "o": list(ordering),
+        "v": [value.isoformat() if isinstance(value, datetime) else value for value in values],
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str, columns: Sequence[Any], *, descending: bool = False) -> List[Any]:
+    """
+    Decodifica un cursor opaco en los valores de las columnas de ordenamiento.
+    Un cursor generado con otro ordenamiento se rechaza: sus valores no son
+    comparables con las columnas actuales.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except (ValueError, TypeError):
+        raise InvalidCursorError("Cursor inválido")
+    if not isinstance(payload, dict) or not isinstance(payload.get("v"), list):
+        raise InvalidCursorError("Cursor inválido")
+    if payload.get("o") != ordering_key(columns, descending):
+        raise InvalidCursorError("El cursor no corresponde al ordenamiento solicitado")
+    values = payload["v"]
+    if len(values) != len(columns):
+        raise InvalidCursorError("Cursor inválido")
+    decoded = []
+    for column, value in zip(columns, values):
+        if value is not None and column.type.python_type is datetime:
+            try:
+                value = datetime.fromisoformat(value)
+            except (ValueError, TypeError):
+                raise InvalidCursorError("Cursor inválido")
+        decoded.append(value)
+    return decoded
+
+def cursor_for(obj: Any, columns: Sequence[Any], *, descending: bool = False) -> str:
+    """Genera el cursor que apunta a continuación del objeto dado"""
+    return encode_cursor([getattr(obj, column.key) for column in columns], ordering_key(columns, descending))
+
+def keyset_filter(
+    query: Any,
+    columns: Sequence[Any],
+    cursor: Optional[str],
+    limit: int,
+    *,
+    descending: bool = False
+) -> Any:
+    """
+    Aplica a una consulta (`Query` o `select`) el filtro, el orden y el límite
+    de la paginación por cursor. Se pide un registro extra para saber si hay
+    una página siguiente.
+    """
+    if cursor:
+        values = decode_cursor(cursor, columns, descending=descending)
+        left = columns[0] if len(columns) == 1 else tuple_(*columns)
+        right = values[0] if len(columns) == 1 else tuple_(*values)
+        query = query.filter(left < right if descending else left > right)
+    if descending:
+        return query.order_by(*(column.desc() for column in columns)).limit(limit + 1)
+    return query.order_by(*columns).limit(limit + 1)
+
+def split_page(
+    items: List[Any],
+    columns: Sequence[Any],
+    limit: int,
+    *,
+    descending: bool = False
+) -> Tuple[List[Any], Optional[str]]:
+    """Separa el registro extra y genera el cursor de la página siguiente"""
+    if len(items) <= limit:
+        return items, None
+    items = items[:limit]
+    return items, cursor_for(items[-1], columns, descending=descending)
+
+def keyset_paginate(
+    query: Query,
+    columns: Sequence[Any],
+    *,
+    cursor: Optional[str] = None,
+    limit: int = 100
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Pagina una consulta buscando a partir del último valor visto (keyset)
+    en lugar de usar OFFSET. Retorna los registros y el cursor de la
+    siguiente página, o None si no hay más registros.
+    """
+    items = keyset_filter(query, columns, cursor, limit).all()
+    return split_page(items, columns, limit)
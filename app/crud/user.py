@@ -1,43 +1,116 @@
-from typing import Optional, List
-from sqlalchemy.orm import Session
+from typing import Any, Optional, List, Sequence, Tuple, Type
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query, Session, load_only, raiseload, selectinload
+from sqlalchemy.sql import Select
+from app.core.entity_cache import schedule_invalidation
+from app.models.book import Book
 from app.models.user import User
-from app.schemas.user import UserCreate, UserUpdate
-from app.core.security import get_password_hash
+from app.schemas.book import BookInDBBase
+from app.schemas.fieldsets import FieldSet
+from app.schemas.user import UserCreate, UserInDBBase, UserUpdate
+from app.services import jobs
+from app.services.hashing_service import hashing
 from datetime import datetime
+from .base import column_updates
+from .fieldsets import crud_fieldset, crud_fieldset_model, load_options, schema_columns
+from .listing import ListPage, async_fetch_by_ids, async_list_page, fetch_by_ids, list_page
+from .pagination import cursor_for, keyset_filter, keyset_paginate, ordering_columns, split_page
 
 class CRUDUser:
+    model = User
+    cursor_orderings = {
+        "id": ("id",),
+        "created_at": ("created_at", "id"),
+    }
+    # Estrategias de carga de las relaciones que serializa el esquema de respuesta
+    response_options = (
+        selectinload(User.borrowed_books).options(load_only(*schema_columns(Book, BookInDBBase)), raiseload("*")),
+    )
+    # Columnas y relaciones que admiten `fields` e `include`
+    fieldset_schema = UserInDBBase
+    fieldset_relationships = {"borrowed_books": BookInDBBase}
+
+    def parse_fieldset(self, fields: Optional[str], include: Optional[str]) -> Optional[FieldSet]:
+        return crud_fieldset(self, fields, include)
+
+    def fieldset_model(self, fieldset: FieldSet) -> Type[BaseModel]:
+        return crud_fieldset_model(self, fieldset)
+
+    def _response_query(self, db: Session, *, strict: bool = False, fieldset: Optional[FieldSet] = None) -> Query:
+        if fieldset is not None:
+            return db.query(User).options(*load_options(self, fieldset))
+        query = db.query(User).options(*self.response_options)
+        if strict:
+            query = query.options(raiseload("*"))
+        return query
+
     def get_by_email(self, db: Session, *, email: str) -> Optional[User]:
         return db.query(User).filter(User.email == email).first()
 
-    def get(self, db: Session, *, id: int) -> Optional[User]:
-        return db.query(User).filter(User.id == id).first()
+    def get(self, db: Session, *, id: int, fieldset: Optional[FieldSet] = None) -> Optional[User]:
+        return self._response_query(db, fieldset=fieldset).filter(User.id == id).first()
     
-    def get_multi(self, db: Session, *, skip: int = 0, limit: int = 100) -> List[User]:
-        return db.query(User).offset(skip).limit(limit).all()
+    def get_multi(
+        self, db: Session, *, skip: int = 0, limit: int = 100, fieldset: Optional[FieldSet] = None
+    ) -> List[User]:
+        query = self._response_query(db, strict=True, fieldset=fieldset)
+        return query.order_by(User.id).offset(skip).limit(limit).all()
+
+    def get_many(
+        self, db: Session, *, ids: Sequence[int], fieldset: Optional[FieldSet] = None
+    ) -> Tuple[List[User], Tuple[int, ...]]:
+        return fetch_by_ids(self, db, ids, fieldset=fieldset)
+
+    def get_multi_by_cursor(
+        self,
+        db: Session,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        order_by: str = "id",
+        fieldset: Optional[FieldSet] = None
+    ) -> Tuple[List[User], Optional[str]]:
+        columns = ordering_columns(User, self.cursor_orderings, order_by)
+        query = self._response_query(db, strict=True, fieldset=fieldset)
+        return keyset_paginate(query, columns, cursor=cursor, limit=limit)
+
+    def next_cursor(self, obj: User, *, order_by: str = "id") -> str:
+        return cursor_for(obj, ordering_columns(User, self.cursor_orderings, order_by))
+
+    def get_page(self, db: Session, *, count: Optional[str] = None, **params: Any) -> ListPage:
+        return list_page(self, db, count=count, **params)
 
-    def create(self, db: Session, *, obj_in: UserCreate) -> User:
+    def create(self, db: Session, *, obj_in: UserCreate, welcome_email: bool = False) -> User:
+        """
+        Crea el usuario. Con `welcome_email` encola el email de bienvenida en la
+        misma transacción: se envía solo si el usuario llega a crearse.
+        """
         db_obj = User(
             email=obj_in.email,
-            hashed_password=get_password_hash(obj_in.password),
+            hashed_password=hashing.hash_password(obj_in.password),
             name=obj_in.name,
             registration_date=datetime.utcnow()
         )
         db.add(db_obj)
+        if welcome_email:
+            jobs.enqueue(db, "welcome_email", {"email": obj_in.email})
         db.commit()
         db.refresh(db_obj)
         return db_obj
 
     def update(self, db: Session, *, db_obj: User, obj_in: UserUpdate) -> User:
-        update_data = obj_in.dict(exclude_unset=True)
+        update_data = obj_in.model_dump(exclude_unset=True)
         if update_data.get("password"):
-            hashed_password = get_password_hash(update_data["password"])
+            hashed_password = hashing.hash_password(update_data["password"])
             del update_data["password"]
             update_data["hashed_password"] = hashed_password
-        
-        for field, value in update_data.items():
+        for field, value in column_updates(User, update_data).items():
             setattr(db_obj, field, value)
-            
         db.add(db_obj)
+        # El usuario se anida en la respuesta de los libros que tiene prestados
+        schedule_invalidation(db, {("users", db_obj.id)})
         db.commit()
         db.refresh(db_obj)
         return db_obj
@@ -45,7 +118,99 @@ class CRUDUser:
     def remove(self, db: Session, *, id: int) -> User:
         obj = db.query(User).get(id)
         db.delete(obj)
+        schedule_invalidation(db, {("users", id)})
         db.commit()
         return obj
 
-user = CRUDUser()
\ No newline at end of file
+user = CRUDUser()
+
+class AsyncCRUDUser:
+    model = User
+    cursor_orderings = CRUDUser.cursor_orderings
+    response_options = CRUDUser.response_options
+    fieldset_schema = CRUDUser.fieldset_schema
+    fieldset_relationships = CRUDUser.fieldset_relationships
+    parse_fieldset = CRUDUser.parse_fieldset
+    fieldset_model = CRUDUser.fieldset_model
+
+    def _response_select(self, *, strict: bool = False, fieldset: Optional[FieldSet] = None) -> Select:
+        if fieldset is not None:
+            return select(User).options(*load_options(self, fieldset))
+        stmt = select(User).options(*self.response_options)
+        if strict:
+            stmt = stmt.options(raiseload("*"))
+        return stmt
+
+    async def _reload(self, db: AsyncSession, id: int) -> Optional[User]:
+        stmt = self._response_select().where(User.id == id).execution_options(populate_existing=True)
+        return (await db.execute(stmt)).scalars().first()
+
+    async def get_by_email(self, db: AsyncSession, *, email: str) -> Optional[User]:
+        return (await db.execute(select(User).where(User.email == email))).scalars().first()
+
+    async def get(self, db: AsyncSession, *, id: int, fieldset: Optional[FieldSet] = None) -> Optional[User]:
+        stmt = self._response_select(fieldset=fieldset).where(User.id == id)
+        return (await db.execute(stmt)).scalars().first()
+
+    async def get_multi(
+        self, db: AsyncSession, *, skip: int = 0, limit: int = 100, fieldset: Optional[FieldSet] = None
+    ) -> List[User]:
+        stmt = self._response_select(strict=True, fieldset=fieldset).order_by(User.id).offset(skip).limit(limit)
+        return list((await db.execute(stmt)).scalars().all())
+
+    async def get_many(
+        self, db: AsyncSession, *, ids: Sequence[int], fieldset: Optional[FieldSet] = None
+    ) -> Tuple[List[User], Tuple[int, ...]]:
+        return await async_fetch_by_ids(self, db, ids, fieldset=fieldset)
+
+    async def get_multi_by_cursor(
+        self,
+        db: AsyncSession,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        order_by: str = "id",
+        fieldset: Optional[FieldSet] = None
+    ) -> Tuple[List[User], Optional[str]]:
+        columns = ordering_columns(User, self.cursor_orderings, order_by)
+        stmt = keyset_filter(self._response_select(strict=True, fieldset=fieldset), columns, cursor, limit)
+        return split_page(list((await db.execute(stmt)).scalars().all()), columns, limit)
+
+    def next_cursor(self, obj: User, *, order_by: str = "id") -> str:
+        return cursor_for(obj, ordering_columns(User, self.cursor_orderings, order_by))
+
+    async def get_page(self, db: AsyncSession, *, count: Optional[str] = None, **params: Any) -> ListPage:
+        return await async_list_page(self, db, count=count, **params)
+
+    async def create(self, db: AsyncSession, *, obj_in: UserCreate, welcome_email: bool = False) -> User:
+        db_obj = User(
+            email=obj_in.email,
+            hashed_password=await hashing.hash_password_async(obj_in.password),
+            name=obj_in.name,
+            registration_date=datetime.utcnow()
+        )
+        db.add(db_obj)
+        if welcome_email:
+            jobs.enqueue(db, "welcome_email", {"email": obj_in.email})
+        await db.commit()
+        return await self._reload(db, db_obj.id)
+
+    async def update(self, db: AsyncSession, *, db_obj: User, obj_in: UserUpdate) -> User:
+        update_data = obj_in.model_dump(exclude_unset=True)
+        if update_data.get("password"):
+            update_data["hashed_password"] = await hashing.hash_password_async(update_data.pop("password"))
+        for field, value in column_updates(User, update_data).items():
+            setattr(db_obj, field, value)
+
+        schedule_invalidation(db, {("users", db_obj.id)})
+        await db.commit()
+        return await self._reload(db, db_obj.id)
+
+    async def remove(self, db: AsyncSession, *, id: int) -> Optional[User]:
+        obj = await self.get(db, id=id)
+        await db.delete(obj)
+        schedule_invalidation(db, {("users", id)})
+        await db.commit()
+        return obj
+
+async_user = AsyncCRUDUser()
\ No newline at end of file
@@ -1,35 +1,139 @@
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+"""
+Aplicación FastAPI de la biblioteca digital.
+
+La aplicación se construye con `create_app()`; importar este módulo no crea
+la aplicación, no importa los endpoints ni abre conexiones:
+
+    uvicorn app.main:create_app --factory
+
+`app.main:app` sigue disponible y crea la aplicación al primer acceso.
+"""
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional
+from fastapi import FastAPI, Request
 from app.core.config import settings
-from app.api.v1.router import api_router
-
-app = FastAPI(
-    title=settings.PROJECT_NAME,
-    version=settings.VERSION,
-    description="API para gestión de biblioteca digital",
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
-)
-
-# Configuración CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Incluir los routers de la API
-app.include_router(api_router, prefix=settings.API_V1_STR)
-
-@app.get("/")
-def root():
+from app.core.database import database
+
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     """
-    Endpoint raíz que proporciona información básica de la API.
+    Crea los motores de base de datos al iniciar y los cierra al terminar,
+    junto con los servicios que dependen de ellos.
     """
-    return {
-        "message": "Bienvenido a la API de Biblioteca Digital",
-        "version": settings.VERSION,
-        "docs_url": "/docs",
-        "redoc_url": "/redoc"
-    }
\ No newline at end of file
+    from app.core import metrics
+    from app.core.entity_cache import entity_cache
+    from app.services.cache_listener import CacheInvalidationListener
+    from app.services.hashing_service import hashing
+    from app.services.loan_partitions import ensure_partitions
+
+    database.start()
+    # Particiones mensuales del historial de préstamos que falten
+    try:
+        ensure_partitions(database.engine)
+    except Exception:
+        logger.exception("No se pudieron crear las particiones de loans")
+    # Invalidación de la caché de entidades entre workers (LISTEN/NOTIFY)
+    cache_listener = None
+    if entity_cache.enabled and database.engine.dialect.driver == "psycopg2":
+        cache_listener = CacheInvalidationListener(database.engine, entity_cache, settings.ENTITY_CACHE_CHANNEL)
+        cache_listener.start()
+    app.state.cache_listener = cache_listener
+    try:
+        yield
+    finally:
+        if cache_listener is not None:
+            cache_listener.stop()
+        # Detiene los procesos dedicados a bcrypt
+        hashing.shutdown()
+        # Descarta los gauges de este worker en el directorio multiproceso
+        metrics.mark_process_dead(os.getpid())
+        await database.dispose()
+
+def create_app() -> FastAPI:
+    """Construye la aplicación: middlewares, routers y ciclo de vida"""
+    from fastapi.middleware.cors import CORSMiddleware
+    from app.api.dependencies import get_replica_router
+    from app.api.v1.endpoints import health
+    from app.api.v1.router import create_api_router
+    from app.core import metrics
+    from app.core.db_routing import SAFE_METHODS
+    from app.core.request_metrics import RequestMetricsMiddleware
+    from app.core.serialization import ORJSONResponse
+
+    app = FastAPI(
+        title=settings.PROJECT_NAME,
+        version=settings.VERSION,
+        description="API para gestión de biblioteca digital",
+        openapi_url=f"{settings.API_V1_STR}/openapi.json",
+        default_response_class=ORJSONResponse,
+        lifespan=lifespan
+    )
+
+    # Configuración CORS
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "X-Missing-Ids", "ETag", "Last-Modified", "Server-Timing"],
+    )
+
+    # Consultas, tiempo en la base de datos y serialización de cada petición
+    if settings.REQUEST_METRICS:
+        app.add_middleware(
+            RequestMetricsMiddleware,
+            default_budget=settings.QUERY_BUDGET,
+            budgets=settings.QUERY_BUDGETS,
+        )
+
+    # Latencia por ruta y peticiones en curso para Prometheus
+    if settings.PROMETHEUS_METRICS:
+        app.add_middleware(metrics.PrometheusMiddleware)
+
+    if settings.REPLICA_URLS:
+        replica_router = get_replica_router()
+
+        @app.middleware("http")
+        async def read_your_writes(request: Request, call_next):
+            """Tras una escritura, el usuario lee del primario durante unos segundos"""
+            response = await call_next(request)
+            if request.method not in SAFE_METHODS and response.status_code < 400:
+                replica_router.mark_write(request, response)
+            return response
+
+    # Incluir los routers de la API
+    app.include_router(create_api_router(), prefix=settings.API_V1_STR)
+    app.include_router(health.router, prefix="/health", tags=["health"])
+    if settings.PROMETHEUS_METRICS:
+        from app.api.v1.endpoints import metrics as metrics_endpoint
+        app.include_router(metrics_endpoint.router, tags=["metrics"])
+
+    @app.get("/")
+    def root():
+        """
+        Endpoint raíz que proporciona información básica de la API.
+        """
+        return {
+            "message": "Bienvenido a la API de Biblioteca Digital",
+            "version": settings.VERSION,
+            "docs_url": "/docs",
+            "redoc_url": "/redoc"
+        }
+
+    return app
+
+_app: Optional[FastAPI] = None
+
+def __getattr__(name: str) -> Any:
+    """`app.main.app`: la aplicación por defecto, creada al primer acceso"""
+    global _app
+    if name == "app":
+        if _app is None:
+            _app = create_app()
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,5 +2,7 @@ from app.models.base import Base
 from app.models.user import User
 from app.models.author import Author
 from app.models.book import Book
+from app.models.loan import Loan
+from app.models.job import Job
 
-__all__ = ["Base", "User", "Author", "Book"]
\ No newline at end of file
+__all__ = ["Base", "User", "Author", "Book", "Loan", "Job"]
\ No newline at end of file
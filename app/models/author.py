@@ -1,10 +1,14 @@
-from sqlalchemy import Column, String, DateTime
+from sqlalchemy import Column, String, DateTime, Index
 from sqlalchemy.orm import relationship
 from .base import BaseModel
 
 class Author(BaseModel):
     """Modelo de Autor"""
     __tablename__ = "authors"
+    __table_args__ = (
+        Index("ix_authors_created_at_id", "created_at", "id"),
+        Index("ix_authors_updated_at", "updated_at"),
+    )
 
     name = Column(String, nullable=False)
     birth_date = Column(DateTime, nullable=True)
@@ -1,10 +1,19 @@
-from sqlalchemy import Column, String, Integer, ForeignKey
+from sqlalchemy import Column, String, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from .base import BaseModel
 
 class Book(BaseModel):
     """Modelo de Libro"""
     __tablename__ = "books"
+    __table_args__ = (
+        # Índices compuestos para la paginación por cursor
+        Index("ix_books_title_id", "title", "id"),
+        Index("ix_books_created_at_id", "created_at", "id"),
+        # Versión de los listados para las peticiones condicionales
+        Index("ix_books_updated_at", "updated_at"),
+        # Libros de un autor y conteos por autor (disponibles: sin prestatario)
+        Index("ix_books_author_id_borrowed_by_id", "author_id", "borrowed_by_id"),
+    )
 
     title = Column(String, nullable=False, index=True)
     publication_year = Column(Integer, nullable=True)
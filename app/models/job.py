@@ -0,0 +1,32 @@
+from datetime import datetime
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, String, Text, text
+from sqlalchemy.dialects.postgresql import JSONB
+from .base import BaseModel
+
+class Job(BaseModel):
+    """
+    Trabajo en segundo plano (emails y notificaciones). Se encola en la misma
+    transacción que lo origina y lo procesa `python -m app.cli worker`.
+    """
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # Trabajos por tomar o en curso por orden de ejecución; los terminados
+        # no ocupan el índice
+        Index(
+            "ix_jobs_queued_run_at", "run_at", "id",
+            postgresql_where=text("status IN ('pending', 'running')"),
+            sqlite_where=text("status IN ('pending', 'running')"),
+        ),
+    )
+
+    kind = Column(String(50), nullable=False)
+    payload = Column(JSON().with_variant(JSONB, "postgresql"), nullable=False)
+    # "pending", "running", "done" o "failed"
+    status = Column(String(10), nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False)
+    # No se procesa antes de este instante (reintentos con espera); en
+    # "running" es el vencimiento de la concesión del worker que lo tomó
+    run_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_error = Column(Text, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
@@ -0,0 +1,30 @@
+from datetime import datetime
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String
+from .base import Base
+
+class Loan(Base):
+    """
+    Historial de préstamos: un registro por préstamo o devolución, que nunca
+    se modifica. En PostgreSQL la tabla se particiona por mes de `occurred_at`
+    (ver `app.services.loan_partitions`) y la migración crea la clave primaria
+    (`id`, `occurred_at`) que exige el particionado; el modelo declara solo
+    `id`, que identifica cada fila y conserva el autoincremento en SQLite. No
+    tiene claves foráneas, para conservar la historia de libros y usuarios
+    eliminados.
+    """
+    __tablename__ = "loans"
+    __table_args__ = (
+        # Historial de un usuario y de un libro, del más reciente al más antiguo
+        Index("ix_loans_user_id_occurred_at_id", "user_id", "occurred_at", "id"),
+        Index("ix_loans_book_id_occurred_at_id", "book_id", "occurred_at", "id"),
+        # Rangos de fechas: las filas se insertan en orden de `occurred_at`
+        Index("ix_loans_occurred_at_brin", "occurred_at", postgresql_using="brin"),
+        {"postgresql_partition_by": "RANGE (occurred_at)"},
+    )
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    occurred_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    book_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, nullable=False)
+    # "borrow" o "return"
+    action = Column(String(10), nullable=False)
@@ -1,10 +1,14 @@
-from sqlalchemy import Column, String, DateTime
+from sqlalchemy import Column, String, DateTime, Index
 from sqlalchemy.orm import relationship
 from .base import BaseModel
 
 class User(BaseModel):
     """Modelo de Usuario"""
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_created_at_id", "created_at", "id"),
+        Index("ix_users_updated_at", "updated_at"),
+    )
 
     name = Column(String, nullable=False)
     email = Column(String, unique=True, nullable=False, index=True)
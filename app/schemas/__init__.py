@@ -1,6 +1,7 @@
 from .user import User, UserCreate, UserUpdate, UserInDBBase
-from .author import Author, AuthorCreate, AuthorUpdate, AuthorInDBBase
+from .author import Author, AuthorCreate, AuthorUpdate, AuthorInDBBase, AuthorWithCounts
 from .book import Book, BookCreate, BookUpdate, BookInDBBase
+from .loan import Loan
 
 # Resolvemos las referencias circulares
 Book.model_rebuild()
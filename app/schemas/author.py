@@ -1,11 +1,14 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, TYPE_CHECKING
 from pydantic.functional_validators import BeforeValidator
 from typing_extensions import Annotated
 from datetime import datetime
 from pydantic import BaseModel, Field, ConfigDict
 
+if TYPE_CHECKING:
+    from app.schemas.book import BookInDBBase
+
 def parse_date(value: str) -> datetime:
     if isinstance(value, str):
         try:
@@ -39,6 +42,11 @@ class AuthorInDBBase(AuthorBase):
     id: int
     model_config = ConfigDict(from_attributes=True)
 
+class AuthorWithCounts(AuthorInDBBase):
+    """Esquema de autor con el número de sus libros, sin cargarlos"""
+    book_count: int = Field(..., description="Libros del autor")
+    available_count: int = Field(..., description="Libros del autor sin prestar")
+
 class Author(AuthorInDBBase):
     """Esquema para respuesta de autor"""
-    books: List = []
\ No newline at end of file
+    books: List["BookInDBBase"] = []
\ No newline at end of file
@@ -0,0 +1,36 @@
+from pydantic import BaseModel, Field, ConfigDict, model_validator
+from typing import List, Optional
+from app.schemas.author import AuthorCreate
+
+class AuthorImport(AuthorCreate):
+    """Esquema de una fila de importación masiva de autores"""
+    model_config = ConfigDict(extra="ignore")
+
+class BookImport(BaseModel):
+    """Esquema de una fila de importación masiva de libros"""
+    model_config = ConfigDict(extra="ignore")
+    title: str = Field(..., min_length=1, description="Título del libro")
+    publication_year: Optional[int] = Field(
+        None, ge=-3000, le=9999, description="Año de publicación (negativo antes de Cristo)"
+    )
+    author_id: Optional[int] = Field(None, description="ID del autor")
+    author_name: Optional[str] = Field(None, description="Nombre del autor, si no se indica el ID")
+
+    @model_validator(mode="after")
+    def check_author_reference(self) -> "BookImport":
+        if self.author_id is None and not self.author_name:
+            raise ValueError("Se requiere author_id o author_name")
+        return self
+
+class BulkRowError(BaseModel):
+    """Error de una fila de la importación"""
+    line: int = Field(..., description="Número de línea (o fila) en el archivo")
+    error: str = Field(..., description="Descripción del error")
+
+class BulkImportResult(BaseModel):
+    """Resultado de una importación masiva"""
+    total: int = 0
+    inserted: int = 0
+    failed: int = 0
+    errors: List[BulkRowError] = []
+    errors_truncated: bool = Field(False, description="Indica si se omitieron errores del listado")
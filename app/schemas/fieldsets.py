@@ -0,0 +1,66 @@
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Sequence, Tuple, Type
+from pydantic import BaseModel, ConfigDict, create_model
+
+# Relación admitida en `include`: nombre, esquema de sus registros y si es una lista
+RelationshipSpec = Tuple[str, Type[BaseModel], bool]
+
+class InvalidFieldsError(ValueError):
+    """Campo o relación desconocidos en `fields` o `include`"""
+
+class FieldSet(NamedTuple):
+    """Columnas (`fields`) y relaciones (`include`) pedidas de un recurso"""
+    fields: Tuple[str, ...]
+    include: Tuple[str, ...]
+
+def _split(value: str) -> List[str]:
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+def parse_fieldset(
+    fields: Optional[str],
+    include: Optional[str],
+    schema: Type[BaseModel],
+    relationships: Sequence[str]
+) -> Optional[FieldSet]:
+    """
+    Interpreta `fields` e `include`. Retorna None si no se pidió ninguno, es
+    decir, la representación completa. Sin `fields` se incluyen todas las
+    columnas de `schema` y sin `include` ninguna relación; `id` se incluye
+    siempre. Los nombres se normalizan al orden del esquema, de modo que cada
+    combinación produce un único esquema de respuesta.
+    """
+    if fields is None and include is None:
+        return None
+    columns = list(schema.model_fields)
+    requested = set(_split(fields)) if fields is not None else set(columns)
+    unknown = requested.difference(columns)
+    if unknown:
+        raise InvalidFieldsError(
+            f"Campos desconocidos: {', '.join(sorted(unknown))}. Disponibles: {', '.join(columns)}"
+        )
+    related = set(_split(include)) if include is not None else set()
+    unknown = related.difference(relationships)
+    if unknown:
+        raise InvalidFieldsError(
+            f"Relaciones desconocidas: {', '.join(sorted(unknown))}. Disponibles: {', '.join(relationships)}"
+        )
+    return FieldSet(
+        tuple(name for name in columns if name == "id" or name in requested),
+        tuple(name for name in relationships if name in related),
+    )
+
+@lru_cache(maxsize=256)
+def sparse_model(
+    schema: Type[BaseModel],
+    fieldset: FieldSet,
+    relationships: Tuple[RelationshipSpec, ...]
+) -> Type[BaseModel]:
+    """
+    Esquema de respuesta con solo las columnas y relaciones de `fieldset`.
+    Se construye una vez por combinación, y con él su `TypeAdapter`.
+    """
+    definitions = {name: (schema.model_fields[name].annotation, schema.model_fields[name]) for name in fieldset.fields}
+    for name, related, uselist in relationships:
+        if name in fieldset.include:
+            definitions[name] = (List[related], []) if uselist else (Optional[related], None)
+    return create_model(f"{schema.__name__}Fields", __config__=ConfigDict(from_attributes=True), **definitions)
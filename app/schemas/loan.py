@@ -0,0 +1,12 @@
+from datetime import datetime
+from typing import Literal
+from pydantic import BaseModel, ConfigDict, Field
+
+class Loan(BaseModel):
+    """Esquema de un registro del historial de préstamos"""
+    model_config = ConfigDict(from_attributes=True)
+    id: int
+    occurred_at: datetime = Field(..., description="Fecha del préstamo o la devolución (UTC)")
+    book_id: int = Field(..., description="ID del libro")
+    user_id: int = Field(..., description="ID del usuario")
+    action: Literal["borrow", "return"] = Field(..., description="Préstamo o devolución")
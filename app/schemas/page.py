@@ -0,0 +1,10 @@
+from typing import Generic, List, Optional, TypeVar
+from pydantic import BaseModel, Field
+
+T = TypeVar("T")
+
+class Page(BaseModel, Generic[T]):
+    """Esquema del sobre de los listados (`envelope=true`)"""
+    items: List[T]
+    total: Optional[int] = Field(None, description="Total de registros, exacto o estimado según `count`")
+    next: Optional[str] = Field(None, description="Cursor de la página siguiente")
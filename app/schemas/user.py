@@ -1,8 +1,11 @@
 from pydantic import BaseModel, EmailStr, Field
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, TYPE_CHECKING
 from pydantic import BaseModel, Field, EmailStr, ConfigDict
 
+if TYPE_CHECKING:
+    from app.schemas.book import BookInDBBase
+
 class UserBase(BaseModel):
     model_config = ConfigDict(from_attributes=True)
     name: str = Field(..., description="Nombre del usuario")
@@ -26,4 +29,4 @@ class UserInDBBase(UserBase):
 
 class User(UserInDBBase):
     """Esquema para respuesta de usuario"""
-    borrowed_books: List = []
\ No newline at end of file
+    borrowed_books: List["BookInDBBase"] = []
\ No newline at end of file
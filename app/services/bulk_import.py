@@ -0,0 +1,274 @@
+import abc
+import csv
+import io
+import json
+from datetime import datetime
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Type
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import DBAPIError, SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.core.entity_cache import Tag, schedule_invalidation
+from app.models.author import Author
+from app.models.book import Book
+from app.schemas.bulk import AuthorImport, BookImport, BulkImportResult, BulkRowError
+
+FORMATS = ("ndjson", "csv")
+
+# Máximo de errores por fila que se incluyen en el resultado
+MAX_REPORTED_ERRORS = 1000
+
+class InvalidRecord:
+    """Línea del archivo que no se pudo interpretar"""
+    def __init__(self, error: str):
+        self.error = error
+
+def detect_format(filename: Optional[str], fmt: Optional[str] = None) -> str:
+    """Determina el formato del archivo a partir del parámetro o de su extensión"""
+    if fmt:
+        fmt = fmt.lower()
+    elif filename and filename.lower().endswith(".csv"):
+        fmt = "csv"
+    else:
+        fmt = "ndjson"
+    if fmt not in FORMATS:
+        raise ValueError(f"Formato no soportado: {fmt}. Opciones: {', '.join(FORMATS)}")
+    return fmt
+
+def iter_records(stream: IO[str], fmt: str) -> Iterator[Tuple[int, Any]]:
+    """
+    Recorre el archivo fila a fila sin cargarlo completo en memoria.
+    Retorna pares (número de línea, registro).
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, {
+                key: value if value != "" else None
+                for key, value in row.items() if key is not None
+            }
+        return
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError as e:
+            yield line_number, InvalidRecord(f"JSON inválido: {e}")
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc']) or 'fila'}: {err['msg']}"
+        for err in error.errors()
+    )
+
+def _copy_value(value: Any) -> str:
+    if value is None:
+        return "\\N"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+def copy_rows(db: Session, table: str, rows: List[Dict[str, Any]]) -> None:
+    """Inserta las filas con COPY FROM STDIN (solo PostgreSQL con psycopg2)"""
+    columns = list(rows[0])
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(_copy_value(row[column]) for column in columns))
+        buffer.write("\n")
+    buffer.seek(0)
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buffer)
+    finally:
+        cursor.close()
+
+def insert_rows(db: Session, model: Any, rows: List[Dict[str, Any]]) -> None:
+    """
+    Inserta un lote de filas en una sola operación: COPY en PostgreSQL y un
+    INSERT con executemany en el resto de motores. COPY usa el cursor del
+    driver, así que sus errores se convierten en `DBAPIError` como los de
+    cualquier sentencia ejecutada por SQLAlchemy.
+    """
+    dialect = db.get_bind().dialect
+    if dialect.driver != "psycopg2":
+        db.execute(insert(model), rows)
+        return
+    try:
+        copy_rows(db, model.__tablename__, rows)
+    except dialect.loaded_dbapi.Error as e:
+        raise DBAPIError.instance(
+            f"COPY {model.__tablename__} FROM STDIN", None, e, dialect.loaded_dbapi.Error
+        ) from e
+
+class BulkImporter(abc.ABC):
+    """
+    Importa registros por lotes. Cada lote se valida, se inserta y se confirma
+    por separado; las filas inválidas se reportan sin detener la importación.
+    Si la inserción de un lote falla, se reintenta fila a fila para aislar
+    las filas que causan el error.
+    """
+    model: Any = None
+    schema: Type[BaseModel] = BaseModel
+
+    def __init__(self, db: Session, *, batch_size: int = 1000, max_errors: int = MAX_REPORTED_ERRORS):
+        self.db = db
+        self.batch_size = max(batch_size, 1)
+        self.max_errors = max_errors
+        self.result = BulkImportResult()
+
+    def fail(self, line: int, error: str) -> None:
+        self.result.failed += 1
+        if len(self.result.errors) < self.max_errors:
+            self.result.errors.append(BulkRowError(line=line, error=error))
+        else:
+            self.result.errors_truncated = True
+
+    def run(self, records: Iterable[Tuple[int, Any]]) -> BulkImportResult:
+        """Importa todos los registros y retorna el resumen"""
+        batch: List[Tuple[int, BaseModel]] = []
+        for line, record in records:
+            self.result.total += 1
+            if isinstance(record, InvalidRecord):
+                self.fail(line, record.error)
+                continue
+            try:
+                batch.append((line, self.schema.model_validate(record)))
+            except ValidationError as e:
+                self.fail(line, _validation_message(e))
+            if len(batch) >= self.batch_size:
+                self.flush(batch)
+                batch = []
+        if batch:
+            self.flush(batch)
+        return self.result
+
+    @abc.abstractmethod
+    def prepare(self, batch: List[Tuple[int, BaseModel]]) -> List[Tuple[int, Dict[str, Any]]]:
+        """Convierte las filas validadas en valores de columnas"""
+
+    def invalidation_tags(self, rows: List[Tuple[int, Dict[str, Any]]]) -> Set[Tag]:
+        """Entradas de la caché de entidades afectadas por las filas insertadas"""
+        return set()
+
+    def flush(self, batch: List[Tuple[int, BaseModel]]) -> None:
+        rows = self.prepare(batch)
+        if not rows:
+            return
+        now = datetime.utcnow()
+        values = [{**row, "created_at": now, "updated_at": now} for _, row in rows]
+        try:
+            insert_rows(self.db, self.model, values)
+            schedule_invalidation(self.db, self.invalidation_tags(rows))
+            self.db.commit()
+        except SQLAlchemyError:
+            self.db.rollback()
+            self.flush_rows(rows, values)
+            return
+        self.result.inserted += len(rows)
+
+    def flush_rows(self, rows: List[Tuple[int, Dict[str, Any]]], values: List[Dict[str, Any]]) -> None:
+        """
+        Reintenta un lote fallido fila a fila, cada una en su propio SAVEPOINT:
+        el error se reporta solo en las filas que lo causan y el resto se
+        inserta en una única transacción.
+        """
+        inserted = []
+        for (line, row), value in zip(rows, values):
+            try:
+                with self.db.begin_nested():
+                    insert_rows(self.db, self.model, [value])
+            except SQLAlchemyError as e:
+                self.fail(line, f"Error al insertar la fila: {getattr(e, 'orig', None) or e}")
+            else:
+                inserted.append((line, row))
+        try:
+            schedule_invalidation(self.db, self.invalidation_tags(inserted))
+            self.db.commit()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            message = f"Error al insertar el lote: {getattr(e, 'orig', None) or e}"
+            for line, _ in inserted:
+                self.fail(line, message)
+            return
+        self.result.inserted += len(inserted)
+
+class AuthorImporter(BulkImporter):
+    """Importación masiva de autores"""
+    model = Author
+    schema = AuthorImport
+
+    def prepare(self, batch: List[Tuple[int, AuthorImport]]) -> List[Tuple[int, Dict[str, Any]]]:
+        rows = []
+        now = datetime.now()
+        for line, item in batch:
+            if item.birth_date and item.birth_date > now:
+                self.fail(line, "La fecha de nacimiento no puede ser futura")
+                continue
+            rows.append((line, {"name": item.name, "birth_date": item.birth_date}))
+        return rows
+
+class BookImporter(BulkImporter):
+    """
+    Importación masiva de libros. Las referencias a autores se resuelven con
+    una consulta por lote, ya sea por ID o por nombre exacto.
+    """
+    model = Book
+    schema = BookImport
+
+    def resolve_authors(self, batch: List[Tuple[int, BookImport]]) -> Tuple[set, Dict[str, List[int]]]:
+        ids = {item.author_id for _, item in batch if item.author_id is not None}
+        names = {item.author_name for _, item in batch if item.author_id is None}
+        existing_ids = set()
+        by_name: Dict[str, List[int]] = {}
+        if ids:
+            existing_ids = {
+                row.id for row in self.db.query(Author.id).filter(Author.id.in_(ids))
+            }
+        if names:
+            for row in self.db.query(Author.id, Author.name).filter(Author.name.in_(names)):
+                by_name.setdefault(row.name, []).append(row.id)
+        return existing_ids, by_name
+
+    def invalidation_tags(self, rows: List[Tuple[int, Dict[str, Any]]]) -> Set[Tag]:
+        # Los libros nuevos aparecen en la respuesta de sus autores
+        return {("authors", row["author_id"]) for _, row in rows}
+
+    def prepare(self, batch: List[Tuple[int, BookImport]]) -> List[Tuple[int, Dict[str, Any]]]:
+        existing_ids, by_name = self.resolve_authors(batch)
+        rows = []
+        for line, item in batch:
+            author_id = item.author_id
+            if author_id is None:
+                matches = by_name.get(item.author_name, [])
+                if len(matches) > 1:
+                    self.fail(line, f"Nombre de autor ambiguo: {item.author_name}")
+                    continue
+                author_id = matches[0] if matches else None
+            elif author_id not in existing_ids:
+                author_id = None
+            if author_id is None:
+                self.fail(line, "Autor no encontrado")
+                continue
+            rows.append((line, {
+                "title": item.title,
+                "publication_year": item.publication_year,
+                "author_id": author_id,
+                "borrowed_by_id": None,
+            }))
+        return rows
+
+def import_authors(db: Session, stream: IO[str], fmt: str, *, batch_size: int = 1000) -> BulkImportResult:
+    """Importa autores desde un archivo NDJSON o CSV"""
+    return AuthorImporter(db, batch_size=batch_size).run(iter_records(stream, fmt))
+
+def import_books(db: Session, stream: IO[str], fmt: str, *, batch_size: int = 1000) -> BulkImportResult:
+    """Importa libros desde un archivo NDJSON o CSV"""
+    return BookImporter(db, batch_size=batch_size).run(iter_records(stream, fmt))
@@ -0,0 +1,88 @@
+import logging
+import select
+import threading
+from typing import Any, Optional
+from sqlalchemy.engine import Engine
+from app.core.entity_cache import EntityCache, parse_tags
+
+logger = logging.getLogger(__name__)
+
+class CacheInvalidationListener:
+    """
+    Escucha con LISTEN las invalidaciones que publican los demás workers y las
+    aplica a la caché de entidades local.
+
+    Usa una conexión propia fuera del pool. Si la conexión se pierde la caché
+    se vacía al reconectar, ya que pudieron perderse notificaciones.
+    """
+    def __init__(
+        self,
+        engine: Engine,
+        cache: EntityCache,
+        channel: str,
+        poll_interval: float = 1.0,
+        retry_interval: float = 5.0
+    ):
+        self.engine = engine
+        self.cache = cache
+        self.channel = channel
+        self.poll_interval = poll_interval
+        self.retry_interval = retry_interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.notifications = 0
+
+    def _connect(self) -> Any:
+        dialect = self.engine.dialect
+        args, kwargs = dialect.create_connect_args(self.engine.url)
+        connection = dialect.connect(*args, **kwargs)
+        connection.autocommit = True
+        cursor = connection.cursor()
+        cursor.execute(f'LISTEN "{self.channel}"')
+        cursor.close()
+        return connection
+
+    def handle(self, payload: str) -> None:
+        """Aplica una notificación recibida"""
+        self.notifications += 1
+        try:
+            tags = parse_tags(payload)
+        except ValueError:
+            tags = None
+        self.cache.invalidate(tags)
+
+    def _listen(self, connection: Any) -> None:
+        while not self._stop.is_set():
+            readable, _, _ = select.select([connection], [], [], self.poll_interval)
+            if not readable:
+                continue
+            connection.poll()
+            while connection.notifies:
+                self.handle(connection.notifies.pop(0).payload)
+
+    def run(self) -> None:
+        while not self._stop.is_set():
+            connection = None
+            try:
+                connection = self._connect()
+                self.cache.clear()
+                self._listen(connection)
+            except Exception:
+                logger.exception("Error escuchando invalidaciones de caché en %s", self.channel)
+                self.cache.clear()
+                self._stop.wait(self.retry_interval)
+            finally:
+                if connection is not None:
+                    connection.close()
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run, name="cache-invalidation", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval + 1)
+            self._thread = None
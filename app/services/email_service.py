@@ -1,12 +1,104 @@
-def send_welcome_email(email: str) -> bool:
+import logging
+import smtplib
+from email.message import EmailMessage
+from typing import Any, Optional
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+def welcome_message(email: str) -> EmailMessage:
     """
     Email de bienvenida.
     Bienvenido a la bilbioteca digital.
     """
+    message = EmailMessage()
+    message["From"] = settings.EMAIL_FROM
+    message["To"] = email
+    message["Subject"] = "Bienvenido a la biblioteca digital"
+    message.set_content("Tu cuenta en la biblioteca digital está lista. ¡Bienvenido!")
+    return message
+
+def notification_message(email: str, text: str) -> EmailMessage:
+    """
+    Notificación por email.
+    """
+    message = EmailMessage()
+    message["From"] = settings.EMAIL_FROM
+    message["To"] = email
+    message["Subject"] = "Notificación de la biblioteca digital"
+    message.set_content(text)
+    return message
+
+class SMTPMailer:
+    """
+    Conexión SMTP que se reutiliza para enviar un lote de mensajes:
+
+        with SMTPMailer() as mailer:
+            mailer.send(welcome_message(email))
+
+    Sin `host` (SMTP_HOST) los mensajes solo se registran en el log.
+    """
+    def __init__(
+        self,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        *,
+        user: Optional[str] = None,
+        password: Optional[str] = None,
+        starttls: Optional[bool] = None,
+        timeout: Optional[float] = None
+    ):
+        self.host = host if host is not None else settings.SMTP_HOST
+        self.port = port if port is not None else settings.SMTP_PORT
+        self.user = user if user is not None else settings.SMTP_USER
+        self.password = password if password is not None else settings.SMTP_PASSWORD
+        self.starttls = starttls if starttls is not None else settings.SMTP_STARTTLS
+        self.timeout = timeout if timeout is not None else settings.SMTP_TIMEOUT
+        self._smtp: Optional[smtplib.SMTP] = None
+
+    def __enter__(self) -> "SMTPMailer":
+        if self.host:
+            self._smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            try:
+                if self.starttls:
+                    self._smtp.starttls()
+                if self.user:
+                    self._smtp.login(self.user, self.password or "")
+            except Exception:
+                self._smtp.close()
+                self._smtp = None
+                raise
+        return self
+
+    def send(self, message: EmailMessage) -> None:
+        if self._smtp is None:
+            logger.info("Email a %s (sin SMTP_HOST): %s", message["To"], message["Subject"])
+            return
+        self._smtp.send_message(message)
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except smtplib.SMTPException:
+            self._smtp.close()
+        finally:
+            self._smtp = None
+
+def send_welcome_email(email: str) -> bool:
+    """
+    Envía el email de bienvenida en el momento. Los endpoints lo encolan con
+    `jobs.enqueue(db, "welcome_email", ...)` para no esperar al servidor SMTP.
+    """
+    with SMTPMailer() as mailer:
+        mailer.send(welcome_message(email))
     return True
 
 def send_notification(email: str, message: str) -> bool:
     """
-    Notificación por email.
+    Envía una notificación por email en el momento.
     """
-    return True
\ No newline at end of file
+    with SMTPMailer() as mailer:
+        mailer.send(notification_message(email, message))
+    return True
@@ -0,0 +1,101 @@
+import asyncio
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Optional
+from app.core.config import settings
+from app.core.exceptions import ServiceUnavailableError
+from app.core import metrics, security
+
+class HashingService:
+    """
+    Ejecuta bcrypt en un pool de procesos dedicado.
+
+    Cada hash cuesta ~250 ms de CPU; fuera de los workers de la API no compite
+    con el resto de peticiones. La cola es acotada: si ya hay `workers +
+    queue_size` hashes pendientes se rechaza la petición con 503 en lugar de
+    dejar que se acumulen.
+    """
+    def __init__(
+        self,
+        workers: int,
+        queue_size: int,
+        timeout: float = 10,
+        executor: Optional[Executor] = None
+    ):
+        self.workers = workers
+        self.timeout = timeout
+        self._executor = executor
+        self._slots = threading.BoundedSemaphore(max(workers, 1) + queue_size)
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.rejected = 0
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def _release(self, future: Future) -> None:
+        with self._lock:
+            self.pending -= 1
+        metrics.HASHING_QUEUE.dec()
+        self._slots.release()
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """Encola una tarea o lanza ServiceUnavailableError si la cola está llena"""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            metrics.HASHING_REJECTED.inc()
+            raise ServiceUnavailableError("Demasiadas solicitudes de autenticación, intente más tarde")
+        with self._lock:
+            self.pending += 1
+        metrics.HASHING_QUEUE.inc()
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Ejecuta una tarea y espera su resultado"""
+        if self.workers <= 0:
+            return fn(*args)
+        try:
+            return self.submit(fn, *args).result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise ServiceUnavailableError("El servicio de contraseñas no respondió a tiempo")
+
+    async def run_async(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Ejecuta una tarea sin bloquear el event loop"""
+        if self.workers <= 0:
+            return fn(*args)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(self.submit(fn, *args)), self.timeout)
+        except asyncio.TimeoutError:
+            raise ServiceUnavailableError("El servicio de contraseñas no respondió a tiempo")
+
+    def hash_password(self, password: str) -> str:
+        return self.run(security.get_password_hash, password)
+
+    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return self.run(security.verify_password, plain_password, hashed_password)
+
+    async def hash_password_async(self, password: str) -> str:
+        return await self.run_async(security.get_password_hash, password)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+hashing = HashingService(
+    workers=settings.HASH_WORKERS,
+    queue_size=settings.HASH_QUEUE_SIZE,
+    timeout=settings.HASH_TIMEOUT
+)
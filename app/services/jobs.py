@@ -0,0 +1,205 @@
+import logging
+import random
+import smtplib
+import threading
+import time
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import select
+from app.core.config import settings
+from app.models.job import Job
+from app.services import email_service
+
+logger = logging.getLogger(__name__)
+
+# Mensaje de cada tipo de trabajo a partir de su `payload`
+MESSAGE_BUILDERS: Dict[str, Callable[[Dict[str, Any]], EmailMessage]] = {
+    "welcome_email": lambda payload: email_service.welcome_message(payload["email"]),
+    "notification": lambda payload: email_service.notification_message(payload["email"], payload["message"]),
+}
+# Fracción aleatoria que se suma a cada espera para no reintentar todos a la vez
+RETRY_JITTER = 0.1
+MAX_ERROR_LENGTH = 1000
+
+def enqueue(
+    db: Any,
+    kind: str,
+    payload: Dict[str, Any],
+    *,
+    run_at: Optional[datetime] = None,
+    max_attempts: Optional[int] = None
+) -> Job:
+    """
+    Encola un trabajo en la sesión sin confirmarla: se guarda con el commit de
+    la operación que lo origina y se descarta si esta se revierte.
+    """
+    if kind not in MESSAGE_BUILDERS:
+        raise ValueError(f"Tipo de trabajo desconocido: {kind}")
+    job = Job(
+        kind=kind,
+        payload=payload,
+        status="pending",
+        attempts=0,
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+        run_at=run_at or datetime.utcnow(),
+    )
+    db.add(job)
+    return job
+
+def claim_batch(db: Any, limit: int, *, now: Optional[datetime] = None) -> List[Job]:
+    """
+    Toma hasta `limit` trabajos vencidos: pendientes o en curso con la
+    concesión vencida (el worker que los tenía murió). Con SKIP LOCKED cada
+    worker toma trabajos distintos sin esperar a los demás.
+
+    Los trabajos tomados quedan `running` hasta `run_at` + JOB_LEASE_SECONDS,
+    y se cuenta su intento; los bloqueos se liberan en cuanto el llamador
+    confirma, antes de enviar nada. Los que agotaron sus intentos sin llegar
+    a registrar el resultado se marcan como fallidos y no se retornan.
+    """
+    now = now or datetime.utcnow()
+    stmt = (
+        select(Job)
+        .where(Job.status.in_(("pending", "running")), Job.run_at <= now)
+        .order_by(Job.run_at, Job.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    claimed = []
+    for job in db.execute(stmt).scalars().all():
+        if job.attempts >= job.max_attempts:
+            job.status = "failed"
+            job.last_error = job.last_error or "Concesión vencida sin resultado"
+            job.finished_at = now
+            continue
+        job.status = "running"
+        job.attempts += 1
+        job.run_at = now + timedelta(seconds=settings.JOB_LEASE_SECONDS)
+        claimed.append(job)
+    return claimed
+def retry_delay(attempts: int) -> float:
+    """Segundos hasta el siguiente intento: exponencial desde JOB_RETRY_BASE_SECONDS, con tope"""
+    delay = min(settings.JOB_RETRY_BASE_SECONDS * 2 ** (attempts - 1), settings.JOB_RETRY_MAX_SECONDS)
+    return delay + random.uniform(0, delay * RETRY_JITTER)
+
+def is_permanent(exc: Exception) -> bool:
+    """
+    Errores que no se resuelven reintentando: payload inválido o rechazo 5xx
+    del servidor. Un rechazo de destinatarios es definitivo solo si todos lo
+    son; un 4xx (buzón lleno, greylisting) se reintenta.
+    """
+    if isinstance(exc, (KeyError, ValueError)):
+        return True
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return bool(exc.recipients) and all(code >= 500 for code, _ in exc.recipients.values())
+    return isinstance(exc, smtplib.SMTPResponseException) and exc.smtp_code >= 500
+
+def build_message(job: Job) -> EmailMessage:
+    if job.kind not in MESSAGE_BUILDERS:
+        raise ValueError(f"Tipo de trabajo desconocido: {job.kind}")
+    return MESSAGE_BUILDERS[job.kind](job.payload)
+
+def mark_done(job: Job, now: datetime) -> None:
+    job.status = "done"
+    job.last_error = None
+    job.finished_at = now
+
+def mark_failed(job: Job, exc: Exception, now: datetime) -> None:
+    """Programa el reintento, o deja el trabajo como fallido si no corresponde otro"""
+    job.last_error = f"{type(exc).__name__}: {exc}"[:MAX_ERROR_LENGTH]
+    if is_permanent(exc) or job.attempts >= job.max_attempts:
+        job.status = "failed"
+        job.finished_at = now
+        logger.error("Trabajo %s (%s) fallido tras %s intentos: %s", job.id, job.kind, job.attempts, job.last_error)
+    else:
+        job.status = "pending"
+        job.run_at = now + timedelta(seconds=retry_delay(job.attempts))
+        logger.warning("Trabajo %s (%s) se reintentará: %s", job.id, job.kind, job.last_error)
+
+class JobWorker:
+    """
+    Procesa la cola de trabajos por lotes: toma un lote y confirma la toma,
+    envía sus mensajes por una sola conexión SMTP y confirma el resultado de
+    cada trabajo al terminarlo. Ninguna transacción ni bloqueo queda abierto
+    mientras se habla con el servidor SMTP. Varios workers pueden correr en
+    paralelo.
+
+    La entrega es al menos una vez: si el worker muere antes de confirmar un
+    resultado, el trabajo se vuelve a tomar cuando vence su concesión.
+
+    `periodic` son tareas de mantenimiento `(segundos, función)` que el worker
+    ejecuta entre lotes cada vez que vence su intervalo.
+    """
+    def __init__(
+        self,
+        session_factory: Callable[[], Any],
+        *,
+        batch_size: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        mailer_factory: Callable[[], Any] = email_service.SMTPMailer,
+        periodic: Sequence[Tuple[float, Callable[[], Any]]] = ()
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size or settings.JOB_BATCH_SIZE
+        self.poll_interval = poll_interval if poll_interval is not None else settings.JOB_POLL_INTERVAL
+        self.mailer_factory = mailer_factory
+        self.periodic = list(periodic)
+        self._next_runs = [0.0] * len(self.periodic)
+
+    def run_once(self) -> int:
+        """Procesa un lote. Retorna la cantidad de trabajos tomados"""
+        db = self.session_factory()
+        # Los trabajos se siguen usando tras cada commit: sin recargarlos
+        db.expire_on_commit = False
+        try:
+            jobs = claim_batch(db, self.batch_size)
+            db.commit()
+            if not jobs:
+                return 0
+            pending = list(jobs)
+            try:
+                with self.mailer_factory() as mailer:
+                    while pending:
+                        job = pending[0]
+                        try:
+                            mailer.send(build_message(job))
+                        except Exception as exc:
+                            mark_failed(job, exc, datetime.utcnow())
+                        else:
+                            mark_done(job, datetime.utcnow())
+                        db.commit()
+                        pending.pop(0)
+            except Exception as exc:
+                # Sin conexión con el servidor SMTP: se reintenta el resto del lote
+                for job in pending:
+                    mark_failed(job, exc, datetime.utcnow())
+                db.commit()
+            return len(jobs)
+        finally:
+            db.close()
+
+    def run_periodic(self, now: Optional[float] = None) -> None:
+        """Ejecuta las tareas periódicas vencidas; si una falla, se reintenta en el siguiente intervalo"""
+        now = time.monotonic() if now is None else now
+        for index, (interval, task) in enumerate(self.periodic):
+            if now < self._next_runs[index]:
+                continue
+            self._next_runs[index] = now + interval
+            try:
+                task()
+            except Exception:
+                logger.exception("Error en la tarea periódica %s", getattr(task, "__name__", task))
+
+    def run(self, stop: Optional[threading.Event] = None) -> None:
+        """Procesa lotes hasta que se active `stop`, esperando `poll_interval` si la cola está vacía"""
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            self.run_periodic()
+            try:
+                processed = self.run_once()
+            except Exception:
+                logger.exception("Error al procesar la cola de trabajos")
+                processed = 0
+            if processed < self.batch_size:
+                stop.wait(self.poll_interval)
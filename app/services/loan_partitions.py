@@ -0,0 +1,80 @@
+import logging
+from datetime import date
+from typing import List, Optional
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Clave del bloqueo consultivo que serializa la creación entre workers
+PARTITION_LOCK_KEY = 7_352_001
+# Partición que recibe las filas de meses sin partición propia (la crea la migración)
+DEFAULT_PARTITION = "loans_default"
+
+def month_start(day: date, offset: int = 0) -> date:
+    """Primer día del mes de `day`, desplazado `offset` meses"""
+    index = day.year * 12 + day.month - 1 + offset
+    return date(index // 12, index % 12 + 1, 1)
+
+def partition_name(month: date) -> str:
+    return f"loans_{month:%Y_%m}"
+
+def partition_ddl(month: date) -> str:
+    """CREATE de la partición del mes de `month`: [primer día, primer día del siguiente)"""
+    start, end = month_start(month), month_start(month, 1)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(start)} PARTITION OF loans "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+
+def move_from_default_ddl(month: date) -> List[str]:
+    """
+    Crea la partición del mes de `month` cuando la partición DEFAULT ya tiene
+    filas de ese mes: PostgreSQL no permite crearla directamente, así que se
+    desvincula la DEFAULT, se crea la partición, se mueven las filas y se
+    vuelve a vincular, todo en la misma transacción.
+    """
+    start, end = month_start(month), month_start(month, 1)
+    bounds = f"occurred_at >= '{start.isoformat()}' AND occurred_at < '{end.isoformat()}'"
+    return [
+        f"ALTER TABLE loans DETACH PARTITION {DEFAULT_PARTITION}",
+        partition_ddl(start),
+        f"INSERT INTO {partition_name(start)} SELECT * FROM {DEFAULT_PARTITION} WHERE {bounds}",
+        f"DELETE FROM {DEFAULT_PARTITION} WHERE {bounds}",
+        f"ALTER TABLE loans ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT",
+    ]
+
+def ensure_partitions(engine: Engine, *, months_ahead: Optional[int] = None, today: Optional[date] = None) -> List[str]:
+    """
+    Crea, si no existen, las particiones del historial de préstamos del mes en
+    curso y de los `months_ahead` siguientes (solo PostgreSQL). Se ejecuta al
+    iniciar la aplicación y periódicamente desde el worker de trabajos.
+
+    Las filas que no tienen partición van a la partición DEFAULT; sus meses
+    también se crean, trasladando esas filas a la partición nueva. Retorna los
+    nombres de las particiones revisadas.
+    """
+    if engine.dialect.name != "postgresql":
+        return []
+    if months_ahead is None:
+        months_ahead = settings.LOAN_PARTITIONS_AHEAD
+    today = today or date.today()
+    months = {month_start(today, offset) for offset in range(months_ahead + 1)}
+    with engine.begin() as conn:
+        conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": PARTITION_LOCK_KEY})
+        stranded = {
+            month_start(row[0]) for row in
+            conn.execute(text(f"SELECT DISTINCT date_trunc('month', occurred_at)::date FROM {DEFAULT_PARTITION}"))
+        }
+        for month in sorted(months | stranded):
+            if conn.execute(text("SELECT to_regclass(:name)"), {"name": partition_name(month)}).scalar() is not None:
+                continue
+            if month in stranded:
+                logger.warning("Trasladando a %s las filas de %s", partition_name(month), DEFAULT_PARTITION)
+                statements = move_from_default_ddl(month)
+            else:
+                statements = [partition_ddl(month)]
+            for statement in statements:
+                conn.execute(text(statement))
+    return [partition_name(month) for month in sorted(months | stranded)]
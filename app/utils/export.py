@@ -0,0 +1,83 @@
+import csv
+import io
+import json
+from datetime import date
+from itertools import islice
+from typing import Any, AsyncIterator, Iterable, Iterator, List, Sequence
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# Filas por fragmento enviado al cliente
+CHUNK_SIZE = 500
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Tipo no serializable: {type(value).__name__}")
+
+def _csv_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, date) else value
+
+def header(columns: Sequence[str], fmt: str) -> str:
+    """Encabezado del archivo exportado (solo CSV)"""
+    if fmt != "csv":
+        return ""
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerow(columns)
+    return buffer.getvalue()
+
+def encode_rows(rows: Sequence[Sequence[Any]], columns: Sequence[str], fmt: str) -> str:
+    """Serializa un fragmento de filas en NDJSON o CSV"""
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerows([_csv_value(value) for value in row] for row in rows)
+        return buffer.getvalue()
+    return "".join(
+        json.dumps(dict(zip(columns, row)), default=_json_default, ensure_ascii=False) + "\n"
+        for row in rows
+    )
+
+def iter_export(
+    rows: Iterable[Sequence[Any]],
+    columns: Sequence[str],
+    fmt: str,
+    *,
+    chunk_size: int = CHUNK_SIZE
+) -> Iterator[str]:
+    """
+    Genera el contenido exportado por fragmentos de `chunk_size` filas, para
+    no enviar al cliente una escritura por fila.
+    """
+    head = header(columns, fmt)
+    if head:
+        yield head
+    rows = iter(rows)
+    while True:
+        chunk: List[Sequence[Any]] = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield encode_rows(chunk, columns, fmt)
+
+async def aiter_export(
+    rows: AsyncIterator[Sequence[Any]],
+    columns: Sequence[str],
+    fmt: str,
+    *,
+    chunk_size: int = CHUNK_SIZE
+) -> AsyncIterator[str]:
+    """Versión asíncrona de `iter_export`"""
+    head = header(columns, fmt)
+    if head:
+        yield head
+    chunk: List[Sequence[Any]] = []
+    async for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield encode_rows(chunk, columns, fmt)
+            chunk = []
+    if chunk:
+        yield encode_rows(chunk, columns, fmt)
@@ -0,0 +1,74 @@
+import re
+import unicodedata
+from typing import Callable, Iterable, List, Set, TypeVar
+
+T = TypeVar("T")
+
+# Umbral de similitud por trigramas, igual al valor por defecto de pg_trgm
+SIMILARITY_THRESHOLD = 0.3
+
+# Sufijos comunes del español, de mayor a menor longitud
+SPANISH_SUFFIXES = (
+    "amientos", "imientos", "amiento", "imiento", "aciones", "uciones",
+    "adoras", "adores", "ancias", "idades", "mente", "acion", "ucion",
+    "ancia", "adora", "ador", "idad", "ivas", "ivos", "iva", "ivo",
+    "es", "os", "as", "s", "a", "o", "e",
+)
+
+_WORD_RE = re.compile(r"\w+")
+
+def normalize(text: str) -> str:
+    """Convierte a minúsculas y elimina tildes y diacríticos"""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+def stem(word: str) -> str:
+    """Reduce una palabra en español a una raíz aproximada"""
+    for suffix in SPANISH_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)]
+    return word
+
+def tokenize(text: str) -> List[str]:
+    """Separa un texto normalizado en palabras"""
+    return _WORD_RE.findall(normalize(text))
+
+def trigrams(word: str) -> Set[str]:
+    """Obtiene los trigramas de una palabra tal como los calcula pg_trgm"""
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def similarity(a: str, b: str) -> float:
+    """Similitud por trigramas entre dos palabras (0 a 1)"""
+    ta, tb = trigrams(a), trigrams(b)
+    if not ta or not tb:
+        return 0.0
+    return len(ta & tb) / len(ta | tb)
+
+def match_score(query: str, text: str) -> float:
+    """
+    Calcula la relevancia de un texto para una búsqueda.
+
+    Cada palabra de la búsqueda aporta 1 si su raíz aparece en el texto o,
+    para tolerar errores tipográficos, su mejor similitud por trigramas si
+    supera el umbral. Retorna 0 cuando el texto no coincide.
+    """
+    query_words = tokenize(query)
+    text_words = tokenize(text)
+    if not query_words or not text_words:
+        return 0.0
+    text_stems = {stem(word) for word in text_words}
+    total = 0.0
+    for word in query_words:
+        if stem(word) in text_stems:
+            total += 1.0
+            continue
+        best = max(similarity(word, candidate) for candidate in text_words)
+        if best >= SIMILARITY_THRESHOLD:
+            total += best
+    return total / len(query_words)
+
+def rank(items: Iterable[T], query: str, key: Callable[[T], str]) -> List[T]:
+    """Filtra y ordena los elementos por relevancia descendente"""
+    scored = [(match_score(query, key(item)), index, item) for index, item in enumerate(items)]
+    return [item for score, index, item in sorted(scored, key=lambda s: (-s[0], s[1])) if score > 0]
@@ -0,0 +1,48 @@
+"""
+Compara las peticiones por segundo de los endpoints de lectura con el
+stack síncrono (psycopg2 + threadpool) y el asíncrono (asyncpg).
+
+Levanta la API dos veces, con DB_ASYNC=false y DB_ASYNC=true, contra la
+base de datos configurada en el entorno:
+
+    python -m benchmarks.async_vs_sync --concurrency 200 --duration 20
+"""
+import argparse
+import asyncio
+import httpx
+from benchmarks.loadgen import print_table, run_load, uvicorn_server
+
+PATHS = {
+    "books": "/api/v1/books/?limit=20",
+    "book": "/api/v1/books/1",
+    "authors": "/api/v1/authors/?limit=20",
+}
+
+async def measure(base_url: str, mode: str, path: str, concurrency: int, duration: float):
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        # Calentamiento del pool de conexiones
+        await run_load("warmup", client, lambda c: c.get(path), concurrency=concurrency, duration=2)
+        return await run_load(
+            f"{mode} {path.split('?')[0]}", client, lambda c: c.get(path),
+            concurrency=concurrency, duration=duration
+        )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--endpoint", choices=sorted(PATHS), default="books")
+    args = parser.parse_args()
+
+    results = []
+    for mode, flag in (("sync", "false"), ("async", "true")):
+        with uvicorn_server(args.port, env={"DB_ASYNC": flag}) as base_url:
+            results.append(asyncio.run(
+                measure(base_url, mode, PATHS[args.endpoint], args.concurrency, args.duration)
+            ))
+    print_table(results)
+
+if __name__ == "__main__":
+    main()
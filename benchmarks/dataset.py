@@ -0,0 +1,184 @@
+"""
+Genera un conjunto de datos sintético y reproducible para los benchmarks:
+autores, libros, usuarios y préstamos (libros prestados a un usuario).
+
+Inserta por lotes sobre la base de datos configurada (`POSTGRES_URL`), con
+COPY en PostgreSQL, a continuación de los IDs ya existentes:
+
+    python -m benchmarks.dataset --authors 100000 --books 1000000 --users 50000 --loans 200000
+
+Todos los usuarios generados tienen la contraseña `PASSWORD` y el correo
+`bench{id}@example.com`, para que los escenarios de login y préstamo puedan
+autenticarse.
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+from app.api.dependencies import SessionLocal, engine
+from app.models import Author, Base, Book, User
+from app.services.bulk_import import insert_rows
+from app.services.hashing_service import hashing
+
+PASSWORD = "Benchmark123"
+
+# Vocabulario de los títulos; los escenarios de búsqueda lo reutilizan
+WORDS = (
+    "amor", "guerra", "noche", "mar", "ciudad", "tiempo", "sombra", "jardín", "río", "luz",
+    "silencio", "memoria", "viaje", "fuego", "camino", "sueño", "tierra", "viento", "espejo",
+    "laberinto", "isla", "invierno", "verano", "ciego", "muerte", "vida", "casa", "piedra",
+    "libro", "biblioteca", "reloj", "puerta", "historia", "secreto", "familia", "soledad",
+)
+FIRST_NAMES = ("Ana", "Jorge", "Gabriela", "Julio", "Isabel", "Pablo", "Rosa", "Mario", "Clara", "Juan")
+LAST_NAMES = ("Borges", "Mistral", "Cortázar", "Allende", "Neruda", "Vargas", "Rulfo", "Storni", "Paz", "Onetti")
+
+def author_rows(rng: random.Random, first_id: int, count: int, now: datetime) -> Iterator[Dict[str, Any]]:
+    for author_id in range(first_id, first_id + count):
+        yield {
+            "id": author_id,
+            "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {author_id}",
+            "birth_date": datetime(1850, 1, 1) + timedelta(days=rng.randrange(55000)),
+            "created_at": now,
+            "updated_at": now,
+        }
+
+def user_rows(rng: random.Random, first_id: int, count: int, now: datetime, hashed_password: str) -> Iterator[Dict[str, Any]]:
+    for user_id in range(first_id, first_id + count):
+        yield {
+            "id": user_id,
+            "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "email": f"bench{user_id}@example.com",
+            "hashed_password": hashed_password,
+            "registration_date": now - timedelta(days=rng.randrange(3650)),
+            "created_at": now,
+            "updated_at": now,
+        }
+
+def book_rows(
+    rng: random.Random,
+    first_id: int,
+    count: int,
+    now: datetime,
+    *,
+    author_ids: range,
+    user_ids: range,
+    loans: int
+) -> Iterator[Dict[str, Any]]:
+    # Los préstamos se reparten uniformemente entre los libros generados
+    loan_ratio = loans / count if count else 0
+    for book_id in range(first_id, first_id + count):
+        borrowed = user_ids and rng.random() < loan_ratio
+        yield {
+            "id": book_id,
+            "title": " ".join(rng.sample(WORDS, rng.randint(2, 4))).capitalize(),
+            "publication_year": rng.randint(1800, now.year),
+            "author_id": rng.choice(author_ids),
+            "borrowed_by_id": rng.choice(user_ids) if borrowed else None,
+            "created_at": now,
+            "updated_at": now,
+        }
+
+def next_id(db: Session, model: Any) -> int:
+    return (db.execute(select(func.max(model.id))).scalar() or 0) + 1
+
+def load(db: Session, model: Any, rows: Iterator[Dict[str, Any]], batch_size: int, report: Callable[[str, int], None]) -> None:
+    """Inserta las filas por lotes, confirmando cada lote"""
+    batch: List[Dict[str, Any]] = []
+    done = 0
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            insert_rows(db, model, batch)
+            db.commit()
+            done += len(batch)
+            batch = []
+            report(model.__tablename__, done)
+    if batch:
+        insert_rows(db, model, batch)
+        db.commit()
+        report(model.__tablename__, done + len(batch))
+
+def finish(db: Session) -> None:
+    """Ajusta las secuencias de IDs y actualiza las estadísticas del planificador"""
+    if db.get_bind().dialect.name == "postgresql":
+        for model in (Author, User, Book):
+            table = model.__tablename__
+            db.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE(MAX(id), 1)) FROM {table}"
+            ))
+        db.commit()
+    with engine.connect() as connection:
+        connection.execution_options(isolation_level="AUTOCOMMIT").execute(text("ANALYZE"))
+
+def seed(
+    db: Session,
+    *,
+    authors: int,
+    books: int,
+    users: int,
+    loans: int,
+    seed: int = 42,
+    batch_size: int = 10000,
+    report: Callable[[str, int], None] = lambda table, done: None
+) -> Dict[str, range]:
+    """Genera el conjunto de datos y retorna los rangos de IDs insertados por tabla"""
+    rng = random.Random(seed)
+    now = datetime.utcnow().replace(microsecond=0)
+    ids: Dict[str, range] = {}
+
+    first = next_id(db, Author)
+    ids["authors"] = range(first, first + authors)
+    load(db, Author, author_rows(rng, first, authors, now), batch_size, report)
+
+    first = next_id(db, User)
+    ids["users"] = range(first, first + users)
+    hashed_password = hashing.hash_password(PASSWORD) if users else ""
+    load(db, User, user_rows(rng, first, users, now, hashed_password), batch_size, report)
+
+    author_ids = ids["authors"] or range(1, next_id(db, Author))
+    if books and not author_ids:
+        raise ValueError("No hay autores a los que asignar los libros")
+    first = next_id(db, Book)
+    ids["books"] = range(first, first + books)
+    load(db, Book, book_rows(
+        rng, first, books, now, author_ids=author_ids, user_ids=ids["users"], loans=min(loans, books)
+    ), batch_size, report)
+
+    finish(db)
+    return ids
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--authors", type=int, default=10000)
+    parser.add_argument("--books", type=int, default=100000)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--loans", type=int, default=10000, help="Libros generados que quedan prestados")
+    parser.add_argument("--seed", type=int, default=42, help="Semilla del generador")
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--create-tables", action="store_true", help="Crea las tablas (p. ej. en SQLite, sin Alembic)")
+    args = parser.parse_args()
+
+    if args.create_tables:
+        Base.metadata.create_all(bind=engine)
+    start = time.perf_counter()
+
+    def report(table: str, done: int) -> None:
+        print(f"\r{table:<8} {done:>12,} filas  {time.perf_counter() - start:8.1f}s", end="", flush=True)
+
+    db = SessionLocal()
+    try:
+        ids = seed(
+            db, authors=args.authors, books=args.books, users=args.users, loans=args.loans,
+            seed=args.seed, batch_size=args.batch_size, report=report
+        )
+    finally:
+        db.close()
+    print()
+    for table, inserted in ids.items():
+        print(f"{table:<8} IDs {inserted.start}-{inserted.stop - 1}" if inserted else f"{table:<8} sin filas")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Mide el tiempo de arranque de la aplicación con `python -X importtime`, en
+procesos nuevos, para seguirlo entre versiones:
+
+- import: `import app.main` (sin crear la aplicación).
+- create_app: `import app.main` + `create_app()`, lo que hace uvicorn al
+  iniciar un worker (sin el lifespan, que abre las conexiones).
+- cli: `import app.cli`, el arranque de la CLI y del worker de trabajos.
+
+Para cada escenario informa la mediana del tiempo total, el tiempo de
+importación por paquete (fastapi, sqlalchemy, pydantic, app, ...) y los
+módulos más lentos.
+
+    python -m benchmarks.importtime --repeat 7 --save importtime.json
+    python -m benchmarks.importtime --baseline importtime.json --tolerance 0.15
+
+Con `--baseline` el proceso termina con código 1 si la mediana de algún
+escenario empeora más que la tolerancia. La configuración se toma del
+entorno, como al iniciar la API.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# Código de cada escenario; imprime los segundos transcurridos
+SCENARIOS = {
+    "import": "import app.main",
+    "create_app": "import app.main; app.main.create_app()",
+    "cli": "import app.cli",
+}
+TIMER = "import time as _t; _s = _t.perf_counter(); {code}; print(_t.perf_counter() - _s)"
+
+@dataclass
+class ImportRecord:
+    """Una línea del informe de `-X importtime` (microsegundos)"""
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+    @property
+    def package(self) -> str:
+        return self.name.split(".", 1)[0]
+
+def parse_importtime(report: str) -> List[ImportRecord]:
+    """Interpreta el informe que `-X importtime` escribe en stderr"""
+    records = []
+    for line in report.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        records.append(ImportRecord(name.strip(), int(self_us), int(cumulative_us), depth))
+    return records
+
+def by_package(records: List[ImportRecord]) -> Dict[str, float]:
+    """Milisegundos de importación propios de cada paquete de primer nivel"""
+    totals: Dict[str, float] = defaultdict(float)
+    for record in records:
+        totals[record.package] += record.self_us / 1000
+    return dict(totals)
+
+def run_scenario(code: str) -> tuple:
+    """Ejecuta el escenario en un proceso nuevo; retorna (segundos, registros)"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", TIMER.format(code=code)],
+        capture_output=True, text=True, env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"El escenario falló:\n{completed.stderr[-2000:]}")
+    return float(completed.stdout.strip().splitlines()[-1]), parse_importtime(completed.stderr)
+
+def measure(name: str, code: str, repeat: int, top: int) -> Dict[str, object]:
+    """
+    Mediana de `repeat` ejecuciones. Una primera ejecución descartada
+    compila los .pyc y calienta la caché del sistema de archivos.
+    """
+    run_scenario(code)
+    runs = [run_scenario(code) for _ in range(repeat)]
+    seconds = [elapsed for elapsed, _ in runs]
+    median_index = seconds.index(sorted(seconds)[len(seconds) // 2])
+    records = runs[median_index][1]
+    packages = sorted(by_package(records).items(), key=lambda item: -item[1])
+    slowest = sorted(records, key=lambda r: -r.self_us)[:top]
+    return {
+        "name": name,
+        "median_ms": round(statistics.median(seconds) * 1000, 1),
+        "min_ms": round(min(seconds) * 1000, 1),
+        "modules": len(records),
+        "packages_ms": {package: round(ms, 1) for package, ms in packages},
+        "slowest_ms": {record.name: round(record.self_us / 1000, 1) for record in slowest},
+    }
+
+def print_report(results: List[Dict[str, object]], top: int) -> None:
+    print(f"{'escenario':<14}{'mediana ms':>12}{'mín ms':>10}{'módulos':>10}")
+    for result in results:
+        print(f"{result['name']:<14}{result['median_ms']:>12}{result['min_ms']:>10}{result['modules']:>10}")
+    for result in results:
+        print(f"\n{result['name']}: paquetes (ms propios)")
+        for package, ms in list(result["packages_ms"].items())[:top]:
+            print(f"  {package:<40}{ms:>10}")
+        print(f"{result['name']}: módulos más lentos (ms propios)")
+        for module, ms in result["slowest_ms"].items():
+            print(f"  {module:<40}{ms:>10}")
+
+def compare(results: List[Dict[str, object]], baseline: Dict[str, Dict[str, object]], tolerance: float) -> List[str]:
+    """Una línea por escenario cuya mediana supera la de la línea base en más de `tolerance`"""
+    regressions = []
+    for result in results:
+        base = baseline.get(result["name"])
+        if base is not None and result["median_ms"] > base["median_ms"] * (1 + tolerance):
+            regressions.append(f"{result['name']}: {base['median_ms']} ms -> {result['median_ms']} ms")
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Tiempo de importación y arranque de la aplicación")
+    parser.add_argument("--scenario", choices=SCENARIOS, action="append", help="Escenarios a medir (por defecto todos)")
+    parser.add_argument("--repeat", type=int, default=5, help="Procesos por escenario")
+    parser.add_argument("--top", type=int, default=10, help="Paquetes y módulos listados")
+    parser.add_argument("--save", help="Guarda el informe en JSON")
+    parser.add_argument("--baseline", help="Informe JSON con el que comparar")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Empeoramiento admitido (0.1 = 10 %%)")
+    args = parser.parse_args(argv)
+
+    results = [measure(name, SCENARIOS[name], args.repeat, args.top) for name in args.scenario or SCENARIOS]
+    print_report(results, args.top)
+    if args.save:
+        report = {
+            "meta": {"date": datetime.now().isoformat(timespec="seconds"), "python": platform.python_version()},
+            "results": {result["name"]: result for result in results},
+        }
+        with open(args.save, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, ensure_ascii=False, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            baseline = json.load(fh)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"Regresión: {line}")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional
+import httpx
+
+@dataclass
+class LoadResult:
+    """Resultado de una carrera de carga"""
+    name: str
+    requests: int = 0
+    errors: int = 0
+    duration: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.duration if self.duration else 0.0
+
+    def percentile(self, p: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "rps": round(self.throughput, 1),
+            "mean_ms": round(statistics.fmean(self.latencies) * 1000, 2) if self.latencies else 0.0,
+            "p50_ms": round(self.percentile(50) * 1000, 2),
+            "p95_ms": round(self.percentile(95) * 1000, 2),
+            "p99_ms": round(self.percentile(99) * 1000, 2),
+        }
+
+RequestFn = Callable[[httpx.AsyncClient], Awaitable[httpx.Response]]
+
+async def run_load(
+    name: str,
+    client: httpx.AsyncClient,
+    request: RequestFn,
+    *,
+    concurrency: int,
+    duration: float
+) -> LoadResult:
+    """Lanza `concurrency` clientes que repiten `request` durante `duration` segundos"""
+    result = LoadResult(name=name)
+    deadline = time.perf_counter() + duration
+
+    async def worker() -> None:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                response = await request(client)
+                ok = response.status_code < 500
+            except httpx.HTTPError:
+                ok = False
+            result.latencies.append(time.perf_counter() - start)
+            result.requests += 1
+            if not ok:
+                result.errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.duration = time.perf_counter() - start
+    return result
+
+@contextmanager
+def uvicorn_server(port: int, env: Optional[Dict[str, str]] = None, workers: int = 1) -> Iterator[str]:
+    """Levanta la API con uvicorn en un subproceso y retorna su URL base"""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app",
+         "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        env={**os.environ, **(env or {})}
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(base_url + "/", timeout=0.5)
+                break
+            except httpx.HTTPError:
+                time.sleep(0.1)
+        else:
+            raise RuntimeError("El servidor no respondió a tiempo")
+        yield base_url
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+def print_table(results: List[LoadResult]) -> None:
+    """Imprime los resultados como una tabla"""
+    columns = ["requests", "errors", "rps", "mean_ms", "p50_ms", "p95_ms", "p99_ms"]
+    print(f"{'escenario':<24}" + "".join(f"{c:>10}" for c in columns))
+    for result in results:
+        row = result.summary()
+        print(f"{result.name:<24}" + "".join(f"{row[c]:>10}" for c in columns))
+
+# Subida de la tasa de errores (en puntos) que se considera una regresión
+ERROR_RATE_MARGIN = 0.01
+
+def save_results(path: str, results: List[LoadResult], meta: Optional[Dict[str, Any]] = None) -> None:
+    """Guarda el resumen de cada escenario en JSON, para compararlo más adelante"""
+    report = {
+        "meta": meta or {},
+        "results": {result.name: result.summary() for result in results},
+    }
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, ensure_ascii=False, indent=2)
+
+def load_results(path: str) -> Dict[str, Dict[str, float]]:
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)["results"]
+
+def compare_results(
+    results: List[LoadResult],
+    baseline: Dict[str, Dict[str, float]],
+    tolerance: float = 0.1
+) -> List[str]:
+    """
+    Compara los resultados con una línea base guardada. Retorna una línea por
+    regresión: caída de peticiones por segundo o subida del p95 mayores que
+    `tolerance` (fracción, 0.1 = 10 %), o más errores que la línea base.
+    """
+    regressions = []
+    for result in results:
+        base = baseline.get(result.name)
+        if base is None:
+            continue
+        current = result.summary()
+        if current["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(f"{result.name}: rps {base['rps']} -> {current['rps']}")
+        if current["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{result.name}: p95 {base['p95_ms']} ms -> {current['p95_ms']} ms")
+        base_rate = base["errors"] / base["requests"] if base["requests"] else 0.0
+        rate = current["errors"] / current["requests"] if current["requests"] else 0.0
+        if rate > base_rate + ERROR_RATE_MARGIN:
+            regressions.append(f"{result.name}: errores {base_rate:.2%} -> {rate:.2%}")
+    return regressions
+
+def print_comparison(results: List[LoadResult], baseline: Dict[str, Dict[str, float]]) -> None:
+    """Imprime la variación de rps y p95 respecto a la línea base"""
+    print(f"{'escenario':<24}{'rps base':>10}{'rps':>10}{'Δ rps':>9}{'p95 base':>10}{'p95':>10}{'Δ p95':>9}")
+    for result in results:
+        base = baseline.get(result.name)
+        if base is None:
+            continue
+        row = result.summary()
+        rps_delta = (row["rps"] / base["rps"] - 1) if base["rps"] else 0.0
+        p95_delta = (row["p95_ms"] / base["p95_ms"] - 1) if base["p95_ms"] else 0.0
+        print(
+            f"{result.name:<24}{base['rps']:>10}{row['rps']:>10}{rps_delta:>+9.1%}"
+            f"{base['p95_ms']:>10}{row['p95_ms']:>10}{p95_delta:>+9.1%}"
+        )
@@ -0,0 +1,50 @@
+"""
+Mide la latencia de `GET /books/` mientras otros clientes hacen login en
+ráfaga, con bcrypt en los workers de la API (HASH_WORKERS=0) y en el pool
+de procesos dedicado.
+
+    python -m benchmarks.login_load --logins 50 --browsers 20 --duration 15
+"""
+import argparse
+import asyncio
+import uuid
+import httpx
+from benchmarks.loadgen import print_table, run_load, uvicorn_server
+
+PASSWORD = "Benchmark123"
+
+async def measure(base_url: str, mode: str, logins: int, browsers: int, duration: float):
+    email = f"bench-{uuid.uuid4().hex[:8]}@example.com"
+    limits = httpx.Limits(max_connections=logins + browsers)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        await client.post("/api/v1/users/", json={"name": "Bench", "email": email, "password": PASSWORD})
+        credentials = {"email": email, "password": PASSWORD}
+        login, browse = await asyncio.gather(
+            run_load(f"{mode} login", client,
+                     lambda c: c.post("/api/v1/auth/login", json=credentials),
+                     concurrency=logins, duration=duration),
+            run_load(f"{mode} GET /books/", client,
+                     lambda c: c.get("/api/v1/books/?limit=20"),
+                     concurrency=browsers, duration=duration),
+        )
+    return [login, browse]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=50)
+    parser.add_argument("--browsers", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--hash-workers", type=int, default=2)
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    results = []
+    for mode, workers in (("inline", 0), ("pool", args.hash_workers)):
+        with uvicorn_server(args.port, env={"HASH_WORKERS": str(workers)}) as base_url:
+            results.extend(asyncio.run(
+                measure(base_url, mode, args.logins, args.browsers, args.duration)
+            ))
+    print_table(results)
+
+if __name__ == "__main__":
+    main()
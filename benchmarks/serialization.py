@@ -0,0 +1,122 @@
+"""
+Mide el coste por objeto de serializar las respuestas de `Book`, `Author` y
+`User` a partir de filas ORM, sin base de datos ni servidor:
+
+- fastapi: validación contra `response_model` + `jsonable_encoder` +
+  `json.dumps`, el camino por defecto de FastAPI.
+- adapter: `TypeAdapter` cacheado y orjson (`SerializedRoute`).
+- cached: solo el volcado de un esquema ya construido (acierto de la caché de
+  entidades).
+
+Para `Book` se mide además el camino anterior de `POST /books/`
+(`jsonable_encoder` de la fila, `model_validate` y de nuevo el camino por
+defecto) frente al adaptador, sobre filas recién creadas.
+
+    python -m benchmarks.serialization --objects 2000 --repeat 5
+"""
+import argparse
+import json
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+from fastapi.encoders import jsonable_encoder
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from app.core import serialization
+from app.models import Author, Book, User
+from app.schemas.author import Author as AuthorSchema
+from app.schemas.book import Book as BookSchema
+from app.schemas.user import User as UserSchema
+
+def build_rows(count: int) -> Dict[str, List[Any]]:
+    """Filas ORM transitorias con las relaciones de las respuestas ya cargadas"""
+    now = datetime(2024, 1, 1, 12, 0)
+    books, authors, users = [], [], []
+    for i in range(1, count + 1):
+        # Cada autor tiene tres libros y uno de ellos está prestado a un lector
+        author = Author(id=i, name=f"Autor {i}", birth_date=now, books=[])
+        user = User(id=i, name=f"Lector {i}", email=f"lector{i}@example.com", registration_date=now, borrowed_books=[])
+        for j in range(3):
+            book = Book(id=i * 3 + j, title=f"Libro {i}-{j}", publication_year=1990 + j, author_id=i)
+            book.author = author
+            if j == 0:
+                book.borrowed_by_id = user.id
+                book.borrowed_by = user
+            else:
+                book.borrowed_by = None
+            books.append(book)
+        authors.append(author)
+        users.append(user)
+    return {"Book": books[:count], "Author": authors, "User": users}
+
+def column_rows(rows: List[Any]) -> List[Any]:
+    """Copias con solo las columnas cargadas, como las retorna `create`"""
+    columns = Book.__table__.columns.keys()
+    return [Book(**{column: getattr(row, column) for column in columns}) for row in rows]
+
+def run_coroutine(coroutine: Any) -> Any:
+    """Ejecuta una corrutina que no llega a suspenderse, sin bucle de eventos"""
+    try:
+        coroutine.send(None)
+    except StopIteration as done:
+        return done.value
+    raise RuntimeError("la corrutina se suspendió")
+
+def fastapi_path(schema: Any) -> Callable[[Any], bytes]:
+    field = create_response_field(name="response", type_=schema)
+    def run(obj: Any) -> bytes:
+        content = run_coroutine(serialize_response(field=field, response_content=obj))
+        return json.dumps(content, ensure_ascii=False).encode()
+    return run
+
+def create_book_path(schema: Any) -> Callable[[Any], bytes]:
+    default = fastapi_path(schema)
+    def run(obj: Any) -> bytes:
+        return default(schema.model_validate(jsonable_encoder(obj)))
+    return run
+
+def adapter_path(schema: Any) -> Callable[[Any], bytes]:
+    return lambda obj: serialization.dumps(serialization.to_python(schema, obj))
+
+def cached_path(schema: Any) -> Callable[[Any], bytes]:
+    type_adapter = serialization.adapter(schema)
+    return lambda obj: serialization.dumps(type_adapter.dump_python(obj))
+
+def measure(run: Callable[[Any], bytes], objects: List[Any], repeat: int) -> float:
+    """Mejor tiempo por objeto, en microsegundos"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for obj in objects:
+            run(obj)
+        best = min(best, time.perf_counter() - start)
+    return best / len(objects) * 1e6
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--objects", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = build_rows(args.objects)
+    schemas = {"Book": BookSchema, "Author": AuthorSchema, "User": UserSchema}
+    print(f"{'esquema':<8} {'camino':<12} {'us/objeto':>10} {'speedup':>8}")
+    for name, schema in schemas.items():
+        objects = rows[name]
+        built = [serialization.adapter(schema).validate_python(obj, from_attributes=True) for obj in objects]
+        timings = {
+            "fastapi": measure(fastapi_path(schema), objects, args.repeat),
+            "adapter": measure(adapter_path(schema), objects, args.repeat),
+            "cached": measure(cached_path(schema), built, args.repeat),
+        }
+        for path, us in timings.items():
+            print(f"{name:<8} {path:<12} {us:>10.2f} {timings['fastapi'] / us:>7.1f}x")
+        if name == "Book":
+            created = column_rows(objects)
+            before = measure(create_book_path(schema), created, args.repeat)
+            after = measure(adapter_path(schema), created, args.repeat)
+            print(f"{'POST':<8} {'create_book':<12} {before:>10.2f} {1:>7.1f}x")
+            print(f"{'POST':<8} {'adapter':<12} {after:>10.2f} {before / after:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+Escenarios de carga sobre un conjunto de datos generado con
+`benchmarks.dataset`, con un informe de latencia y throughput que puede
+guardarse como línea base y compararse en ejecuciones posteriores.
+
+Escenarios:
+- browse: listados paginados y lecturas por ID de libros y autores.
+- search: búsqueda de libros con palabras del vocabulario del generador,
+  a veces con erratas.
+- borrow: tormenta de préstamos y devoluciones sobre un conjunto reducido
+  de libros, con muchos usuarios autenticados a la vez.
+- login: ráfaga de inicios de sesión (bcrypt).
+
+    python -m benchmarks.dataset --authors 100000 --books 1000000 --users 50000
+    python -m benchmarks.suite --duration 20 --save baseline.json
+    python -m benchmarks.suite --duration 20 --baseline baseline.json --tolerance 0.15
+
+Con `--baseline` el proceso termina con código 1 si algún escenario empeora
+más que la tolerancia. Sin `--url` levanta la API con uvicorn.
+"""
+import argparse
+import asyncio
+import platform
+import random
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+import httpx
+from benchmarks.dataset import PASSWORD, WORDS
+from benchmarks.loadgen import (
+    LoadResult, compare_results, load_results, print_comparison, print_table, run_load,
+    save_results, uvicorn_server,
+)
+
+API = "/api/v1"
+
+@dataclass
+class Context:
+    """Tamaño del conjunto de datos y sesiones disponibles para los escenarios"""
+    books: int
+    authors: int
+    user_ids: range
+    hot_books: int
+    rng: random.Random = field(default_factory=lambda: random.Random(7))
+    tokens: List[str] = field(default_factory=list)
+
+    def book_id(self) -> int:
+        return self.rng.randint(1, max(self.books, 1))
+
+    def author_id(self) -> int:
+        return self.rng.randint(1, max(self.authors, 1))
+
+    def auth(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.rng.choice(self.tokens)}"}
+
+async def total(client: httpx.AsyncClient, path: str) -> int:
+    response = await client.get(f"{API}{path}", params={"envelope": "true", "limit": 1, "count": "estimated"})
+    response.raise_for_status()
+    return response.json()["total"] or 0
+
+async def login(client: httpx.AsyncClient, user_id: int) -> httpx.Response:
+    return await client.post(f"{API}/auth/login", json={"email": f"bench{user_id}@example.com", "password": PASSWORD})
+
+async def browse(client: httpx.AsyncClient, ctx: Context) -> httpx.Response:
+    choice = ctx.rng.random()
+    if choice < 0.35:
+        return await client.get(f"{API}/books/{ctx.book_id()}")
+    if choice < 0.6:
+        skip = ctx.rng.randrange(min(ctx.books, 10000) or 1)
+        return await client.get(f"{API}/books/", params={"skip": skip, "limit": 20})
+    if choice < 0.85:
+        return await client.get(f"{API}/authors/{ctx.author_id()}")
+    return await client.get(f"{API}/authors/", params={"limit": 20})
+
+def misspell(rng: random.Random, word: str) -> str:
+    """Cambia una letra de la palabra, para ejercitar la tolerancia a erratas"""
+    position = rng.randrange(len(word))
+    return word[:position] + rng.choice("aeiourstn") + word[position + 1:]
+
+async def search(client: httpx.AsyncClient, ctx: Context) -> httpx.Response:
+    words = ctx.rng.sample(WORDS, ctx.rng.randint(1, 2))
+    if ctx.rng.random() < 0.2:
+        words[0] = misspell(ctx.rng, words[0])
+    return await client.get(f"{API}/books/search/", params={"title": " ".join(words), "limit": 20})
+
+async def borrow(client: httpx.AsyncClient, ctx: Context) -> httpx.Response:
+    # Pocos libros muy disputados: la mayoría de los préstamos compiten entre sí
+    book_id = ctx.rng.randint(1, max(min(ctx.hot_books, ctx.books), 1))
+    headers = ctx.auth()
+    response = await client.post(f"{API}/books/{book_id}/borrow", headers=headers)
+    if response.status_code == 200:
+        response = await client.post(f"{API}/books/{book_id}/return", headers=headers)
+    return response
+
+async def login_burst(client: httpx.AsyncClient, ctx: Context) -> httpx.Response:
+    return await login(client, ctx.rng.choice(ctx.user_ids))
+
+Scenario = Callable[[httpx.AsyncClient, Context], Awaitable[httpx.Response]]
+
+SCENARIOS: Dict[str, Scenario] = {
+    "browse": browse,
+    "search": search,
+    "borrow": borrow,
+    "login": login_burst,
+}
+
+async def prepare(client: httpx.AsyncClient, args: argparse.Namespace) -> Context:
+    ctx = Context(
+        books=await total(client, "/books/"),
+        authors=await total(client, "/authors/"),
+        user_ids=range(args.first_user_id, args.first_user_id + args.users),
+        hot_books=args.hot_books,
+    )
+    if "borrow" in args.scenarios:
+        for user_id in ctx.user_ids[:args.sessions]:
+            response = await login(client, user_id)
+            if response.status_code == 200:
+                ctx.tokens.append(response.json()["access_token"])
+        if not ctx.tokens:
+            raise SystemExit("No se pudo iniciar sesión con los usuarios generados (benchmarks.dataset)")
+    return ctx
+
+async def run_suite(base_url: str, args: argparse.Namespace) -> List[LoadResult]:
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        ctx = await prepare(client, args)
+        results = []
+        for name in args.scenarios:
+            scenario = SCENARIOS[name]
+            request = lambda c, scenario=scenario: scenario(c, ctx)
+            if args.warmup:
+                await run_load("warmup", client, request, concurrency=args.concurrency, duration=args.warmup)
+            results.append(await run_load(name, client, request, concurrency=args.concurrency, duration=args.duration))
+        return results
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        type=lambda value: [name for name in value.split(",") if name],
+                        help=f"Escenarios separados por comas ({', '.join(SCENARIOS)})")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--url", help="API ya levantada; por defecto se levanta con uvicorn")
+    parser.add_argument("--port", type=int, default=8767)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--users", type=int, default=1000, help="Usuarios generados disponibles (bench{id}@example.com)")
+    parser.add_argument("--first-user-id", type=int, default=1)
+    parser.add_argument("--sessions", type=int, default=50, help="Usuarios autenticados en el escenario borrow")
+    parser.add_argument("--hot-books", type=int, default=500, help="Libros que se disputan en el escenario borrow")
+    parser.add_argument("--save", help="Guarda los resultados en este JSON")
+    parser.add_argument("--baseline", help="JSON de una ejecución anterior con el que comparar")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Escenarios desconocidos: {', '.join(sorted(unknown))}")
+
+    if args.url:
+        results = asyncio.run(run_suite(args.url, args))
+    else:
+        with uvicorn_server(args.port, workers=args.workers) as base_url:
+            results = asyncio.run(run_suite(base_url, args))
+    print_table(results)
+
+    if args.save:
+        save_results(args.save, results, meta={
+            "date": datetime.utcnow().isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "workers": args.workers,
+        })
+    if args.baseline:
+        baseline = load_results(args.baseline)
+        print()
+        print_comparison(results, baseline)
+        regressions = compare_results(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESIÓN {line}")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import asyncio
+import os
+import subprocess
+import sys
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.core.database import database
+from app.main import create_app
+from benchmarks.importtime import parse_importtime
+
+def run_python(code: str) -> str:
+    completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=os.environ, check=True)
+    return completed.stdout.strip()
+
+class TestCreateApp:
+
+    def test_import_does_not_build_the_app(self):
+        # Sin endpoints, sin motores y sin los módulos de OpenAPI/CRUD
+        output = run_python(
+            "import sys, app.main\n"
+            "from app.core.database import database\n"
+            "loaded = [m for m in sys.modules if m.startswith(('app.api.v1.endpoints', 'app.crud'))]\n"
+            "print(database.started, loaded)"
+        )
+        assert output == "False []"
+
+    def test_lifespan_starts_and_disposes_the_database(self, tmp_path, monkeypatch):
+        asyncio.run(database.dispose())
+        monkeypatch.setattr(settings, "POSTGRES_URL", f"sqlite:///{tmp_path / 'app.db'}")
+        monkeypatch.setattr(settings, "DB_ASYNC", False)
+        app = create_app()
+        assert not database.started
+
+        with TestClient(app) as client:
+            assert database.started
+            assert database.engine.url.database.endswith("app.db")
+            assert client.get("/").json()["version"] == settings.VERSION
+
+        assert not database.started
+
+    def test_default_app_is_created_once(self):
+        import app.main
+        assert app.main.app is app.main.app
+
+class TestParseImporttime:
+
+    def test_records(self):
+        report = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   _io\n"
+            "import time:        30 |         30 |     app.core\n"
+            "import time:       500 |        650 | app\n"
+        )
+        records = parse_importtime(report)
+        assert [(r.name, r.self_us, r.cumulative_us, r.depth) for r in records] == [
+            ("_io", 120, 120, 1), ("app.core", 30, 30, 2), ("app", 500, 650, 0)
+        ]
+        assert records[1].package == "app"
@@ -2,11 +2,17 @@ import pytest
 from fastapi import HTTPException
 from datetime import datetime, timedelta
 from unittest.mock import Mock, patch, PropertyMock
-from app.api.v1.endpoints.authors import create_author, read_author, read_authors, update_author, delete_author
+import io
+from fastapi import UploadFile
+from app.api.v1.endpoints.authors import create_author, read_author, read_authors, update_author, delete_author, import_authors
+from app.schemas.bulk import BulkImportResult
 from app.schemas.author import AuthorCreate, AuthorUpdate
 from app.crud.author import author
 
 class MockAuthor:
+    __tablename__ = "authors"
+    updated_at = None
+
     def __init__(self, **kwargs):
         for key, value in kwargs.items():
             setattr(self, key, value)
@@ -154,4 +160,20 @@ class TestAuthorEndpoints:
                 )
             
             assert exc_info.value.status_code == 400
-            assert "tiene libros asociados" in str(exc_info.value.detail)
\ No newline at end of file
+            assert "tiene libros asociados" in str(exc_info.value.detail)
+
+    def test_import_authors_infers_format(self, mock_db, mock_current_user):
+        upload = UploadFile(file=io.BytesIO("name\nBorges\n".encode()), filename="autores.csv")
+        with patch('app.services.bulk_import.import_authors') as mock_import:
+            mock_import.return_value = BulkImportResult(total=1, inserted=1)
+            result = import_authors(db=mock_db, file=upload, current_user=mock_current_user)
+            assert result.inserted == 1
+            args, kwargs = mock_import.call_args
+            assert args[2] == "csv"
+            assert kwargs == {"batch_size": 1000}
+
+    def test_import_authors_unknown_format(self, mock_db, mock_current_user):
+        upload = UploadFile(file=io.BytesIO(b""), filename="autores.xml")
+        with pytest.raises(HTTPException) as exc:
+            import_authors(db=mock_db, file=upload, format="xml", current_user=mock_current_user)
+        assert exc.value.status_code == 400
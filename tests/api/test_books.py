@@ -2,18 +2,26 @@ import pytest
 from fastapi import HTTPException
 from datetime import datetime
 from unittest.mock import Mock, patch
+from sqlalchemy.exc import IntegrityError
 from app.api.v1.endpoints.books import (
     create_book, read_book, read_books, update_book, delete_book,
-    search_books, borrow_book, return_book
+    search_books, borrow_book, return_book, export_books
 )
 from app.schemas.book import BookCreate, BookUpdate
 
 class MockBook:
+    __tablename__ = "books"
+    updated_at = None
+
     def __init__(self, **kwargs):
         for key, value in kwargs.items():
             setattr(self, key, value)
 
 class MockAuthor:
+    __tablename__ = "authors"
+    updated_at = None
+    books = []
+
     def __init__(self, **kwargs):
         for key, value in kwargs.items():
             setattr(self, key, value)
@@ -156,8 +164,10 @@ class TestBookEndpoints:
                 mock_remove.assert_called_once_with(mock_db, id=1)
 
     def test_search_books(self, mock_db):
-        with patch('app.crud.book.book.search_books') as mock_search:
+        with patch('app.crud.book.book.search_books') as mock_search, \
+             patch('app.crud.author.author.get') as mock_get_author:
             mock_search.return_value = [MockBook(**mock_book_data)]
+            mock_get_author.return_value = MockAuthor(**mock_author_data)
             
             response = search_books(
                 db=mock_db,
@@ -172,36 +182,65 @@ class TestBookEndpoints:
                 mock_db,
                 title="Test",
                 author_id=1,
-                publication_year=2023
+                publication_year=2023,
+                skip=0,
+                limit=100
             )
 
     def test_borrow_book_success(self, mock_db, mock_current_user):
-        available_book = MockBook(**mock_book_data)
         borrowed_book = MockBook(**{**mock_book_data, "borrowed_by_id": 1})
         
-        with patch('app.crud.book.book.get') as mock_get:
-            mock_get.return_value = available_book
+        with patch('app.crud.book.book.borrow_book') as mock_borrow:
+            mock_borrow.return_value = borrowed_book
             
-            with patch('app.crud.user.user.get') as mock_get_user:
-                mock_get_user.return_value = Mock(id=1)
+            response = borrow_book(
+                db=mock_db,
+                book_id=1,
+                current_user=mock_current_user
+            )
+            
+            assert response.borrowed_by_id == 1
+            mock_borrow.assert_called_once_with(mock_db, book_id=1, user_id=1)
+
+    def test_borrow_book_already_borrowed(self, mock_db, mock_current_user):
+        borrowed_book = MockBook(**{**mock_book_data, "borrowed_by_id": 2})
+        
+        with patch('app.crud.book.book.borrow_book') as mock_borrow:
+            mock_borrow.return_value = None
+            
+            with patch('app.crud.book.book.get') as mock_get:
+                mock_get.return_value = borrowed_book
                 
-                with patch('app.crud.book.book.borrow_book') as mock_borrow:
-                    mock_borrow.return_value = borrowed_book
-                    
-                    response = borrow_book(
+                with pytest.raises(HTTPException) as exc_info:
+                    borrow_book(
                         db=mock_db,
                         book_id=1,
                         current_user=mock_current_user
                     )
-                    
-                    assert response.borrowed_by_id == 1
-                    mock_borrow.assert_called_once_with(mock_db, book_id=1, user_id=1)
+                
+                assert exc_info.value.status_code == 400
+                assert "libro ya está prestado" in str(exc_info.value.detail)
 
-    def test_borrow_book_already_borrowed(self, mock_db, mock_current_user):
-        borrowed_book = MockBook(**{**mock_book_data, "borrowed_by_id": 2})
-        
-        with patch('app.crud.book.book.get') as mock_get:
-            mock_get.return_value = borrowed_book
+    def test_borrow_book_not_found(self, mock_db, mock_current_user):
+        with patch('app.crud.book.book.borrow_book') as mock_borrow:
+            mock_borrow.return_value = None
+            
+            with patch('app.crud.book.book.get') as mock_get:
+                mock_get.return_value = None
+                
+                with pytest.raises(HTTPException) as exc_info:
+                    borrow_book(
+                        db=mock_db,
+                        book_id=999,
+                        current_user=mock_current_user
+                    )
+                
+                assert exc_info.value.status_code == 404
+                assert "Libro no encontrado" in str(exc_info.value.detail)
+
+    def test_borrow_book_user_not_found(self, mock_db, mock_current_user):
+        with patch('app.crud.book.book.borrow_book') as mock_borrow:
+            mock_borrow.side_effect = IntegrityError("UPDATE books", {}, Exception("fk"))
             
             with pytest.raises(HTTPException) as exc_info:
                 borrow_book(
@@ -210,56 +249,103 @@ class TestBookEndpoints:
                     current_user=mock_current_user
                 )
             
-            assert exc_info.value.status_code == 400
-            assert "libro ya está prestado" in str(exc_info.value.detail)
+            assert exc_info.value.status_code == 404
+            assert "Usuario no encontrado" in str(exc_info.value.detail)
+            mock_db.rollback.assert_called_once()
 
     def test_return_book_success(self, mock_db, mock_current_user):
-        borrowed_book = MockBook(**{**mock_book_data, "borrowed_by_id": 1})
         returned_book = MockBook(**{**mock_book_data, "borrowed_by_id": None})
         
-        with patch('app.crud.book.book.get') as mock_get:
-            mock_get.return_value = borrowed_book
+        with patch('app.crud.book.book.return_book') as mock_return:
+            mock_return.return_value = returned_book
             
-            with patch('app.crud.book.book.return_book') as mock_return:
-                mock_return.return_value = returned_book
-                
-                response = return_book(
-                    db=mock_db,
-                    book_id=1,
-                    current_user=mock_current_user
-                )
-                
-                assert response.borrowed_by_id is None
-                mock_return.assert_called_once_with(mock_db, book_id=1)
+            response = return_book(
+                db=mock_db,
+                book_id=1,
+                current_user=mock_current_user
+            )
+            
+            assert response.borrowed_by_id is None
+            mock_return.assert_called_once_with(mock_db, book_id=1, user_id=1)
 
     def test_return_book_not_borrowed(self, mock_db, mock_current_user):
         not_borrowed_book = MockBook(**{**mock_book_data, "borrowed_by_id": None})
         
-        with patch('app.crud.book.book.get') as mock_get:
-            mock_get.return_value = not_borrowed_book
+        with patch('app.crud.book.book.return_book') as mock_return:
+            mock_return.return_value = None
             
-            with pytest.raises(HTTPException) as exc_info:
-                return_book(
-                    db=mock_db,
-                    book_id=1,
-                    current_user=mock_current_user
-                )
-            
-            assert exc_info.value.status_code == 400
-            assert "El libro no está prestado" in str(exc_info.value.detail)
+            with patch('app.crud.book.book.get') as mock_get:
+                mock_get.return_value = not_borrowed_book
+                
+                with pytest.raises(HTTPException) as exc_info:
+                    return_book(
+                        db=mock_db,
+                        book_id=1,
+                        current_user=mock_current_user
+                    )
+                
+                assert exc_info.value.status_code == 400
+                assert "El libro no está prestado" in str(exc_info.value.detail)
 
     def test_return_book_wrong_user(self, mock_db, mock_current_user):
         borrowed_by_other = MockBook(**{**mock_book_data, "borrowed_by_id": 2})
         
-        with patch('app.crud.book.book.get') as mock_get:
-            mock_get.return_value = borrowed_by_other
+        with patch('app.crud.book.book.return_book') as mock_return:
+            mock_return.return_value = None
             
-            with pytest.raises(HTTPException) as exc_info:
-                return_book(
-                    db=mock_db,
-                    book_id=1,
-                    current_user=mock_current_user
-                )
+            with patch('app.crud.book.book.get') as mock_get:
+                mock_get.return_value = borrowed_by_other
+                
+                with pytest.raises(HTTPException) as exc_info:
+                    return_book(
+                        db=mock_db,
+                        book_id=1,
+                        current_user=mock_current_user
+                    )
+                
+                assert exc_info.value.status_code == 403
+                assert "No puedes devolver un libro que no te prestaron" in str(exc_info.value.detail)
+
+    def test_read_books_with_cursor(self, mock_db):
+        mock_books = [MockBook(**mock_book_data)]
+        
+        with patch('app.crud.book.book.get_multi_by_cursor') as mock_get_multi:
+            mock_get_multi.return_value = (mock_books, "next")
+            response = Mock(headers={})
+            
+            result = read_books(
+                db=mock_db,
+                limit=1,
+                cursor="current",
+                order_by="title",
+                response=response
+            )
             
-            assert exc_info.value.status_code == 403
-            assert "No puedes devolver un libro que no te prestaron" in str(exc_info.value.detail)
\ No newline at end of file
+            assert len(result) == 1
+            assert response.headers["X-Next-Cursor"] == "next"
+            mock_get_multi.assert_called_once_with(
+                mock_db, cursor="current", limit=1, order_by="title"
+            )
+
+    def test_read_books_invalid_cursor(self, mock_db):
+        with pytest.raises(HTTPException) as exc_info:
+            read_books(db=mock_db, cursor="invalid", order_by="unknown")
+        
+        assert exc_info.value.status_code == 400
+
+    def test_export_books_streams_rows(self, mock_db):
+        rows = [(1, "Libro", 2000, 1, None, datetime(2024, 1, 1), datetime(2024, 1, 1))]
+
+        with patch('app.crud.book.book.stream_rows') as mock_stream:
+            mock_stream.return_value = iter(rows)
+            response = export_books(db=mock_db, format="csv")
+
+            assert response.media_type.startswith("text/csv")
+            assert response.headers["content-disposition"] == 'attachment; filename="books.csv"'
+            mock_stream.assert_called_once_with(mock_db)
+
+    def test_export_books_invalid_format(self, mock_db):
+        with pytest.raises(HTTPException) as exc_info:
+            export_books(db=mock_db, format="xml")
+
+        assert exc_info.value.status_code == 400
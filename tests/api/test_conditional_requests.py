@@ -0,0 +1,82 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+from app.api.dependencies import get_db, get_read_db
+from app.crud.book import book
+from app.main import app
+from app.models import Author, Book
+from app.schemas.book import BookCreate
+
+@pytest.fixture
+def client(db_engine):
+    factory = sessionmaker(bind=db_engine)
+    seed = factory()
+    author = Author(name="Borges")
+    seed.add(author)
+    seed.flush()
+    seed.add_all([Book(title="Ficciones", author_id=author.id), Book(title="El Aleph", author_id=author.id)])
+    seed.commit()
+    seed.close()
+
+    def override_get_db():
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    yield TestClient(app), factory
+    app.dependency_overrides.clear()
+
+class TestConditionalRequests:
+
+    def test_read_book_not_modified(self, client):
+        client, _ = client
+        first = client.get("/api/v1/books/1")
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+
+        second = client.get("/api/v1/books/1", headers={"If-None-Match": etag})
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["etag"] == etag
+
+        since = client.get("/api/v1/books/1", headers={"If-Modified-Since": first.headers["last-modified"]})
+        assert since.status_code == 304
+
+    def test_related_change_invalidates_book(self, client):
+        client, factory = client
+        etag = client.get("/api/v1/books/1").headers["etag"]
+        db = factory()
+        book.create(db, obj_in=BookCreate(title="Otro libro", author_id=1))
+        db.close()
+
+        response = client.get("/api/v1/books/1", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+    def test_book_change_invalidates_author(self, client):
+        client, factory = client
+        etag = client.get("/api/v1/authors/1").headers["etag"]
+        db = factory()
+        book.update(db, db_obj=book.get(db, id=2), obj_in={"title": "El Aleph (2a ed.)"})
+        db.close()
+
+        assert client.get("/api/v1/authors/1", headers={"If-None-Match": etag}).status_code == 200
+
+    def test_list_validators_depend_on_page(self, client):
+        client, _ = client
+        page = client.get("/api/v1/books/?limit=1")
+        other = client.get("/api/v1/books/?limit=2")
+        assert page.headers["etag"] != other.headers["etag"]
+
+        again = client.get("/api/v1/books/?limit=1", headers={"If-None-Match": page.headers["etag"]})
+        assert again.status_code == 304
+
+    def test_missing_book(self, client):
+        client, _ = client
+        response = client.get("/api/v1/books/99")
+        assert response.status_code == 404
+        assert "etag" not in response.headers
@@ -0,0 +1,145 @@
+import pytest
+from contextlib import contextmanager
+from typing import List
+from datetime import datetime
+from fastapi import Response
+from pydantic import TypeAdapter
+from sqlalchemy import event
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import sessionmaker
+from app.api.v1.endpoints.authors import read_author, read_authors
+from app.api.v1.endpoints.books import read_book, read_books, search_books
+from app.api.v1.endpoints.users import read_user, read_users
+from app.models import Author, Book, User
+from app.schemas import Author as AuthorSchema, Book as BookSchema, User as UserSchema
+
+@contextmanager
+def count_queries(engine):
+    statements = []
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+@pytest.fixture
+def session(db_engine):
+    seed = sessionmaker(bind=db_engine)()
+    users = [
+        User(name=f"User {i}", email=f"user{i}@example.com", hashed_password="x",
+             registration_date=datetime(2024, 1, 1))
+        for i in range(10)
+    ]
+    authors = [Author(name=f"Author {i}") for i in range(10)]
+    seed.add_all(users + authors)
+    seed.flush()
+    for i in range(50):
+        seed.add(Book(
+            title=f"Libro {i}",
+            author_id=authors[i % 10].id,
+            borrowed_by_id=users[i % 10].id if i % 2 else None
+        ))
+    seed.commit()
+    seed.close()
+    # Sesión nueva para que el identity map no oculte cargas perezosas
+    session = sessionmaker(bind=db_engine)()
+    yield session
+    session.close()
+
+def serialize(schema, value):
+    """Serializa igual que FastAPI con el response_model del endpoint"""
+    return TypeAdapter(schema).dump_json(TypeAdapter(schema).validate_python(value))
+
+class TestQueryCounts:
+
+    @pytest.mark.parametrize("limit", [5, 50])
+    def test_read_books(self, db_engine, session, limit):
+        with count_queries(db_engine) as statements:
+            serialize(List[BookSchema], read_books(db=session, skip=0, limit=limit))
+        
+        # libros, autores, libros de los autores, usuarios, libros de los usuarios
+        assert len(statements) == 5
+
+    def test_search_books(self, db_engine, session):
+        with count_queries(db_engine) as statements:
+            serialize(List[BookSchema], search_books(db=session, title="libro"))
+        
+        assert len(statements) == 5
+
+    def test_read_book(self, db_engine, session):
+        with count_queries(db_engine) as statements:
+            serialize(BookSchema, read_book(db=session, book_id=2))
+        
+        assert len(statements) == 5
+
+    @pytest.mark.parametrize("limit", [2, 10])
+    def test_read_authors(self, db_engine, session, limit):
+        with count_queries(db_engine) as statements:
+            serialize(List[AuthorSchema], read_authors(db=session, skip=0, limit=limit))
+        
+        assert len(statements) == 2
+
+    def test_read_author(self, db_engine, session):
+        with count_queries(db_engine) as statements:
+            serialize(AuthorSchema, read_author(db=session, author_id=1))
+        
+        assert len(statements) == 2
+
+    @pytest.mark.parametrize("limit", [2, 10])
+    def test_read_users(self, db_engine, session, limit):
+        with count_queries(db_engine) as statements:
+            serialize(List[UserSchema], read_users(
+                db=session, skip=0, limit=limit, current_user={"user_id": 1}
+            ))
+        
+        assert len(statements) == 2
+
+    def test_read_user(self, db_engine, session):
+        with count_queries(db_engine) as statements:
+            serialize(UserSchema, read_user(db=session, user_id=1, current_user={"user_id": 1}))
+        
+        assert len(statements) == 2
+
+    def test_read_books_by_cursor(self, db_engine, session):
+        with count_queries(db_engine) as statements:
+            serialize(List[BookSchema], read_books(
+                db=session, limit=10, cursor=None, order_by="title"
+            ))
+        
+        assert len(statements) == 5
+
+    def test_read_books_envelope(self, db_engine, session):
+        with count_queries(db_engine) as statements:
+            page = read_books(db=session, skip=0, limit=10, envelope=True, count="exact")
+            serialize(List[BookSchema], page["items"])
+
+        # El total sale de una función de ventana en la consulta de la página
+        assert page["total"] == 50
+        assert len(statements) == 5
+
+    def test_read_books_by_ids(self, db_engine, session):
+        response = Response()
+        with count_queries(db_engine) as statements:
+            books = read_books(db=session, ids="7,3,999,12", response=response)
+            serialize(List[BookSchema], books)
+
+        assert [b.id for b in books] == [7, 3, 12]
+        assert response.headers["X-Missing-Ids"] == "999"
+        assert len(statements) == 5
+
+    def test_nested_rows_load_only_serialized_columns(self, db_engine, session):
+        with count_queries(db_engine) as statements:
+            books = read_books(db=session, skip=0, limit=5)
+            serialize(List[BookSchema], books)
+
+        # Los libros anidados, sus autores y prestatarios no leen más columnas
+        # que las del esquema (ni created_at ni hashed_password)
+        nested = statements[1:]
+        assert all("created_at" not in statement for statement in nested)
+        assert all("hashed_password" not in statement for statement in nested)
+        page_ids = {book.id for book in books}
+        nested_book = next(b for b in books[0].author.books if b.id not in page_ids)
+        with pytest.raises(InvalidRequestError):
+            nested_book.borrowed_by
@@ -0,0 +1,66 @@
+from typing import List
+from fastapi import APIRouter, FastAPI, Response
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+from app.api.routing import SerializedRoute
+from app.core import serialization
+from app.schemas.author import Author, AuthorInDBBase
+
+router = APIRouter(route_class=SerializedRoute)
+AUTHOR = {"id": 1, "name": "Borges", "birth_date": "1899-08-24T00:00:00", "books": [], "extra": "x"}
+
+@router.get("/authors", response_model=List[Author])
+def list_authors(response: Response):
+    response.headers["X-Next-Cursor"] = "abc"
+    return [AUTHOR]
+
+@router.get("/authors/{author_id}", response_model=Author)
+async def read_author(author_id: int, response: Response):
+    if author_id == 2:
+        return Response(status_code=304)
+    response.status_code = 202
+    return AUTHOR
+
+@router.get("/authors/{author_id}/name", response_model=Author)
+def read_author_name(author_id: int):
+    return serialization.Projection(List[AuthorInDBBase], [AUTHOR])
+
+@router.get("/plain")
+def plain():
+    return {"ok": True}
+
+app = FastAPI()
+app.include_router(router)
+client = TestClient(app)
+
+class TestSerializedRoute:
+
+    def test_validates_once_and_keeps_headers(self):
+        with patch.object(serialization, "to_python", wraps=serialization.to_python) as to_python:
+            response = client.get("/authors")
+
+        to_python.assert_called_once()
+        assert response.json() == [{key: value for key, value in AUTHOR.items() if key != "extra"}]
+        assert response.headers["x-next-cursor"] == "abc"
+        assert response.headers["content-type"] == "application/json"
+
+    def test_async_endpoint_and_status_code(self):
+        response = client.get("/authors/1")
+        assert response.status_code == 202
+        assert response.json()["name"] == "Borges"
+
+    def test_responses_pass_through(self):
+        response = client.get("/authors/2")
+        assert response.status_code == 304
+        assert response.content == b""
+
+    def test_without_response_model(self):
+        assert client.get("/plain").json() == {"ok": True}
+
+    def test_openapi_keeps_response_model(self):
+        schema = client.get("/openapi.json").json()
+        assert "Author" in schema["components"]["schemas"]
+
+    def test_projection_uses_its_own_schema(self):
+        response = client.get("/authors/1/name")
+        assert response.json() == [{"id": 1, "name": "Borges", "birth_date": "1899-08-24T00:00:00"}]
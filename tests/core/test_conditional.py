@@ -0,0 +1,65 @@
+from datetime import datetime, timezone
+from unittest.mock import Mock
+from app.core import conditional
+
+VERSION = (datetime(2024, 5, 1, 10, 30, 15, 500000), 3)
+
+def make_request(headers=None, method="GET"):
+    return Mock(method=method, headers={k.lower(): v for k, v in (headers or {}).items()})
+
+class TestValidators:
+
+    def test_etag_is_strong_and_stable(self):
+        etag, last_modified = conditional.validators(VERSION)
+        assert etag.startswith('"') and etag.endswith('"')
+        assert etag == conditional.validators(VERSION)[0]
+        assert last_modified == datetime(2024, 5, 1, 10, 30, 15, 500000, tzinfo=timezone.utc)
+
+    def test_etag_changes_with_version_and_extra(self):
+        etag = conditional.validators(VERSION)[0]
+        assert conditional.validators((VERSION[0], 4))[0] != etag
+        assert conditional.validators(VERSION, "skip=10")[0] != etag
+
+    def test_without_timestamps(self):
+        assert conditional.validators((None, 0))[1] is None
+
+class TestIsNotModified:
+
+    def test_if_none_match(self):
+        etag, last_modified = conditional.validators(VERSION)
+        assert conditional.is_not_modified({"if-none-match": etag}, etag, last_modified)
+        assert conditional.is_not_modified({"if-none-match": f'"otro", W/{etag}'}, etag, last_modified)
+        assert conditional.is_not_modified({"if-none-match": "*"}, etag, last_modified)
+        assert not conditional.is_not_modified({"if-none-match": '"otro"'}, etag, last_modified)
+
+    def test_if_modified_since(self):
+        etag, last_modified = conditional.validators(VERSION)
+        same_second = {"if-modified-since": "Wed, 01 May 2024 10:30:15 GMT"}
+        before = {"if-modified-since": "Wed, 01 May 2024 10:30:14 GMT"}
+        assert conditional.is_not_modified(same_second, etag, last_modified)
+        assert not conditional.is_not_modified(before, etag, last_modified)
+        assert not conditional.is_not_modified({"if-modified-since": "ayer"}, etag, last_modified)
+
+    def test_if_none_match_takes_precedence(self):
+        etag, last_modified = conditional.validators(VERSION)
+        headers = {"if-none-match": '"otro"', "if-modified-since": "Wed, 01 May 2030 00:00:00 GMT"}
+        assert not conditional.is_not_modified(headers, etag, last_modified)
+
+class TestCheck:
+
+    def test_sets_headers(self):
+        response = Mock(headers={})
+        assert conditional.check(make_request(), response, VERSION) is None
+        assert response.headers["ETag"] == conditional.validators(VERSION)[0]
+        assert response.headers["Last-Modified"] == "Wed, 01 May 2024 10:30:15 GMT"
+
+    def test_returns_304(self):
+        etag = conditional.validators(VERSION)[0]
+        result = conditional.check(make_request({"If-None-Match": etag}), Mock(headers={}), VERSION)
+        assert result.status_code == 304
+        assert result.headers["etag"] == etag
+
+    def test_missing_resource(self):
+        response = Mock(headers={})
+        assert conditional.check(make_request(), response, None) is None
+        assert response.headers == {}
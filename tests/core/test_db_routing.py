@@ -0,0 +1,177 @@
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+from starlette.responses import Response
+from app.api.dependencies import get_replica_router
+from app.core.config import settings
+from app.core.database import database
+from app.core.db_routing import STICKY_COOKIE, ReplicaRouter
+from app.core.entity_cache import CACHE_REFRESH_KEY, CACHE_TTL_KEY
+from app.crud.book import book as book_crud
+from app.core.security import create_access_token
+from app.main import app
+from app.models import Author, Base, Book
+
+def make_database(path, title):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    db = factory()
+    author = Author(name="Borges")
+    db.add(author)
+    db.flush()
+    db.add(Book(title=title, author_id=author.id))
+    db.commit()
+    db.close()
+    return factory
+
+def make_request(method="GET", user_id=None, cookies=None):
+    headers = []
+    if user_id is not None:
+        headers.append((b"authorization", f"Bearer {create_access_token({'user_id': user_id})}".encode()))
+    if cookies:
+        headers.append((b"cookie", "; ".join(f"{k}={v}" for k, v in cookies.items()).encode()))
+    return Request({"type": "http", "method": method, "path": "/", "headers": headers, "query_string": b""})
+
+@pytest.fixture
+def databases(tmp_path):
+    # Dos bases locales con datos distintos para saber de cuál se leyó
+    return make_database(tmp_path / "primary.db", "Primario"), make_database(tmp_path / "replica.db", "Réplica")
+
+def read_title(db):
+    try:
+        return db.query(Book.title).scalar()
+    finally:
+        db.close()
+
+class TestReplicaRouter:
+
+    def test_reads_go_to_replica(self, databases):
+        primary, replica = databases
+        router = ReplicaRouter(stickiness=5)
+        db = router.session_for(make_request(), primary, [replica])
+        assert db.info[CACHE_TTL_KEY] == 5
+        assert CACHE_REFRESH_KEY not in db.info
+        assert read_title(db) == "Réplica"
+        assert router.stats()["replica_reads"] == 1
+
+    def test_writes_and_missing_replicas_use_primary(self, databases):
+        primary, replica = databases
+        router = ReplicaRouter()
+        assert read_title(router.session_for(make_request("POST"), primary, [replica])) == "Primario"
+        assert read_title(router.session_for(make_request(), primary, [])) == "Primario"
+
+    def test_round_robin(self, databases):
+        primary, replica = databases
+        router = ReplicaRouter()
+        chosen = []
+        replicas = [lambda: chosen.append("a") or replica(), lambda: chosen.append("b") or replica()]
+        for _ in range(4):
+            router.session_for(make_request(), primary, replicas).close()
+        assert chosen == ["a", "b", "a", "b"]
+
+    def test_user_reads_own_writes(self, databases):
+        primary, replica = databases
+        router = ReplicaRouter(stickiness=5)
+        router.mark_write(make_request("POST", user_id=1), Response())
+
+        assert read_title(router.session_for(make_request(user_id=1), primary, [replica])) == "Primario"
+        assert read_title(router.session_for(make_request(user_id=2), primary, [replica])) == "Réplica"
+        assert read_title(router.session_for(make_request(), primary, [replica])) == "Réplica"
+
+    def test_window_expires(self, databases):
+        primary, replica = databases
+        router = ReplicaRouter(stickiness=5)
+        with patch("app.core.db_routing.time.time", return_value=1000.0):
+            router.mark_write(make_request("POST", user_id=1), Response())
+        with patch("app.core.db_routing.time.time", return_value=1006.0):
+            assert not router.is_sticky(make_request(user_id=1))
+        assert router.stats()["sticky_users"] == 0
+
+    def test_writes_prune_expired_windows(self):
+        router = ReplicaRouter(stickiness=5)
+        # Usuarios que escriben una vez y no vuelven a leer
+        with patch("app.core.db_routing.time.time", return_value=1000.0):
+            for user_id in range(1, 4):
+                router.mark_write(make_request("POST", user_id=user_id), Response())
+        with patch("app.core.db_routing.time.time", return_value=1003.0):
+            router.mark_write(make_request("POST", user_id=1), Response())
+        with patch("app.core.db_routing.time.time", return_value=1006.0):
+            router.mark_write(make_request("POST", user_id=4), Response())
+            # La ventana renovada del usuario 1 sigue vigente
+            assert router.is_sticky(make_request(user_id=1))
+        assert router.stats()["sticky_users"] == 2
+
+    def test_cookie_keeps_other_workers_on_primary(self, databases):
+        primary, replica = databases
+        response = Response()
+        ReplicaRouter(stickiness=5).mark_write(make_request("POST"), response)
+        cookie = response.headers["set-cookie"]
+        assert cookie.startswith(f"{STICKY_COOKIE}=")
+        until = cookie.split(";")[0].split("=")[1]
+
+        # Otro worker, sin estado en memoria, recibe la cookie
+        other = ReplicaRouter(stickiness=5)
+        db = other.session_for(make_request(cookies={STICKY_COOKIE: until}), primary, [replica])
+        assert read_title(db) == "Primario"
+
+    def test_sticky_user_does_not_read_stale_cache(self, databases):
+        primary, replica = databases
+        router = ReplicaRouter(stickiness=5)
+
+        # El usuario 1 presta el libro en el primario; la réplica aún no lo ve
+        db = router.session_for(make_request("POST", user_id=1), primary, [replica])
+        assert db.info[CACHE_REFRESH_KEY] is True
+        try:
+            assert book_crud.borrow_book(db, book_id=1, user_id=1) is not None
+        finally:
+            db.close()
+        router.mark_write(make_request("POST", user_id=1), Response())
+
+        # Otro usuario lee de la réplica atrasada y guarda la fila en caché
+        db = router.session_for(make_request(user_id=2), primary, [replica])
+        try:
+            assert book_crud.get_cached(db, id=1).value.borrowed_by_id is None
+        finally:
+            db.close()
+
+        # El usuario 1 lee del primario sin pasar por la caché y la corrige
+        db = router.session_for(make_request(user_id=1), primary, [replica])
+        try:
+            assert book_crud.get_cached(db, id=1).value.borrowed_by_id == 1
+        finally:
+            db.close()
+        db = router.session_for(make_request(user_id=2), primary, [replica])
+        try:
+            assert book_crud.get_cached(db, id=1).value.title == "Primario"
+        finally:
+            db.close()
+
+    def test_without_replicas_cache_is_used(self, databases):
+        primary, _ = databases
+        db = ReplicaRouter().session_for(make_request(), primary, [])
+        assert CACHE_REFRESH_KEY not in db.info
+        db.close()
+
+class TestReadDependency:
+
+    def test_router_reads_stickiness_on_first_use(self, monkeypatch):
+        get_replica_router.cache_clear()
+        monkeypatch.setattr(settings, "DB_REPLICA_STICKINESS", 12)
+        try:
+            router = get_replica_router()
+            assert router.stickiness == 12
+            assert get_replica_router() is router
+        finally:
+            get_replica_router.cache_clear()
+
+    def test_get_endpoints_read_from_replica(self, databases):
+        primary, replica = databases
+        with patch.object(database, "SessionLocal", primary), \
+             patch.object(database, "replica_sessions", [replica]):
+            client = TestClient(app)
+            assert client.get("/api/v1/books/1").json()["title"] == "Réplica"
+            assert client.get("/api/v1/books/").json()[0]["title"] == "Réplica"
@@ -0,0 +1,93 @@
+import time
+from unittest.mock import patch
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+from app.core import entity_cache as entity_cache_module
+from app.core.entity_cache import EntityCache, format_tags, parse_tags, schedule_invalidation
+
+class TestEntityCache:
+
+    def test_hit_and_miss(self):
+        cache = EntityCache(maxsize=10, ttl=60)
+        assert cache.get(("books", 1)) is None
+        cache.set(("books", 1), "libro", {("books", 1)})
+        assert cache.get(("books", 1)) == "libro"
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+    def test_lru_eviction(self):
+        cache = EntityCache(maxsize=2, ttl=60)
+        cache.set("a", 1, {("books", 1)})
+        cache.set("b", 2, {("books", 2)})
+        cache.get("a")
+        cache.set("c", 3, {("books", 3)})
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        # La etiqueta de la entrada expulsada ya no apunta a nada
+        assert ("books", 2) not in cache._by_tag
+
+    def test_ttl(self):
+        cache = EntityCache(maxsize=10, ttl=60)
+        cache.set("a", 1, set())
+        with patch("app.core.entity_cache.time.monotonic", return_value=time.monotonic() + 61):
+            assert cache.get("a") is None
+
+    def test_invalidate_by_tag(self):
+        cache = EntityCache(maxsize=10, ttl=60)
+        cache.set(("books", 1), 1, {("books", 1), ("authors", 7)})
+        cache.set(("books", 2), 2, {("books", 2), ("authors", 7)})
+        cache.set(("authors", 8), 3, {("authors", 8)})
+        cache.invalidate({("authors", 7)})
+        assert cache.get(("books", 1)) is None
+        assert cache.get(("books", 2)) is None
+        assert cache.get(("authors", 8)) == 3
+        assert cache.stats()["invalidations"] == 2
+
+    def test_invalidate_none_clears(self):
+        cache = EntityCache(maxsize=10, ttl=60)
+        cache.set("a", 1, {("books", 1)})
+        cache.invalidate(None)
+        assert cache.stats()["size"] == 0
+
+    def test_disabled(self):
+        cache = EntityCache(maxsize=0)
+        cache.set("a", 1, set())
+        assert cache.get("a") is None
+
+class TestPayload:
+
+    def test_round_trip(self):
+        tags = {("books", 1), ("authors", 2)}
+        assert format_tags(tags) == "authors:2,books:1"
+        assert parse_tags(format_tags(tags)) == tags
+
+    def test_large_payload_clears_everything(self):
+        tags = {("books", i) for i in range(2000)}
+        assert format_tags(tags) == "*"
+        assert parse_tags("*") is None
+
+class TestSessionHooks:
+
+    def test_applied_on_commit(self, db_engine):
+        cache = EntityCache(maxsize=10, ttl=60)
+        cache.set(("books", 1), 1, {("books", 1)})
+        with patch.object(entity_cache_module, "entity_cache", cache):
+            db = sessionmaker(bind=db_engine)()
+            schedule_invalidation(db, {("books", 1)})
+            assert cache.get(("books", 1)) == 1
+            db.commit()
+            db.close()
+        assert cache.get(("books", 1)) is None
+
+    def test_discarded_on_rollback(self, db_engine):
+        cache = EntityCache(maxsize=10, ttl=60)
+        cache.set(("books", 1), 1, {("books", 1)})
+        with patch.object(entity_cache_module, "entity_cache", cache):
+            db = sessionmaker(bind=db_engine)()
+            db.execute(text("SELECT 1"))
+            schedule_invalidation(db, {("books", 1)})
+            db.rollback()
+            db.commit()
+            db.close()
+        assert cache.get(("books", 1)) == 1
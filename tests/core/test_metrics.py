@@ -0,0 +1,96 @@
+from datetime import datetime
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+from app.core import pool_metrics
+from app.core.entity_cache import EntityCache
+from app.core.metrics import PrometheusMiddleware
+from app.core.pool_metrics import InstrumentedQueuePool, instrument_engine
+from app.crud.book import book
+from app.main import app
+from app.models import Author, Book, User
+
+def sample(name, **labels):
+    # Las métricas son globales al proceso: los tests comparan diferencias
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+class TestPrometheusMetrics:
+
+    def test_latency_by_route_template(self):
+        api = FastAPI()
+        api.add_middleware(PrometheusMiddleware)
+
+        @api.get("/items/{item_id}")
+        def read_item(item_id: int):
+            return {"id": item_id}
+
+        labels = {"method": "GET", "route": "/items/{item_id}", "status": "200"}
+        before = sample("http_request_duration_seconds_count", **labels)
+        client = TestClient(api)
+        client.get("/items/1")
+        client.get("/items/2")
+
+        assert sample("http_request_duration_seconds_count", **labels) == before + 2
+        assert sample("http_requests_in_flight", method="GET") == 0
+
+        unmatched = {"method": "GET", "route": "unmatched", "status": "404"}
+        before = sample("http_request_duration_seconds_count", **unmatched)
+        client.get("/missing")
+        assert sample("http_request_duration_seconds_count", **unmatched) == before + 1
+
+    def test_metrics_endpoint(self):
+        response = TestClient(app).get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "db_pool_checkouts_total" in response.text
+        assert "library_loans_total" in response.text
+
+    def test_pool_counters(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=InstrumentedQueuePool)
+        instrument_engine(engine, "prometheus")
+        try:
+            before = sample("db_pool_checkouts_total", pool="prometheus")
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                assert sample("db_pool_connections_in_use", pool="prometheus") == 1
+            assert sample("db_pool_checkouts_total", pool="prometheus") == before + 1
+            assert sample("db_pool_connections_in_use", pool="prometheus") == 0
+        finally:
+            engine.dispose()
+            pool_metrics.registry.pop("prometheus", None)
+
+    def test_cache_lookups(self):
+        cache = EntityCache(maxsize=10, ttl=60, name="test")
+        hits = sample("cache_lookups_total", cache="test", result="hit")
+        misses = sample("cache_lookups_total", cache="test", result="miss")
+
+        cache.get("a")
+        cache.set("a", 1, [("books", 1)])
+        cache.get("a")
+
+        assert sample("cache_lookups_total", cache="test", result="hit") == hits + 1
+        assert sample("cache_lookups_total", cache="test", result="miss") == misses + 1
+
+    def test_loan_counters(self, db_session):
+        user = User(name="Ana", email="ana@example.com", hashed_password="x", registration_date=datetime(2024, 1, 1))
+        author = Author(name="Autor")
+        db_session.add_all([user, author])
+        db_session.flush()
+        db_book = Book(title="Libro", author_id=author.id)
+        db_session.add(db_book)
+        db_session.commit()
+        before = {
+            (operation, result): sample("library_loans_total", operation=operation, result=result)
+            for operation in ("borrow", "return") for result in ("ok", "rejected")
+        }
+
+        book.borrow_book(db_session, book_id=db_book.id, user_id=user.id)
+        book.borrow_book(db_session, book_id=db_book.id, user_id=user.id)
+        book.return_book(db_session, book_id=db_book.id, user_id=user.id)
+
+        assert sample("library_loans_total", operation="borrow", result="ok") == before["borrow", "ok"] + 1
+        assert sample("library_loans_total", operation="borrow", result="rejected") == before["borrow", "rejected"] + 1
+        assert sample("library_loans_total", operation="return", result="ok") == before["return", "ok"] + 1
+        assert sample("library_loans_total", operation="return", result="rejected") == before["return", "rejected"]
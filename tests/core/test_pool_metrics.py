@@ -0,0 +1,54 @@
+import pytest
+from sqlalchemy import create_engine, exc, text
+from app.core import pool_metrics
+from app.core.pool_metrics import InstrumentedQueuePool, instrument_engine, pool_status
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.1
+    )
+    yield engine
+    engine.dispose()
+    pool_metrics.registry.pop("test", None)
+
+class TestPoolMetrics:
+
+    def test_checkout_and_checkin(self, engine):
+        metrics = instrument_engine(engine, "test")
+
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            assert metrics.in_use == 1
+            assert pool_status("test")["saturation"] == 1.0
+
+        snapshot = metrics.snapshot()
+        assert snapshot["checkouts"] == 1
+        assert snapshot["checkins"] == 1
+        assert snapshot["in_use"] == 0
+        assert snapshot["connects"] == 1
+        assert metrics.wait_count == 1
+
+    def test_timeout_is_recorded(self, engine):
+        metrics = instrument_engine(engine, "test")
+
+        with engine.connect():
+            with pytest.raises(exc.TimeoutError):
+                engine.connect()
+
+        assert metrics.timeouts == 1
+        assert metrics.snapshot()["wait_max_ms"] >= 100
+
+    def test_metrics_survive_dispose(self, engine):
+        metrics = instrument_engine(engine, "test")
+        engine.dispose()
+
+        with engine.connect():
+            pass
+
+        assert metrics.checkouts == 1
+        assert metrics.wait_count == 1
@@ -0,0 +1,78 @@
+import json
+import logging
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+from app.core import request_metrics
+from app.core.request_metrics import RequestMetrics, RequestMetricsMiddleware
+
+def make_client(db_engine, **options):
+    app = FastAPI()
+    app.add_middleware(RequestMetricsMiddleware, **options)
+    Session = sessionmaker(bind=db_engine)
+
+    def get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @app.get("/items/{item_id}")
+    def read_item(item_id: int, db=Depends(get_db)):
+        db.execute(text("SELECT 1"))
+        db.execute(text("SELECT 2"))
+        return {"id": item_id}
+
+    return TestClient(app)
+
+def records(caplog, level):
+    return [json.loads(r.getMessage()) for r in caplog.records if r.name == request_metrics.__name__ and r.levelno == level]
+
+class TestRequestMetrics:
+
+    def test_server_timing_header(self, db_engine):
+        response = make_client(db_engine).get("/items/1")
+
+        timing = response.headers["server-timing"]
+        assert 'desc="2 queries"' in timing
+        assert "serialize;dur=" in timing and "total;dur=" in timing
+
+    def test_log_line(self, db_engine, caplog):
+        with caplog.at_level(logging.INFO, logger=request_metrics.__name__):
+            make_client(db_engine).get("/items/1")
+
+        [record] = records(caplog, logging.INFO)
+        assert record["route"] == "/items/{item_id}"
+        assert record["path"] == "/items/1"
+        assert record["status"] == 200
+        assert record["queries"] == 2
+        assert records(caplog, logging.WARNING) == []
+
+    def test_budget_per_route(self, db_engine, caplog):
+        client = make_client(db_engine, default_budget=10, budgets={"GET /items/{item_id}": 1})
+        with caplog.at_level(logging.INFO, logger=request_metrics.__name__):
+            client.get("/items/1")
+
+        [warning] = records(caplog, logging.WARNING)
+        assert warning["event"] == "query_budget_exceeded"
+        assert warning["budget"] == 1
+
+    def test_queries_outside_requests_are_ignored(self, db_session):
+        db_session.execute(text("SELECT 1"))
+        assert request_metrics.current.get() is None
+
+    def test_lazy_queries_during_serialization(self, db_session):
+        metrics = RequestMetrics()
+        token = request_metrics.current.set(metrics)
+        try:
+            db_session.execute(text("SELECT 1"))
+            with request_metrics.serializing():
+                db_session.execute(text("SELECT 2"))
+        finally:
+            request_metrics.current.reset(token)
+
+        assert metrics.queries == 2
+        assert metrics.lazy_queries == 1
+        assert metrics.serialize_time > 0
@@ -0,0 +1,43 @@
+import json
+from datetime import datetime, timezone
+from typing import List
+from app.core import serialization
+from app.models import Author, Book
+from app.schemas.book import Book as BookSchema
+from app.schemas.user import User as UserSchema
+
+def make_book():
+    author = Author(id=1, name="Borges", birth_date=datetime(1899, 8, 24), books=[])
+    book = Book(id=1, title="Ficciones", publication_year=1944, author_id=1, borrowed_by_id=None)
+    book.author = author
+    book.borrowed_by = None
+    return book
+
+class TestSerialization:
+
+    def test_adapter_is_cached_per_type(self):
+        assert serialization.adapter(BookSchema) is serialization.adapter(BookSchema)
+        assert serialization.adapter(List[BookSchema]) is serialization.adapter(List[BookSchema])
+
+    def test_orm_rows_match_response_model(self):
+        book = make_book()
+        expected = BookSchema.model_validate(book).model_dump_json()
+
+        content = serialization.to_python(List[BookSchema], [book])
+
+        assert serialization.dumps(content[0]) == expected.encode()
+        assert content[0]["author"]["books"][0]["title"] == "Ficciones"
+
+    def test_built_schemas_are_not_rebuilt(self):
+        schema = BookSchema.model_validate(make_book())
+        assert serialization.to_python(BookSchema, schema) == schema.model_dump()
+
+    def test_fields_outside_schema_are_dropped(self):
+        user = {
+            "id": 1, "name": "Ana", "email": "ana@example.com", "password": "hash",
+            "registration_date": datetime(2024, 1, 1, tzinfo=timezone.utc), "borrowed_books": [],
+        }
+        content = json.loads(serialization.dumps(serialization.to_python(UserSchema, user)))
+
+        assert "password" not in content
+        assert content["registration_date"] == "2024-01-01T00:00:00Z"
@@ -0,0 +1,108 @@
+import asyncio
+import pytest
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+from app.api.v1.endpoints import admin
+from app.api.v1.endpoints.admin import get_slow_queries
+from app.core import slow_queries
+from app.core.config import settings
+from app.core.request_metrics import RequestMetricsMiddleware
+from app.core.security import get_current_admin
+from app.core.slow_queries import SlowQueryLog, format_parameters
+from app.models import Book
+
+@pytest.fixture
+def slow_log(monkeypatch):
+    # Umbral mínimo: toda consulta cuenta como lenta
+    log = SlowQueryLog(threshold=1e-9, size=10, explains_per_minute=100)
+    monkeypatch.setattr(slow_queries, "slow_query_log", log)
+    monkeypatch.setattr(admin, "slow_query_log", log)
+    return log
+
+class TestSlowQueryLog:
+
+    def test_captures_statement_parameters_and_plan(self, db_session, slow_log):
+        db_session.query(Book).filter(Book.publication_year == 1944).all()
+
+        [entry] = slow_log.entries()
+        assert "FROM books" in entry["statement"]
+        assert 1944 in entry["parameters"]
+        assert "SCAN books" in entry["plan"]
+        assert entry["route"] is None
+
+    def test_disabled_below_threshold(self, db_session, slow_log, monkeypatch):
+        monkeypatch.setattr(slow_log, "threshold", 60)
+        db_session.execute(text("SELECT 1"))
+
+        assert slow_log.entries() == []
+
+    def test_explain_is_rate_limited(self, db_session, slow_log, monkeypatch):
+        monkeypatch.setattr(slow_log, "explains_per_minute", 1)
+        db_session.execute(text("SELECT 1"))
+        db_session.execute(text("SELECT 1"))
+        db_session.execute(text("SELECT 2"))
+
+        plans = [entry["plan"] for entry in reversed(slow_log.entries())]
+        # La segunda repite la sentencia y la tercera excede el límite por minuto
+        assert plans[0] is not None
+        assert plans[1:] == [None, None]
+
+    def test_ring_buffer_keeps_latest(self):
+        log = SlowQueryLog(threshold=1, size=2, explains_per_minute=0)
+
+        class Conn:
+            class dialect:
+                name = "sqlite"
+
+        for n in range(3):
+            log.record(Conn, f"SELECT {n}", (), 1.5)
+
+        assert [entry["statement"] for entry in log.entries()] == ["SELECT 2", "SELECT 1"]
+        assert log.total == 3
+
+    def test_records_route(self, db_engine, slow_log):
+        app = FastAPI()
+        app.add_middleware(RequestMetricsMiddleware)
+        Session = sessionmaker(bind=db_engine)
+
+        def get_db():
+            db = Session()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        @app.get("/items/{item_id}")
+        def read_item(item_id: int, db=Depends(get_db)):
+            db.execute(text("SELECT :id"), {"id": item_id})
+            return {"id": item_id}
+
+        TestClient(app).get("/items/1")
+
+        [entry] = slow_log.entries()
+        assert entry["route"] == "GET /items/{item_id}"
+
+    def test_parameters_are_truncated(self):
+        formatted = format_parameters({"id": 1, "text": "x" * 500})
+
+        assert formatted["id"] == 1
+        assert len(formatted["text"]) == 201
+
+class TestSlowQueriesEndpoint:
+
+    def test_requires_admin(self, monkeypatch):
+        monkeypatch.setattr(settings, "ADMIN_USER_IDS", [1])
+
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(get_current_admin({"user_id": 2}))
+        assert exc_info.value.status_code == 403
+        assert asyncio.run(get_current_admin({"user_id": 1})) == {"user_id": 1}
+
+    def test_lists_entries(self, db_session, slow_log):
+        db_session.execute(text("SELECT 1"))
+
+        result = get_slow_queries(current_user={"user_id": 1})
+        assert result["total"] >= 1
+        assert result["queries"][0]["statement"] == "SELECT 1"
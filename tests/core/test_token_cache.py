@@ -0,0 +1,85 @@
+import time
+import pytest
+from datetime import timedelta
+from unittest.mock import patch
+from app.core import security
+from app.core.security import create_access_token, decode_token
+from app.core.token_cache import TokenCache
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    security.token_cache.clear()
+    yield
+    security.token_cache.clear()
+
+class TestTokenCache:
+
+    def test_hit_after_set(self):
+        cache = TokenCache(maxsize=10)
+        claims = {"user_id": 1, "exp": time.time() + 60}
+        cache.set("token", "secret", claims)
+
+        assert cache.get("token", "secret") == claims
+        assert cache.get("otro", "secret") is None
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+        assert cache.stats()["hit_rate"] == 0.5
+
+    def test_entry_expires_with_token(self):
+        cache = TokenCache(maxsize=10)
+        cache.set("token", "secret", {"user_id": 1, "exp": time.time() - 1})
+
+        assert cache.get("token", "secret") is None
+        assert cache.stats()["size"] == 0
+
+    def test_ttl_caps_expiration(self):
+        cache = TokenCache(maxsize=10, ttl=0)
+        cache.set("token", "secret", {"user_id": 1, "exp": time.time() + 3600})
+
+        assert cache.get("token", "secret") is None
+
+    def test_lru_eviction(self):
+        cache = TokenCache(maxsize=2)
+        exp = time.time() + 60
+        cache.set("a", "secret", {"exp": exp})
+        cache.set("b", "secret", {"exp": exp})
+        cache.get("a", "secret")
+        cache.set("c", "secret", {"exp": exp})
+
+        assert cache.get("a", "secret") is not None
+        assert cache.get("b", "secret") is None
+        assert cache.get("c", "secret") is not None
+
+    def test_secret_rotation_clears_cache(self):
+        cache = TokenCache(maxsize=10)
+        cache.set("token", "old-secret", {"exp": time.time() + 60})
+
+        assert cache.get("token", "new-secret") is None
+        assert cache.stats()["size"] == 0
+
+    def test_disabled_cache(self):
+        cache = TokenCache(maxsize=0)
+        cache.set("token", "secret", {"exp": time.time() + 60})
+
+        assert cache.get("token", "secret") is None
+
+class TestDecodeToken:
+
+    def test_decode_uses_cache(self):
+        token = create_access_token({"user_id": 7}, expires_delta=timedelta(minutes=5))
+        assert decode_token(token)["user_id"] == 7
+
+        with patch("app.core.security.jwt.decode") as mock_decode:
+            assert decode_token(token)["user_id"] == 7
+            mock_decode.assert_not_called()
+
+    def test_rotated_secret_rejects_cached_token(self):
+        token = create_access_token({"user_id": 7}, expires_delta=timedelta(minutes=5))
+        assert decode_token(token) is not None
+
+        with patch.object(security.settings, "JWT_SECRET", "rotated-secret"):
+            assert decode_token(token) is None
+
+    def test_invalid_token_is_not_cached(self):
+        assert decode_token("no-es-un-token") is None
+        assert security.token_cache.stats()["size"] == 0
@@ -0,0 +1,143 @@
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.crud.author import async_author
+from app.crud.book import async_book
+from app.crud.loan import async_loan
+from app.crud.user import async_user
+from app.models import Base
+from app.schemas.author import AuthorCreate, AuthorUpdate
+from app.schemas.book import BookCreate
+from app.schemas.user import UserCreate
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+@pytest.fixture
+async def async_db(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        yield session
+    await engine.dispose()
+
+class TestAsyncCRUD:
+
+    async def test_create_and_get_book(self, async_db):
+        author = await async_author.create(async_db, obj_in=AuthorCreate(name="Gabriela Mistral"))
+        created = await async_book.create(async_db, obj_in=BookCreate(title="Desolación", author_id=author.id))
+
+        fetched = await async_book.get(async_db, id=created.id)
+
+        assert fetched.title == "Desolación"
+        assert fetched.author.name == "Gabriela Mistral"
+        assert [b.id for b in fetched.author.books] == [created.id]
+
+    async def test_update_author(self, async_db):
+        author = await async_author.create(async_db, obj_in=AuthorCreate(name="Borges"))
+
+        updated = await async_author.update(async_db, db_obj=author, obj_in=AuthorUpdate(name="Jorge Luis Borges"))
+
+        assert updated.name == "Jorge Luis Borges"
+        assert updated.books == []
+
+    async def test_update_ignores_non_column_fields(self, async_db):
+        author = await async_author.create(async_db, obj_in=AuthorCreate(name="Borges"))
+
+        # Como la versión síncrona: relaciones y propiedades no se asignan
+        updated = await async_author.update(
+            async_db, db_obj=author, obj_in={"name": "Jorge Luis Borges", "books": None, "book_count": 3}
+        )
+
+        assert updated.name == "Jorge Luis Borges"
+        assert updated.books == []
+
+    async def test_get_multi_by_cursor(self, async_db):
+        author = await async_author.create(async_db, obj_in=AuthorCreate(name="Autor"))
+        for title in ["C", "A", "B"]:
+            await async_book.create(async_db, obj_in=BookCreate(title=title, author_id=author.id))
+
+        first, cursor = await async_book.get_multi_by_cursor(async_db, limit=2, order_by="title")
+        second, last_cursor = await async_book.get_multi_by_cursor(async_db, cursor=cursor, limit=2, order_by="title")
+
+        assert [b.title for b in first + second] == ["A", "B", "C"]
+        assert last_cursor is None
+
+    async def test_search_books(self, async_db):
+        author = await async_author.create(async_db, obj_in=AuthorCreate(name="Autor"))
+        for title in ["Rayuela", "Ficciones"]:
+            await async_book.create(async_db, obj_in=BookCreate(title=title, author_id=author.id))
+
+        results = await async_book.search_books(async_db, title="rayuella")
+
+        assert [b.title for b in results] == ["Rayuela"]
+
+    async def test_borrow_and_return(self, async_db):
+        user = await async_user.create(async_db, obj_in=UserCreate(
+            name="Lector", email="lector@example.com", password="Password123"
+        ))
+        author = await async_author.create(async_db, obj_in=AuthorCreate(name="Autor"))
+        created = await async_book.create(async_db, obj_in=BookCreate(title="Libro", author_id=author.id))
+        # Como en una petición nueva: la sesión no tiene ningún registro cargado
+        async_db.expunge_all()
+
+        borrowed = await async_book.borrow_book(async_db, book_id=created.id, user_id=user.id)
+        assert borrowed.borrowed_by.id == user.id
+        assert borrowed.author.name == "Autor"
+
+        returned = await async_book.return_book(async_db, book_id=created.id, user_id=user.id)
+        assert returned.borrowed_by_id is None
+
+    async def test_stream_rows(self, async_db):
+        author = await async_author.create(async_db, obj_in=AuthorCreate(name="Borges"))
+        for title in ("Ficciones", "El Aleph"):
+            await async_book.create(async_db, obj_in=BookCreate(title=title, author_id=author.id))
+
+        rows = [row async for row in async_book.stream_rows(async_db, batch_size=1)]
+
+        assert [row.title for row in rows] == ["Ficciones", "El Aleph"]
+        assert all(row.author_id == author.id for row in rows)
+
+    async def test_get_page_with_total(self, async_db):
+        for name in ("Borges", "Cortázar", "Mistral"):
+            await async_author.create(async_db, obj_in=AuthorCreate(name=name))
+
+        page = await async_author.get_page(async_db, skip=1, limit=1, count="exact")
+
+        assert [a.name for a in page.items] == ["Cortázar"]
+        assert page.total == 3
+        assert page.next is not None
+
+    async def test_get_many(self, async_db):
+        created = [await async_author.create(async_db, obj_in=AuthorCreate(name=name)) for name in ("Borges", "Mistral")]
+
+        items, missing = await async_author.get_many(async_db, ids=[created[1].id, 999, created[0].id])
+
+        assert [a.name for a in items] == ["Mistral", "Borges"]
+        assert missing == (999,)
+
+    async def test_get_multi_with_counts(self, async_db):
+        borges = await async_author.create(async_db, obj_in=AuthorCreate(name="Borges"))
+        await async_author.create(async_db, obj_in=AuthorCreate(name="Rulfo"))
+        for title in ["Ficciones", "El Aleph"]:
+            await async_book.create(async_db, obj_in=BookCreate(title=title, author_id=borges.id))
+
+        page = await async_author.get_multi_with_counts(async_db, order_by="-book_count", count="exact")
+
+        assert [(row.name, row.book_count, row.available_count) for row in page.items] == [("Borges", 2, 2), ("Rulfo", 0, 0)]
+        assert page.total == 2
+
+    async def test_loan_history(self, async_db):
+        author = await async_author.create(async_db, obj_in=AuthorCreate(name="Autor"))
+        created = await async_book.create(async_db, obj_in=BookCreate(title="Libro", author_id=author.id))
+        reader = await async_user.create(async_db, obj_in=UserCreate(name="Ana", email="ana@example.com", password="Secreta123"))
+
+        await async_book.borrow_book(async_db, book_id=created.id, user_id=reader.id)
+        await async_book.return_book(async_db, book_id=created.id, user_id=reader.id)
+        loans, next_cursor = await async_loan.get_history(async_db, user_id=reader.id)
+
+        assert [l.action for l in loans] == ["return", "borrow"]
+        assert next_cursor is None
@@ -0,0 +1,84 @@
+import pytest
+from datetime import datetime
+from typing import List
+from unittest.mock import patch
+from sqlalchemy import event
+from app.core import serialization
+from app.crud import listing
+from app.crud.author import author as author_crud
+from app.crud.pagination import InvalidCursorError
+from app.models import Author, Book, User
+from app.schemas.author import AuthorWithCounts
+
+@pytest.fixture
+def catalog(db_session):
+    user = User(name="Ana", email="ana@example.com", hashed_password="x", registration_date=datetime(2024, 1, 1))
+    authors = [Author(name="Borges"), Author(name="Mistral"), Author(name="Cortázar"), Author(name="Rulfo")]
+    db_session.add_all([user, *authors])
+    db_session.flush()
+    db_session.add_all([
+        Book(title="Ficciones", author_id=authors[0].id, borrowed_by_id=user.id),
+        Book(title="El Aleph", author_id=authors[0].id),
+        Book(title="Desolación", author_id=authors[1].id),
+        Book(title="Rayuela", author_id=authors[2].id, borrowed_by_id=user.id),
+        Book(title="Bestiario", author_id=authors[2].id),
+        Book(title="Final del juego", author_id=authors[2].id),
+    ])
+    db_session.commit()
+    return db_session
+
+class TestAuthorCounts:
+
+    def test_counts_in_a_single_query(self, catalog):
+        statements = []
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        engine = catalog.get_bind()
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            page = author_crud.get_multi_with_counts(catalog)
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+        assert len(statements) == 1
+        assert "GROUP BY" in statements[0]
+        content = serialization.to_python(List[AuthorWithCounts], page.items)
+        assert [(a["name"], a["book_count"], a["available_count"]) for a in content] == [
+            ("Borges", 2, 1), ("Mistral", 1, 1), ("Cortázar", 3, 2), ("Rulfo", 0, 0),
+        ]
+        assert page.next is None and page.total is None
+
+    def test_keyset_pages_by_count_descending(self, catalog):
+        first = author_crud.get_multi_with_counts(catalog, limit=2, order_by="-book_count")
+        second = author_crud.get_multi_with_counts(catalog, limit=2, order_by="-book_count", cursor=first.next)
+
+        assert [row.name for row in first.items] == ["Cortázar", "Borges"]
+        assert [row.name for row in second.items] == ["Mistral", "Rulfo"]
+        assert second.next is None
+
+    def test_cursor_keeps_its_direction(self, catalog):
+        first = author_crud.get_multi_with_counts(catalog, limit=2, order_by="-book_count")
+
+        with pytest.raises(InvalidCursorError):
+            author_crud.get_multi_with_counts(catalog, limit=2, order_by="book_count", cursor=first.next)
+
+    def test_ascending_available_count_with_total(self, catalog):
+        page = author_crud.get_multi_with_counts(catalog, limit=3, order_by="available_count", count="exact")
+
+        # Empate en `available_count`: desempata el id
+        assert [row.name for row in page.items] == ["Rulfo", "Borges", "Mistral"]
+        assert page.total == 4
+
+    def test_estimated_total(self, catalog):
+        with patch.object(listing, "estimated_count", return_value=1000) as estimate:
+            page = author_crud.get_multi_with_counts(catalog, limit=2, count="estimated")
+        estimate.assert_called_once_with(catalog, Author)
+        assert (page.total, page.estimated) == (1000, True)
+
+        # Fuera de PostgreSQL no hay estimación y se cuenta
+        page = author_crud.get_multi_with_counts(catalog, limit=2, count="auto")
+        assert (page.total, page.estimated) == (4, False)
+
+    def test_unknown_ordering(self, catalog):
+        with pytest.raises(InvalidCursorError):
+            author_crud.get_multi_with_counts(catalog, order_by="name")
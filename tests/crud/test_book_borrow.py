@@ -0,0 +1,90 @@
+import threading
+import pytest
+from datetime import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.crud.book import book
+from app.models import Author, Base, Book, User
+
+@pytest.fixture
+def session_factory(tmp_path):
+    # Base de datos en archivo para que cada hilo use su propia conexión
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'borrow.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30}
+    )
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    yield factory
+    engine.dispose()
+
+@pytest.fixture
+def catalog(session_factory):
+    db = session_factory()
+    users = [
+        User(name=f"User {i}", email=f"user{i}@example.com", hashed_password="x",
+             registration_date=datetime(2024, 1, 1))
+        for i in range(20)
+    ]
+    author = Author(name="Autor")
+    db.add_all(users + [author])
+    db.flush()
+    db_book = Book(title="Libro", author_id=author.id)
+    db.add(db_book)
+    db.commit()
+    ids = [u.id for u in users], db_book.id
+    db.close()
+    return ids
+
+class TestAtomicBorrow:
+
+    def test_borrow_and_return(self, session_factory, catalog):
+        user_ids, book_id = catalog
+        db = session_factory()
+
+        borrowed = book.borrow_book(db, book_id=book_id, user_id=user_ids[0])
+        assert borrowed.borrowed_by_id == user_ids[0]
+        assert borrowed.borrowed_by.id == user_ids[0]
+
+        assert book.borrow_book(db, book_id=book_id, user_id=user_ids[1]) is None
+        assert book.return_book(db, book_id=book_id, user_id=user_ids[1]) is None
+
+        returned = book.return_book(db, book_id=book_id, user_id=user_ids[0])
+        assert returned.borrowed_by_id is None
+        assert book.return_book(db, book_id=book_id, user_id=user_ids[0]) is None
+        db.close()
+
+    def test_missing_book(self, session_factory, catalog):
+        user_ids, book_id = catalog
+        db = session_factory()
+
+        assert book.borrow_book(db, book_id=book_id + 100, user_id=user_ids[0]) is None
+        db.close()
+
+    def test_concurrent_borrows_only_one_wins(self, session_factory, catalog):
+        user_ids, book_id = catalog
+        barrier = threading.Barrier(len(user_ids))
+        winners, errors = [], []
+
+        def borrow(user_id):
+            db = session_factory()
+            try:
+                barrier.wait()
+                if book.borrow_book(db, book_id=book_id, user_id=user_id) is not None:
+                    winners.append(user_id)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                db.close()
+
+        threads = [threading.Thread(target=borrow, args=(user_id,)) for user_id in user_ids]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert len(winners) == 1
+        db = session_factory()
+        assert db.get(Book, book_id).borrowed_by_id == winners[0]
+        db.close()
@@ -0,0 +1,49 @@
+import pytest
+from app.crud.book import book
+from app.models import Author, Book
+
+@pytest.fixture
+def catalog(db_session):
+    author = Author(name="Julio Cortázar")
+    other = Author(name="Jorge Luis Borges")
+    db_session.add_all([author, other])
+    db_session.flush()
+    db_session.add_all([
+        Book(title="Rayuela", author_id=author.id, publication_year=1963),
+        Book(title="Historias de cronopios y de famas", author_id=author.id, publication_year=1962),
+        Book(title="Ficciones", author_id=other.id, publication_year=1944),
+        Book(title="Historia universal de la infamia", author_id=other.id, publication_year=1935),
+    ])
+    db_session.commit()
+    return author, other
+
+class TestSearchBooks:
+
+    def test_search_by_title_is_ranked(self, db_session, catalog):
+        results = book.search_books(db_session, title="historias infamia")
+
+        assert [b.title for b in results] == [
+            "Historia universal de la infamia",
+            "Historias de cronopios y de famas",
+        ]
+
+    def test_search_tolerates_typos(self, db_session, catalog):
+        results = book.search_books(db_session, title="rayuella")
+
+        assert [b.title for b in results] == ["Rayuela"]
+
+    def test_search_combines_filters(self, db_session, catalog):
+        author, other = catalog
+
+        results = book.search_books(db_session, title="historia", author_id=other.id)
+
+        assert [b.title for b in results] == ["Historia universal de la infamia"]
+
+    def test_search_is_paginated(self, db_session, catalog):
+        author, other = catalog
+
+        first = book.search_books(db_session, author_id=author.id, limit=1)
+        second = book.search_books(db_session, author_id=author.id, skip=1, limit=1)
+
+        assert len(first) == 1 and len(second) == 1
+        assert first[0].id != second[0].id
@@ -0,0 +1,80 @@
+import pytest
+from datetime import datetime
+from sqlalchemy import event
+from app.core.entity_cache import entity_cache
+from app.crud.author import author
+from app.crud.book import book
+from app.models import Author, Book, User
+from app.schemas.book import BookCreate
+
+@pytest.fixture
+def catalog(db_session):
+    db_author = Author(name="Borges")
+    user = User(name="Lector", email="lector@example.com", hashed_password="x",
+                registration_date=datetime(2024, 1, 1))
+    db_session.add_all([db_author, user])
+    db_session.flush()
+    db_session.add_all([Book(title="Ficciones", author_id=db_author.id), Book(title="El Aleph", author_id=db_author.id)])
+    db_session.commit()
+    return db_author.id, user.id
+
+def count_queries(engine):
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+class TestCachedGet:
+
+    def test_second_read_hits_cache(self, db_engine, db_session, catalog):
+        first = book.get_cached(db_session, id=1)
+        hits = entity_cache.stats()["hits"]
+        statements = count_queries(db_engine)
+
+        second = book.get_cached(db_session, id=1)
+
+        assert statements == []
+        assert second.value.title == "Ficciones"
+        assert second.value.author.name == "Borges"
+        assert second == first
+        assert entity_cache.stats()["hits"] == hits + 1
+
+    def test_missing_is_not_cached(self, db_session, catalog):
+        assert book.get_cached(db_session, id=99) is None
+        assert entity_cache.stats()["size"] == 0
+
+    def test_update_invalidates_related_entries(self, db_session, catalog):
+        author_id, _ = catalog
+        book.get_cached(db_session, id=1)
+        author.get_cached(db_session, id=author_id)
+
+        book.update(db_session, db_obj=book.get(db_session, id=2), obj_in={"title": "El Aleph (2a ed.)"})
+
+        # El libro 1 anida los libros de su autor
+        cached = book.get_cached(db_session, id=1)
+        assert "El Aleph (2a ed.)" in [b.title for b in cached.value.author.books]
+        assert "El Aleph (2a ed.)" in [b.title for b in author.get_cached(db_session, id=author_id).value.books]
+
+    def test_create_invalidates_author(self, db_session, catalog):
+        author_id, _ = catalog
+        version = author.get_cached(db_session, id=author_id).version
+
+        book.create(db_session, obj_in=BookCreate(title="El hacedor", author_id=author_id))
+
+        cached = author.get_cached(db_session, id=author_id)
+        assert len(cached.value.books) == 3
+        assert cached.version != version
+
+    def test_borrow_and_return_invalidate(self, db_session, catalog):
+        _, user_id = catalog
+        book.get_cached(db_session, id=1)
+
+        book.borrow_book(db_session, book_id=1, user_id=user_id)
+        assert book.get_cached(db_session, id=1).value.borrowed_by_id == user_id
+
+        book.return_book(db_session, book_id=1, user_id=user_id)
+        assert book.get_cached(db_session, id=1).value.borrowed_by_id is None
+
+    def test_remove_invalidates(self, db_session, catalog):
+        book.get_cached(db_session, id=2)
+        book.remove(db_session, id=2)
+        assert book.get_cached(db_session, id=2) is None
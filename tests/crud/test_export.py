@@ -0,0 +1,30 @@
+from app.crud.author import author
+from app.crud.book import book
+from app.models import Author, Book
+
+class TestStreamRows:
+
+    def test_streams_all_rows_in_id_order(self, db_session):
+        db_author = Author(name="Borges")
+        db_session.add(db_author)
+        db_session.flush()
+        db_session.add_all([Book(title=f"Libro {i}", author_id=db_author.id) for i in range(5)])
+        db_session.commit()
+        db_session.expunge_all()
+
+        rows = list(book.stream_rows(db_session, batch_size=2))
+
+        assert [row.title for row in rows] == [f"Libro {i}" for i in range(5)]
+        assert rows[0]._fields == book.export_columns
+        # Las filas no se cargan como entidades en la sesión
+        assert len(db_session.identity_map) == 0
+
+    def test_author_columns(self, db_session):
+        db_session.add(Author(name="Cortázar"))
+        db_session.commit()
+
+        (row,) = author.stream_rows(db_session)
+
+        assert row.name == "Cortázar"
+        assert row.created_at is not None
+        assert row._fields == ("id", "name", "birth_date", "created_at", "updated_at")
@@ -0,0 +1,107 @@
+import pytest
+from datetime import datetime
+from typing import List
+from sqlalchemy import event
+from sqlalchemy.exc import InvalidRequestError
+from app.core import serialization
+from app.crud.author import author as author_crud
+from app.crud.book import book as book_crud
+from app.crud.user import user as user_crud
+from app.models import Author, Book, User
+from app.schemas.fieldsets import FieldSet, InvalidFieldsError
+
+@pytest.fixture
+def catalog(db_session):
+    user = User(name="Ana", email="ana@example.com", hashed_password="x", registration_date=datetime(2024, 1, 1))
+    authors = [Author(name="Borges"), Author(name="Mistral")]
+    db_session.add_all([user, *authors])
+    db_session.flush()
+    db_session.add_all([
+        Book(title="Ficciones", author_id=authors[0].id, borrowed_by_id=user.id),
+        Book(title="El Aleph", author_id=authors[0].id),
+        Book(title="Desolación", author_id=authors[1].id),
+    ])
+    db_session.commit()
+    db_session.expunge_all()
+    return db_session
+
+def statements_for(db_session, action):
+    statements = []
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        result = action()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return result, statements
+
+class TestParseFieldset:
+
+    def test_no_parameters_is_full_representation(self):
+        assert author_crud.parse_fieldset(None, None) is None
+
+    def test_schema_order_and_id(self):
+        fieldset = book_crud.parse_fieldset("author_id, title", "borrowed_by,author")
+        assert fieldset == FieldSet(("title", "author_id", "id"), ("author", "borrowed_by"))
+
+    def test_include_alone_keeps_all_columns(self):
+        fieldset = author_crud.parse_fieldset(None, "books")
+        assert fieldset.fields == ("name", "birth_date", "id")
+        assert fieldset.include == ("books",)
+
+    def test_unknown_names(self):
+        with pytest.raises(InvalidFieldsError):
+            author_crud.parse_fieldset("name,email", None)
+        with pytest.raises(InvalidFieldsError):
+            user_crud.parse_fieldset(None, "author")
+
+class TestSparseQueries:
+
+    def test_columns_only_without_relationships(self, catalog):
+        fieldset = author_crud.parse_fieldset("name", None)
+        page, statements = statements_for(catalog, lambda: author_crud.get_page(catalog, fieldset=fieldset))
+
+        assert len(statements) == 1
+        assert "birth_date" not in statements[0]
+        content = serialization.to_python(List[author_crud.fieldset_model(fieldset)], page.items)
+        assert content == [{"name": "Borges", "id": 1}, {"name": "Mistral", "id": 2}]
+
+    def test_included_relationship(self, catalog):
+        fieldset = author_crud.parse_fieldset("name", "books")
+        page, statements = statements_for(catalog, lambda: author_crud.get_page(catalog, fieldset=fieldset))
+
+        # Autores y sus libros, sin los autores ni los prestatarios de cada libro
+        assert len(statements) == 2
+        content = serialization.to_python(List[author_crud.fieldset_model(fieldset)], page.items)
+        assert sorted(book["title"] for book in content[0]["books"]) == ["El Aleph", "Ficciones"]
+        assert set(content[0]["books"][0]) == {"id", "title", "publication_year", "author_id", "borrowed_by_id"}
+
+    def test_relationships_not_requested_are_not_loaded(self, catalog):
+        fieldset = book_crud.parse_fieldset("title", "author")
+        db_book = book_crud.get(catalog, id=1, fieldset=fieldset)
+
+        assert db_book.author.name == "Borges"
+        with pytest.raises(InvalidRequestError):
+            db_book.borrowed_by
+
+    def test_many_to_one_include(self, catalog):
+        fieldset = book_crud.parse_fieldset("title", "borrowed_by")
+        items, missing = book_crud.get_many(catalog, ids=[2, 1], fieldset=fieldset)
+
+        content = serialization.to_python(List[book_crud.fieldset_model(fieldset)], items)
+        assert content[0] == {"title": "El Aleph", "id": 2, "borrowed_by": None}
+        assert content[1]["borrowed_by"]["email"] == "ana@example.com"
+
+    def test_cursor_pages_by_title(self, catalog):
+        fieldset = book_crud.parse_fieldset("title", None)
+        first = book_crud.get_page(catalog, order_by="title", limit=2, fieldset=fieldset)
+        second = book_crud.get_page(catalog, order_by="title", cursor=first.next, limit=2, fieldset=fieldset)
+
+        assert [b.title for b in first.items + second.items] == ["Desolación", "El Aleph", "Ficciones"]
+
+    def test_model_is_cached(self):
+        fieldset = user_crud.parse_fieldset("name", "borrowed_books")
+        assert user_crud.fieldset_model(fieldset) is user_crud.fieldset_model(fieldset)
+        assert list(user_crud.fieldset_model(fieldset).model_fields) == ["name", "id", "borrowed_books"]
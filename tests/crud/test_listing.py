@@ -0,0 +1,125 @@
+import pytest
+from unittest.mock import patch
+from app.core.config import settings
+from app.crud import listing
+from app.crud.author import author as author_crud
+from sqlalchemy.dialects import postgresql
+from app.crud.listing import InvalidIdsError, ids_filter, parse_ids, use_estimate
+from app.crud.user import user as user_crud
+from app.models import Author, User
+from datetime import datetime
+
+@pytest.fixture
+def authors(db_session):
+    db_session.add_all([Author(name=f"Autor {i}") for i in range(5)])
+    db_session.commit()
+    return db_session
+
+class TestUseEstimate:
+
+    def test_exact_never_estimates(self):
+        assert not use_estimate("exact", 10 ** 9)
+
+    def test_estimated_uses_any_estimate(self):
+        assert use_estimate("estimated", 3)
+        assert not use_estimate("estimated", None)
+
+    def test_auto_only_for_large_tables(self):
+        threshold = settings.COUNT_ESTIMATE_THRESHOLD
+        assert use_estimate("auto", threshold)
+        assert not use_estimate("auto", threshold - 1)
+
+class TestListPage:
+
+    def test_without_count(self, authors):
+        page = author_crud.get_page(authors, skip=0, limit=2)
+        assert [a.name for a in page.items] == ["Autor 0", "Autor 1"]
+        assert page.total is None
+        assert page.next is not None
+
+    def test_exact_total_with_offset(self, authors):
+        page = author_crud.get_page(authors, skip=4, limit=2, count="exact")
+        assert [a.name for a in page.items] == ["Autor 4"]
+        assert page.total == 5
+        assert page.next is None
+        assert not page.estimated
+
+    def test_exact_total_past_the_end(self, authors):
+        page = author_crud.get_page(authors, skip=10, limit=2, count="auto")
+        assert page.items == []
+        assert page.total == 5
+
+    def test_cursor_total_counts_whole_table(self, authors):
+        first = author_crud.get_page(authors, limit=2, count="exact")
+        second = author_crud.get_page(authors, cursor=first.next, limit=2, count="exact")
+        assert [a.name for a in second.items] == ["Autor 2", "Autor 3"]
+        assert second.total == 5
+
+    def test_estimated_total(self, authors):
+        with patch.object(listing, "estimated_count", return_value=1000) as estimate:
+            page = author_crud.get_page(authors, limit=2, count="estimated")
+        estimate.assert_called_once_with(authors, Author)
+        assert page.total == 1000
+        assert page.estimated
+
+    def test_estimate_unavailable_outside_postgres(self, authors):
+        assert listing.estimated_count(authors, Author) is None
+        page = author_crud.get_page(authors, limit=2, count="estimated")
+        assert page.total == 5
+        assert not page.estimated
+
+    def test_users(self, db_session):
+        db_session.add_all([
+            User(name=f"U{i}", email=f"u{i}@example.com", hashed_password="x", registration_date=datetime(2024, 1, 1))
+            for i in range(3)
+        ])
+        db_session.commit()
+        page = user_crud.get_page(db_session, limit=2, count="exact")
+        assert len(page.items) == 2
+        assert page.total == 3
+
+class TestParseIds:
+
+    def test_keeps_order_without_duplicates(self):
+        assert parse_ids("3, 1,3,,2") == [3, 1, 2]
+
+    def test_rejects_invalid(self):
+        with pytest.raises(InvalidIdsError):
+            parse_ids("1,a")
+        with pytest.raises(InvalidIdsError):
+            parse_ids(",")
+
+    @pytest.mark.parametrize("value", ["²", "١٢", "1,３"])
+    def test_rejects_non_ascii_digits(self, value):
+        with pytest.raises(InvalidIdsError):
+            parse_ids(value)
+
+    def test_rejects_ids_out_of_range(self):
+        assert parse_ids(str(2 ** 31 - 1)) == [2 ** 31 - 1]
+        with pytest.raises(InvalidIdsError):
+            parse_ids(f"1,{2 ** 31}")
+
+    def test_cap(self, monkeypatch):
+        monkeypatch.setattr(settings, "MULTI_GET_MAX_IDS", 2)
+        assert parse_ids("1,2,1") == [1, 2]
+        with pytest.raises(InvalidIdsError):
+            parse_ids("1,2,3")
+
+class TestGetMany:
+
+    def test_request_order_and_missing(self, authors):
+        ids = [a.id for a in authors.query(Author).order_by(Author.id)]
+        items, missing = author_crud.get_many(authors, ids=[ids[3], 999, ids[0]])
+        assert [a.name for a in items] == ["Autor 3", "Autor 0"]
+        assert missing == (999,)
+
+    def test_page_by_ids(self, authors):
+        page = author_crud.get_page(authors, ids=[2, 1, 42], count="exact")
+        assert [a.id for a in page.items] == [2, 1]
+        assert page.total == 2
+        assert page.missing == (42,)
+        assert page.next is None
+
+    def test_postgres_uses_any(self):
+        clause = ids_filter(Author, [1, 2, 3], "postgresql")
+        assert "= ANY (" in str(clause.compile(dialect=postgresql.dialect()))
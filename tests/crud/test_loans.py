@@ -0,0 +1,140 @@
+import pytest
+from contextlib import nullcontext
+from datetime import date, datetime, timedelta
+from unittest.mock import MagicMock
+from fastapi import HTTPException
+from app.api.v1.endpoints.users import read_user_loans
+from app.core.config import settings
+from app.crud.book import book as book_crud
+from app.crud.loan import loan as loan_crud
+from app.crud.pagination import InvalidCursorError
+from app.models import Author, Book, Loan, User
+from app.services.loan_partitions import ensure_partitions, month_start, partition_ddl
+
+@pytest.fixture
+def catalog(db_session):
+    users = [
+        User(name=f"User {i}", email=f"user{i}@example.com", hashed_password="x", registration_date=datetime(2024, 1, 1))
+        for i in range(2)
+    ]
+    author = Author(name="Autor")
+    db_session.add_all([*users, author])
+    db_session.flush()
+    books = [Book(title=title, author_id=author.id) for title in ("Ficciones", "Rayuela")]
+    db_session.add_all(books)
+    db_session.commit()
+    return [u.id for u in users], [b.id for b in books]
+
+class FakePartitionConnection:
+    """Conexión de PostgreSQL simulada: responde las consultas y guarda el DDL ejecutado"""
+    def __init__(self, existing, stranded):
+        self.existing = existing
+        self.stranded = stranded
+        self.ddl = []
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        result = MagicMock()
+        if "to_regclass" in sql:
+            result.scalar.return_value = params["name"] if params["name"] in self.existing else None
+        elif sql.startswith("SELECT DISTINCT"):
+            result.__iter__.return_value = iter([(month,) for month in self.stranded])
+        elif not sql.startswith("SELECT"):
+            self.ddl.append(sql)
+        return result
+
+def fake_engine(conn):
+    engine = MagicMock()
+    engine.dialect.name = "postgresql"
+    engine.begin.return_value = nullcontext(conn)
+    return engine
+
+class TestLoanHistory:
+
+    def test_borrow_and_return_are_recorded(self, db_session, catalog):
+        (ana, luis), (ficciones, _) = catalog
+        book_crud.borrow_book(db_session, book_id=ficciones, user_id=ana)
+        book_crud.return_book(db_session, book_id=ficciones, user_id=ana)
+        # Rechazados: no dejan registro
+        book_crud.return_book(db_session, book_id=ficciones, user_id=luis)
+
+        loans, next_cursor = loan_crud.get_history(db_session, book_id=ficciones)
+
+        assert [(l.user_id, l.action) for l in loans] == [(ana, "return"), (ana, "borrow")]
+        assert next_cursor is None
+
+    def test_keyset_pages_newest_first(self, db_session, catalog):
+        (ana, luis), (ficciones, rayuela) = catalog
+        start = datetime(2026, 1, 31, 23, 0)
+        db_session.add_all([
+            Loan(book_id=ficciones if n % 2 else rayuela, user_id=ana, action="borrow", occurred_at=start + timedelta(hours=n))
+            for n in range(5)
+        ] + [Loan(book_id=rayuela, user_id=luis, action="borrow", occurred_at=start)])
+        db_session.commit()
+
+        first, cursor = loan_crud.get_history(db_session, user_id=ana, limit=3)
+        second, last = loan_crud.get_history(db_session, user_id=ana, limit=3, cursor=cursor)
+
+        assert [l.occurred_at.hour for l in first + second] == [3, 2, 1, 0, 23]
+        assert last is None
+
+    def test_time_range(self, db_session, catalog):
+        (ana, _), (ficciones, _) = catalog
+        db_session.add_all([
+            Loan(book_id=ficciones, user_id=ana, action="borrow", occurred_at=datetime(2026, month, 15))
+            for month in (1, 2, 3)
+        ])
+        db_session.commit()
+
+        loans, _ = loan_crud.get_history(
+            db_session, user_id=ana, since=datetime(2026, 2, 1), until=datetime(2026, 3, 1)
+        )
+
+        assert [l.occurred_at.month for l in loans] == [2]
+
+    def test_invalid_cursor(self, db_session):
+        with pytest.raises(InvalidCursorError):
+            loan_crud.get_history(db_session, user_id=1, cursor="x")
+
+    def test_only_self_or_admin(self, db_session, catalog, monkeypatch):
+        monkeypatch.setattr(settings, "ADMIN_USER_IDS", [99])
+        (ana, luis), _ = catalog
+
+        with pytest.raises(HTTPException) as exc_info:
+            read_user_loans(db=db_session, user_id=ana, current_user={"user_id": luis})
+        assert exc_info.value.status_code == 403
+        assert read_user_loans(db=db_session, user_id=ana, current_user={"user_id": 99}) == []
+
+class TestLoanPartitions:
+
+    def test_month_bounds(self):
+        assert month_start(date(2026, 12, 20), 1) == date(2027, 1, 1)
+        assert partition_ddl(date(2026, 12, 20)) == (
+            "CREATE TABLE IF NOT EXISTS loans_2026_12 PARTITION OF loans "
+            "FOR VALUES FROM ('2026-12-01') TO ('2027-01-01')"
+        )
+
+    def test_noop_outside_postgresql(self, db_engine):
+        assert ensure_partitions(db_engine) == []
+
+    def test_moves_default_rows_into_new_partition(self):
+        # Un worker que corrió más de LOAN_PARTITIONS_AHEAD meses dejó filas
+        # de febrero en la partición DEFAULT
+        conn = FakePartitionConnection(existing={"loans_2027_03"}, stranded=[date(2027, 2, 1)])
+        names = ensure_partitions(fake_engine(conn), months_ahead=1, today=date(2027, 2, 3))
+
+        assert names == ["loans_2027_02", "loans_2027_03"]
+        bounds = "occurred_at >= '2027-02-01' AND occurred_at < '2027-03-01'"
+        assert conn.ddl == [
+            "ALTER TABLE loans DETACH PARTITION loans_default",
+            partition_ddl(date(2027, 2, 1)),
+            f"INSERT INTO loans_2027_02 SELECT * FROM loans_default WHERE {bounds}",
+            f"DELETE FROM loans_default WHERE {bounds}",
+            "ALTER TABLE loans ATTACH PARTITION loans_default DEFAULT",
+        ]
+
+    def test_creates_missing_months_directly(self):
+        conn = FakePartitionConnection(existing={"loans_2026_10"}, stranded=[])
+        ensure_partitions(fake_engine(conn), months_ahead=2, today=date(2026, 10, 17))
+
+        assert conn.ddl == [partition_ddl(date(2026, 11, 1)), partition_ddl(date(2026, 12, 1))]
@@ -0,0 +1,72 @@
+import pytest
+from datetime import datetime, timedelta
+from app.crud.book import book
+from app.crud.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from app.models import Author, Book
+
+@pytest.fixture
+def books(db_session):
+    author = Author(name="Test Author")
+    db_session.add(author)
+    db_session.flush()
+    base_date = datetime(2024, 1, 1)
+    titles = ["Cien años", "Aura", "Rayuela", "Aura", "Ficciones"]
+    for i, title in enumerate(titles):
+        db_session.add(Book(
+            title=title,
+            author_id=author.id,
+            created_at=base_date + timedelta(days=i % 2)
+        ))
+    db_session.commit()
+    return db_session.query(Book).all()
+
+class TestKeysetPagination:
+
+    def collect(self, db_session, order_by, limit):
+        pages, cursor = [], None
+        while True:
+            items, cursor = book.get_multi_by_cursor(
+                db_session, cursor=cursor, limit=limit, order_by=order_by
+            )
+            pages.append(items)
+            if cursor is None:
+                return pages
+
+    def test_pages_by_id(self, db_session, books):
+        pages = self.collect(db_session, "id", 2)
+
+        assert [len(page) for page in pages] == [2, 2, 1]
+        assert [b.id for page in pages for b in page] == sorted(b.id for b in books)
+
+    def test_pages_by_title_with_ties(self, db_session, books):
+        pages = self.collect(db_session, "title", 2)
+        seen = [(b.title, b.id) for page in pages for b in page]
+
+        assert seen == sorted((b.title, b.id) for b in books)
+
+    def test_pages_by_created_at(self, db_session, books):
+        pages = self.collect(db_session, "created_at", 3)
+        seen = [(b.created_at, b.id) for page in pages for b in page]
+
+        assert seen == sorted((b.created_at, b.id) for b in books)
+
+    def test_unsupported_order(self, db_session):
+        with pytest.raises(InvalidCursorError):
+            book.get_multi_by_cursor(db_session, order_by="publication_year")
+
+    def test_invalid_cursor(self, db_session):
+        with pytest.raises(InvalidCursorError):
+            book.get_multi_by_cursor(db_session, cursor="no-es-un-cursor")
+
+    def test_cursor_round_trip(self):
+        columns = [Book.created_at, Book.id]
+        value = datetime(2024, 5, 1, 12, 30)
+
+        assert decode_cursor(encode_cursor([value, 7], ["created_at", "id"]), columns) == [value, 7]
+
+    def test_cursor_from_another_ordering(self, db_session, books):
+        _, cursor = book.get_multi_by_cursor(db_session, limit=2, order_by="created_at")
+
+        # Los valores de created_at no se comparan con títulos
+        with pytest.raises(InvalidCursorError, match="ordenamiento"):
+            book.get_multi_by_cursor(db_session, cursor=cursor, limit=2, order_by="title")
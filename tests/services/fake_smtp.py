@@ -0,0 +1,83 @@
+import email
+import socketserver
+import threading
+from email.message import Message
+from typing import List
+
+class FakeSMTPServer(socketserver.ThreadingTCPServer):
+    """
+    Servidor SMTP mínimo para las pruebas: acepta los mensajes y los guarda en
+    `messages`. Rechaza con 550 los destinatarios de `rejected` y, mientras
+    `refuse_connections` sea mayor que cero, responde 421 al conectar.
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), SMTPHandler)
+        self.messages: List[Message] = []
+        self.rejected: set = set()
+        self.refuse_connections = 0
+        self.connections = 0
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def __enter__(self) -> "FakeSMTPServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+        self.server_close()
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+
+    def reply(self, line: str) -> None:
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self) -> None:
+        server = self.server
+        server.connections += 1
+        if server.refuse_connections > 0:
+            server.refuse_connections -= 1
+            self.reply("421 Servicio no disponible")
+            return
+        self.reply("220 fake ESMTP")
+        recipients = []
+        for raw in self.rfile:
+            command = raw.decode().strip()
+            verb = command.split(" ", 1)[0].upper()
+            if verb == "EHLO":
+                self.reply("250-fake")
+                self.reply("250 8BITMIME")
+            elif verb == "HELO":
+                self.reply("250 fake")
+            elif verb == "MAIL":
+                recipients = []
+                self.reply("250 OK")
+            elif verb == "RCPT":
+                address = command.split(":", 1)[1].strip().strip("<>")
+                if address in server.rejected:
+                    self.reply("550 Destinatario inexistente")
+                else:
+                    recipients.append(address)
+                    self.reply("250 OK")
+            elif verb == "DATA":
+                self.reply("354 Fin con <CRLF>.<CRLF>")
+                lines = []
+                for line in self.rfile:
+                    if line in (b".\r\n", b".\n"):
+                        break
+                    lines.append(line[1:] if line.startswith(b"..") else line)
+                server.messages.append(email.message_from_bytes(b"".join(lines)))
+                self.reply("250 OK")
+            elif verb in ("RSET", "NOOP"):
+                self.reply("250 OK")
+            elif verb == "QUIT":
+                self.reply("221 Adiós")
+                return
+            else:
+                self.reply("502 No implementado")
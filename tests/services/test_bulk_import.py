@@ -0,0 +1,165 @@
+import io
+import json
+import sqlite3
+import pytest
+from unittest.mock import patch
+from sqlalchemy.exc import OperationalError
+from sqlalchemy import insert
+from app.models import Author, Book
+from app.services import bulk_import
+
+def ndjson(*rows):
+    return io.StringIO("\n".join(r if isinstance(r, str) else json.dumps(r) for r in rows) + "\n")
+
+class TestDetectFormat:
+    def test_from_extension(self):
+        assert bulk_import.detect_format("libros.csv") == "csv"
+        assert bulk_import.detect_format("libros.ndjson") == "ndjson"
+        assert bulk_import.detect_format(None) == "ndjson"
+
+    def test_explicit_format_wins(self):
+        assert bulk_import.detect_format("libros.txt", "CSV") == "csv"
+
+    def test_unknown_format(self):
+        with pytest.raises(ValueError):
+            bulk_import.detect_format("libros.xml", "xml")
+
+class TestImportAuthors:
+    def test_ndjson(self, db_session):
+        stream = ndjson({"name": "Borges", "birth_date": "24/08/1899"}, {"name": "Cortázar"})
+        result = bulk_import.import_authors(db_session, stream, "ndjson")
+        assert (result.total, result.inserted, result.failed) == (2, 2, 0)
+        names = [a.name for a in db_session.query(Author).order_by(Author.id)]
+        assert names == ["Borges", "Cortázar"]
+        assert db_session.query(Author).first().created_at is not None
+
+    def test_csv_with_row_errors(self, db_session):
+        stream = io.StringIO("name,birth_date\nBorges,1899-08-24\n,\nFutura,01/01/2999\n")
+        result = bulk_import.import_authors(db_session, stream, "csv")
+        assert (result.total, result.inserted, result.failed) == (3, 1, 2)
+        assert [e.line for e in result.errors] == [3, 4]
+        assert "futura" in result.errors[1].error
+
+    def test_invalid_json_line(self, db_session):
+        stream = ndjson({"name": "Borges"}, "{no es json", {"name": "Cortázar"})
+        result = bulk_import.import_authors(db_session, stream, "ndjson", batch_size=1)
+        assert result.inserted == 2
+        assert result.errors[0].line == 2
+        assert "JSON" in result.errors[0].error
+
+    def test_errors_are_capped(self, db_session):
+        stream = ndjson(*[{"birth_date": "x"} for _ in range(5)])
+        importer = bulk_import.AuthorImporter(db_session, max_errors=2)
+        result = importer.run(bulk_import.iter_records(stream, "ndjson"))
+        assert result.failed == 5
+        assert len(result.errors) == 2
+        assert result.errors_truncated is True
+
+class TestImportBooks:
+    @pytest.fixture
+    def authors(self, db_session):
+        db_session.add_all([Author(name="Borges"), Author(name="Homónimo"), Author(name="Homónimo")])
+        db_session.commit()
+        return {a.name: a.id for a in db_session.query(Author)}
+
+    def test_resolves_author_by_id_and_name(self, db_session, authors):
+        stream = ndjson(
+            {"title": "Ficciones", "author_id": authors["Borges"], "publication_year": 1944},
+            {"title": "El Aleph", "author_name": "Borges"},
+        )
+        result = bulk_import.import_books(db_session, stream, "ndjson")
+        assert result.inserted == 2
+        books = db_session.query(Book).order_by(Book.id).all()
+        assert [b.author_id for b in books] == [authors["Borges"]] * 2
+        assert books[0].publication_year == 1944
+
+    def test_unknown_and_ambiguous_authors(self, db_session, authors):
+        stream = io.StringIO(
+            "title,author_id,author_name\n"
+            "Uno,999,\n"
+            "Dos,,Homónimo\n"
+            "Tres,,Nadie\n"
+            ",,Borges\n"
+            "Cinco,,Borges\n"
+        )
+        result = bulk_import.import_books(db_session, stream, "csv")
+        assert (result.total, result.inserted, result.failed) == (5, 1, 4)
+        errors = {e.line: e.error for e in result.errors}
+        assert errors[2] == "Autor no encontrado"
+        assert "ambiguo" in errors[3]
+        assert errors[4] == "Autor no encontrado"
+        assert "title" in errors[5]
+
+    def test_failed_batch_is_retried_row_by_row(self, db_session, authors):
+        db_session.connection().exec_driver_sql("PRAGMA foreign_keys=ON")
+        stream = ndjson(
+            {"title": "Uno", "author_id": authors["Borges"]},
+            {"title": "Dos", "author_id": 999},
+            {"title": "Tres", "author_id": authors["Borges"]},
+        )
+        # El autor 999 existía al validar el lote pero se borró antes del INSERT
+        resolved = ({authors["Borges"], 999}, {})
+        real_insert = bulk_import.insert_rows
+        calls = []
+
+        def counting_insert(db, model, rows):
+            calls.append(len(rows))
+            real_insert(db, model, rows)
+
+        with patch.object(bulk_import.BookImporter, "resolve_authors", return_value=resolved), \
+                patch("app.services.bulk_import.insert_rows", side_effect=counting_insert):
+            result = bulk_import.import_books(db_session, stream, "ndjson", batch_size=3)
+        assert calls == [3, 1, 1, 1]
+        assert (result.inserted, result.failed) == (2, 1)
+        assert [e.line for e in result.errors] == [2]
+        assert "FOREIGN KEY" in result.errors[0].error
+        assert [b.title for b in db_session.query(Book).order_by(Book.id)] == ["Uno", "Tres"]
+
+    def test_persistent_error_fails_every_row(self, db_session, authors):
+        stream = ndjson(*[{"title": f"Libro {i}", "author_name": "Borges"} for i in range(3)])
+
+        def failing_insert(db, model, rows):
+            raise OperationalError("INSERT", {}, Exception("disco lleno"))
+
+        with patch("app.services.bulk_import.insert_rows", side_effect=failing_insert):
+            result = bulk_import.import_books(db_session, stream, "ndjson", batch_size=2)
+        assert (result.inserted, result.failed) == (0, 3)
+        assert [e.line for e in result.errors] == [1, 2, 3]
+        assert "disco lleno" in result.errors[0].error
+        assert db_session.query(Book).count() == 0
+
+    def test_raw_copy_error_is_retried_row_by_row(self, db_session, authors):
+        stream = ndjson(*[{"title": title, "author_id": authors["Borges"]} for title in ["Uno", "Dos", "Tres"]])
+
+        # COPY falla con el error del driver, no con uno de SQLAlchemy
+        def fake_copy(db, table, rows):
+            if any(row["title"] == "Dos" for row in rows):
+                raise sqlite3.IntegrityError("fila rechazada por COPY")
+            db.execute(insert(Book), rows)
+
+        with patch.object(db_session.get_bind().dialect, "driver", "psycopg2"), \
+                patch("app.services.bulk_import.copy_rows", side_effect=fake_copy):
+            result = bulk_import.import_books(db_session, stream, "ndjson", batch_size=3)
+        assert (result.inserted, result.failed) == (2, 1)
+        assert [e.line for e in result.errors] == [2]
+        assert "fila rechazada por COPY" in result.errors[0].error
+        assert [b.title for b in db_session.query(Book).order_by(Book.id)] == ["Uno", "Tres"]
+
+    def test_publication_year_is_bounded(self, db_session, authors):
+        stream = ndjson(
+            {"title": "Uno", "author_id": authors["Borges"], "publication_year": 2 ** 40},
+            {"title": "Odisea", "author_id": authors["Borges"], "publication_year": -800},
+        )
+        result = bulk_import.import_books(db_session, stream, "ndjson")
+        assert (result.inserted, result.failed) == (1, 1)
+        assert "publication_year" in result.errors[0].error
+
+    def test_importer_requires_prepare(self, db_session):
+        with pytest.raises(TypeError):
+            bulk_import.BulkImporter(db_session)
+
+class TestCopyFormat:
+    def test_escapes_text_format(self):
+        assert bulk_import._copy_value(None) == "\\N"
+        assert bulk_import._copy_value("a\tb\\c\nd") == "a\\tb\\\\c\\nd"
+        assert bulk_import._copy_value(1944) == "1944"
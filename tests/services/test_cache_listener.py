@@ -0,0 +1,37 @@
+from unittest.mock import Mock, patch
+from app.core.entity_cache import EntityCache
+from app.services.cache_listener import CacheInvalidationListener
+
+class TestCacheInvalidationListener:
+
+    def make_listener(self):
+        cache = EntityCache(maxsize=10, ttl=60)
+        cache.set(("books", 1), 1, {("books", 1), ("authors", 3)})
+        cache.set(("authors", 4), 2, {("authors", 4)})
+        return CacheInvalidationListener(Mock(), cache, "entity_cache"), cache
+
+    def test_handle_invalidates_tags(self):
+        listener, cache = self.make_listener()
+        listener.handle("authors:3")
+        assert cache.get(("books", 1)) is None
+        assert cache.get(("authors", 4)) == 2
+        assert listener.notifications == 1
+
+    def test_handle_wildcard_clears(self):
+        listener, cache = self.make_listener()
+        listener.handle("*")
+        assert cache.stats()["size"] == 0
+
+    def test_listen_drains_notifications(self):
+        listener, cache = self.make_listener()
+        connection = Mock(notifies=[Mock(payload="books:1"), Mock(payload="authors:4")])
+
+        def poll():
+            listener._stop.set()
+        connection.poll.side_effect = poll
+
+        with patch("app.services.cache_listener.select.select", return_value=([connection], [], [])):
+            listener._listen(connection)
+
+        assert cache.stats()["size"] == 0
+        assert listener.notifications == 2
@@ -0,0 +1,72 @@
+import threading
+import time
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from app.core.exceptions import ServiceUnavailableError
+from app.core.security import verify_password
+from app.services.hashing_service import HashingService
+
+def wait_until(condition, timeout=1.0):
+    """Los slots se liberan en el callback del future, justo después del resultado"""
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+@pytest.fixture
+def blocking_service():
+    executor = ThreadPoolExecutor(max_workers=1)
+    service = HashingService(workers=1, queue_size=1, timeout=0.2, executor=executor)
+    release = threading.Event()
+    yield service, release
+    release.set()
+    executor.shutdown(wait=True)
+
+class TestHashingService:
+
+    def test_inline_hash_and_verify(self):
+        service = HashingService(workers=0, queue_size=0)
+
+        hashed = service.hash_password("Password123")
+
+        assert verify_password("Password123", hashed)
+        assert service.verify_password("Password123", hashed)
+        assert not service.verify_password("Otra123", hashed)
+
+    def test_process_pool_hash(self):
+        service = HashingService(workers=1, queue_size=0)
+        try:
+            hashed = service.hash_password("Password123")
+            assert service.verify_password("Password123", hashed)
+            assert wait_until(lambda: service.pending == 0)
+        finally:
+            service.shutdown()
+
+    def test_rejects_when_saturated(self, blocking_service):
+        service, release = blocking_service
+        service.submit(release.wait)
+        service.submit(release.wait)
+
+        with pytest.raises(ServiceUnavailableError) as exc_info:
+            service.submit(release.wait)
+
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.headers["Retry-After"] == "1"
+        assert service.pending == 2
+        assert service.rejected == 1
+
+    def test_slots_are_released(self, blocking_service):
+        service, release = blocking_service
+        futures = [service.submit(release.wait), service.submit(release.wait)]
+        release.set()
+        for future in futures:
+            future.result(timeout=1)
+
+        assert wait_until(lambda: service.pending == 0)
+        assert service.run(len, "abc") == 3
+
+    def test_timeout_returns_503(self, blocking_service):
+        service, release = blocking_service
+
+        with pytest.raises(ServiceUnavailableError):
+            service.run(release.wait)
@@ -0,0 +1,190 @@
+import smtplib
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy.orm import sessionmaker
+from app.core.config import settings
+from app.crud.user import user as user_crud
+from app.models import Job
+from app.schemas.user import UserCreate
+from app.services import jobs
+from app.services.email_service import SMTPMailer
+from app.services.jobs import JobWorker
+from tests.services.fake_smtp import FakeSMTPServer
+
+@pytest.fixture
+def smtp_server():
+    with FakeSMTPServer() as server:
+        yield server
+
+@pytest.fixture
+def session_factory(db_engine):
+    return sessionmaker(autocommit=False, autoflush=False, bind=db_engine)
+
+@pytest.fixture
+def worker(session_factory, smtp_server):
+    return JobWorker(
+        session_factory,
+        batch_size=10,
+        poll_interval=0,
+        mailer_factory=lambda: SMTPMailer("127.0.0.1", smtp_server.port, timeout=5),
+    )
+
+def enqueue_notifications(session_factory, *addresses):
+    db = session_factory()
+    for address in addresses:
+        jobs.enqueue(db, "notification", {"email": address, "message": "Tu libro vence mañana"})
+    db.commit()
+    db.close()
+
+class TestEnqueue:
+
+    def test_is_part_of_the_transaction(self, db_session):
+        jobs.enqueue(db_session, "welcome_email", {"email": "ana@example.com"})
+        db_session.rollback()
+        assert db_session.query(Job).count() == 0
+
+        user_crud.create(
+            db_session, obj_in=UserCreate(name="Ana", email="ana@example.com", password="Secreta123"), welcome_email=True
+        )
+        [job] = db_session.query(Job).all()
+        assert (job.kind, job.payload, job.status) == ("welcome_email", {"email": "ana@example.com"}, "pending")
+
+    def test_unknown_kind(self, db_session):
+        with pytest.raises(ValueError):
+            jobs.enqueue(db_session, "sms", {})
+
+class TestJobWorker:
+
+    def test_sends_batch_over_one_connection(self, worker, session_factory, smtp_server):
+        enqueue_notifications(session_factory, "a@example.com", "b@example.com", "c@example.com")
+
+        assert worker.run_once() == 3
+        assert worker.run_once() == 0
+
+        assert smtp_server.connections == 1
+        assert [m["To"] for m in smtp_server.messages] == ["a@example.com", "b@example.com", "c@example.com"]
+        assert "vence mañana" in smtp_server.messages[0].get_payload(decode=True).decode()
+        db = session_factory()
+        assert {(job.status, job.attempts) for job in db.query(Job)} == {("done", 1)}
+
+    def test_retries_with_backoff_when_server_is_down(self, worker, session_factory, smtp_server):
+        enqueue_notifications(session_factory, "a@example.com", "b@example.com")
+        smtp_server.refuse_connections = 1
+
+        assert worker.run_once() == 2
+        db = session_factory()
+        pending = db.query(Job).all()
+        assert {(job.status, job.attempts) for job in pending} == {("pending", 1)}
+        assert all(job.run_at >= datetime.utcnow() + timedelta(seconds=settings.JOB_RETRY_BASE_SECONDS - 1) for job in pending)
+        # Aún no vencen
+        assert worker.run_once() == 0
+
+        for job in pending:
+            job.run_at = datetime.utcnow()
+        db.commit()
+        assert worker.run_once() == 2
+        assert len(smtp_server.messages) == 2
+
+    def test_rejected_recipient_fails_without_retry(self, worker, session_factory, smtp_server):
+        enqueue_notifications(session_factory, "nadie@example.com", "ana@example.com")
+        smtp_server.rejected.add("nadie@example.com")
+
+        worker.run_once()
+
+        db = session_factory()
+        statuses = {job.payload["email"]: (job.status, job.attempts) for job in db.query(Job)}
+        assert statuses == {"nadie@example.com": ("failed", 1), "ana@example.com": ("done", 1)}
+        assert [m["To"] for m in smtp_server.messages] == ["ana@example.com"]
+
+    def test_gives_up_after_max_attempts(self, worker, session_factory, smtp_server):
+        db = session_factory()
+        jobs.enqueue(db, "notification", {"email": "a@example.com", "message": "x"}, max_attempts=2)
+        db.commit()
+        smtp_server.refuse_connections = 2
+
+        for _ in range(2):
+            worker.run_once()
+            db.query(Job).update({Job.run_at: datetime.utcnow()})
+            db.commit()
+
+        job = db.query(Job).one()
+        assert (job.status, job.attempts) == ("failed", 2)
+        assert "SMTPConnectError" in job.last_error
+
+    def test_claim_is_committed_before_sending(self, worker, session_factory, smtp_server):
+        enqueue_notifications(session_factory, "a@example.com", "b@example.com")
+        seen = []
+        mailer_factory = worker.mailer_factory
+
+        class InspectingMailer:
+            # Mientras se envía, otra sesión ya ve el lote tomado y los resultados anteriores
+            def __enter__(self):
+                self.mailer = mailer_factory().__enter__()
+                return self
+
+            def __exit__(self, *exc_info):
+                return self.mailer.__exit__(*exc_info)
+
+            def send(self, message):
+                db = session_factory()
+                seen.append(sorted((job.payload["email"], job.status) for job in db.query(Job)))
+                db.close()
+                self.mailer.send(message)
+
+        worker.mailer_factory = InspectingMailer
+        assert worker.run_once() == 2
+        assert seen == [
+            [("a@example.com", "running"), ("b@example.com", "running")],
+            [("a@example.com", "done"), ("b@example.com", "running")],
+        ]
+
+    def test_expired_lease_is_reclaimed(self, worker, session_factory, smtp_server):
+        enqueue_notifications(session_factory, "a@example.com", "b@example.com")
+        db = session_factory()
+        # Tomados por un worker que murió antes de registrar el resultado
+        claimed = jobs.claim_batch(db, 10)
+        db.commit()
+        assert worker.run_once() == 0
+
+        stale, exhausted = claimed
+        stale.run_at = exhausted.run_at = datetime.utcnow()
+        exhausted.attempts = exhausted.max_attempts
+        db.commit()
+        assert worker.run_once() == 1
+
+        db.expire_all()
+        assert (stale.status, stale.attempts) == ("done", 2)
+        assert exhausted.status == "failed"
+        assert [m["To"] for m in smtp_server.messages] == ["a@example.com"]
+
+    @pytest.mark.parametrize("codes, permanent", [
+        ((550, 553), True),
+        ((550, 452), False),
+        ((450,), False),
+    ])
+    def test_refused_recipients_are_permanent_only_if_all_5xx(self, codes, permanent):
+        exc = smtplib.SMTPRecipientsRefused({f"{i}@example.com": (code, b"x") for i, code in enumerate(codes)})
+        assert jobs.is_permanent(exc) is permanent
+
+    def test_periodic_tasks_run_when_due(self, session_factory):
+        calls = []
+
+        def failing():
+            calls.append("failing")
+            raise RuntimeError("sin conexión")
+
+        worker = JobWorker(session_factory, periodic=[(60, lambda: calls.append("partitions")), (10, failing)])
+        worker.run_periodic(now=1000)
+        worker.run_periodic(now=1005)
+        worker.run_periodic(now=1010)
+        worker.run_periodic(now=1060)
+
+        # Un error no detiene al worker: la tarea se reintenta en su siguiente intervalo
+        assert calls == ["partitions", "failing", "failing", "partitions", "failing"]
+
+    def test_retry_delay_is_exponential_and_capped(self, monkeypatch):
+        monkeypatch.setattr(jobs, "RETRY_JITTER", 0)
+        monkeypatch.setattr(settings, "JOB_RETRY_BASE_SECONDS", 30)
+        monkeypatch.setattr(settings, "JOB_RETRY_MAX_SECONDS", 100)
+
+        assert [jobs.retry_delay(n) for n in (1, 2, 3, 4)] == [30, 60, 100, 100]
@@ -0,0 +1,51 @@
+import json
+from datetime import datetime
+import pytest
+from app.utils import export
+
+COLUMNS = ("id", "title", "created_at")
+ROWS = [
+    (1, "Ficciones", datetime(2024, 1, 1, 12, 0)),
+    (2, "Rayuela, novela", None),
+]
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+class TestExportEncoding:
+
+    def test_ndjson(self):
+        lines = "".join(export.iter_export(ROWS, COLUMNS, "ndjson")).splitlines()
+        assert [json.loads(line) for line in lines] == [
+            {"id": 1, "title": "Ficciones", "created_at": "2024-01-01T12:00:00"},
+            {"id": 2, "title": "Rayuela, novela", "created_at": None},
+        ]
+
+    def test_csv(self):
+        content = "".join(export.iter_export(ROWS, COLUMNS, "csv"))
+        assert content == (
+            "id,title,created_at\n"
+            "1,Ficciones,2024-01-01T12:00:00\n"
+            '2,"Rayuela, novela",\n'
+        )
+
+    def test_rows_are_sent_in_chunks(self):
+        rows = [(i, f"Libro {i}", None) for i in range(5)]
+        chunks = list(export.iter_export(rows, COLUMNS, "csv", chunk_size=2))
+        # encabezado + 3 fragmentos
+        assert len(chunks) == 4
+        assert chunks[-1] == "4,Libro 4,\n"
+
+    def test_empty_export(self):
+        assert list(export.iter_export([], COLUMNS, "ndjson")) == []
+
+    async def test_async_export_matches_sync(self):
+        async def rows():
+            for row in ROWS:
+                yield row
+
+        chunks = [chunk async for chunk in export.aiter_export(rows(), COLUMNS, "csv", chunk_size=1)]
+        assert "".join(chunks) == "".join(export.iter_export(ROWS, COLUMNS, "csv"))
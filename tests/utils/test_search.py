@@ -0,0 +1,31 @@
+from app.utils.search import match_score, normalize, rank, similarity, stem
+
+class TestSearchMatcher:
+
+    def test_normalize_removes_accents(self):
+        assert normalize("Canción de Pingüino") == "cancion de pinguino"
+
+    def test_stem_plural_and_singular(self):
+        assert stem("cuentos") == stem("cuento")
+        assert stem("canciones") == stem("cancion")
+
+    def test_similarity_identical_words(self):
+        assert similarity("rayuela", "rayuela") == 1.0
+
+    def test_match_ignores_accents_and_case(self):
+        assert match_score("CANCION", "La canción desesperada") == 1.0
+
+    def test_match_tolerates_typos(self):
+        assert match_score("rayuella", "Rayuela") > 0
+
+    def test_no_match(self):
+        assert match_score("quijote", "Cien años de soledad") == 0
+
+    def test_rank_orders_by_relevance(self):
+        titles = ["Cuentos de la selva", "El libro de la selva", "Ficciones", "Selva"]
+
+        ranked = rank(titles, "cuentos selva", key=lambda title: title)
+
+        assert ranked[0] == "Cuentos de la selva"
+        assert "Ficciones" not in ranked
+        assert set(ranked[1:]) == {"El libro de la selva", "Selva"}